@@ -6,5 +6,16 @@ __license__ = 'MIT'
 
 # Public API
 from . import _container as container, _button as button, _input as input, _select as select, _static as static, \
-    _misc as misc
-from ._base import Abstract
+    _misc as misc, _render_cache as render_cache, _items as items
+from ._base import Abstract, render_pass
+
+
+def plugin_load_wsgi():
+    """Hook
+    """
+    from plugins import http_api
+    from . import _controllers
+
+    http_api.handle('GET', 'widget/select2/<catalog>', _controllers.Select2Search, 'widget@select2_search')
+    http_api.handle('POST', 'widget/multi_row/rows', _controllers.MultiRowRows, 'widget@multi_row_rows')
+    http_api.handle('GET', 'widget/tabs/pane', _controllers.TabsPane, 'widget@tabs_pane')
@@ -5,17 +5,101 @@ __email__ = 'a@shepetko.com'
 __license__ = 'MIT'
 
 import htmler
-from typing import Tuple, List, Optional
+from typing import Any, Tuple, List, Dict, Optional, Iterator, Callable, Union, IO
 from abc import ABC, abstractmethod
-from copy import deepcopy
+from bisect import bisect_left, bisect_right
+from collections import deque
+from copy import copy, deepcopy
 from math import ceil
+from contextlib import contextmanager
+from threading import local
 from pytsite import validation, lang, http
+from . import _render_cache as render_cache
+from ._html import iter_node
+
+# Resolved message IDs cache: (class, partial message ID, language) -> full message ID
+_resolved_msg_ids = {}  # type: Dict[Tuple[type, str, str], str]
+_resolved_msg_ids_packages_num = 0
+
+# Values derived from translations of resolved message IDs, cleared along with them
+_msg_id_translations = {}  # type: Dict[Tuple, Any]
+
+# State of the render pass in progress in the current thread
+_render_pass = local()
+
+
+@contextmanager
+def render_pass():
+    """Open a render pass, or join the one in progress
+
+    Widgets rendered within a single pass share data prepared for all of them at once, i.e. labels of selected
+    values. `Abstract.render()` opens a pass itself, wrap several calls to make them share one.
+    """
+    depth = getattr(_render_pass, 'depth', 0)
+    if not depth:
+        _render_pass.storage = {}
+    _render_pass.depth = depth + 1
+
+    try:
+        yield _render_pass.storage
+    finally:
+        _render_pass.depth = depth
+        if not depth:
+            _render_pass.storage = None
 
 
 class Abstract(ABC):
     """Abstract Base Widget
     """
 
+    __slots__ = ('__weakref__', '_uid', '_inherit_cid', '_wrap_em', '_name', '_language', '_weight', '_default',
+                 '_value', '_label', '_title', '_label_hidden', '_label_disabled', '_placeholder', '_css', '_data',
+                 '_has_messages', '_has_success', '_has_warning', '_has_error', '_help', '_h_size', '_h_size_label',
+                 '_h_size_row_css', '_hidden', '_rules', '_form_area', '_replaces', '_required', '_enabled', '_parent',
+                 '_children', '_children_index', '_children_keys', '_children_key_by_uid', '_children_seq',
+                 '_descendants_index', '_children_sep', '_last_children_weight', '_form_group', '_render_cache')
+
+    # Per-class render metadata, see _setup_class_meta()
+    _cls_cid = None  # type: str
+    _cls_cid_chain = None  # type: str
+    _cls_wrap_css = None  # type: str
+    _cls_package_name = None  # type: str
+    _cls_state_attrs = ()  # type: Tuple[str, ...]
+
+    # Attributes which don't affect widget's own HTML, so they are not used in render cache keys
+    _render_cache_ignored_attrs = ('__weakref__', '_parent', '_children', '_children_index', '_children_keys',
+                                   '_children_key_by_uid', '_children_seq', '_descendants_index', '_rules',
+                                   '_render_cache')
+
+    # Partial message IDs used by the class, see warm_up_msg_ids()
+    _msg_ids = ()  # type: Tuple[str, ...]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._setup_class_meta()
+
+    @classmethod
+    def _setup_class_meta(cls):
+        """Compute class constants which are used on each render
+        """
+        cls._cls_cid = cls.cid()
+        cls._cls_package_name = '.'.join(cls.__module__.split('.')[:-1])
+
+        # Mixins may be listed before widget classes in bases, so only widget classes of MRO are used
+        cid = [b.cid() for b in cls.__mro__ if b is not Abstract and issubclass(b, Abstract)]
+        cls._cls_cid_chain = ' '.join(reversed(cid))
+
+        cls_css = cls.__name__.lower()
+        cid_css = cls._cls_cid.lower().replace('_', '-').replace('.', '-')
+        cls._cls_wrap_css = 'pytsite-widget widget-{} widget-{}'.format(cls_css, cid_css)
+
+        state_attrs = []
+        for super_cls in reversed(cls.__mro__):
+            for attr in super_cls.__dict__.get('__slots__', ()):
+                if attr not in cls._render_cache_ignored_attrs and attr not in state_attrs:
+                    state_attrs.append(attr)
+        cls._cls_state_attrs = tuple(state_attrs)
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
@@ -43,23 +127,28 @@ class Abstract(ABC):
         self._h_size_label = kwargs.get('h_size_label', False)
         self._h_size_row_css = kwargs.get('h_size_row_css', '')
         self._hidden = kwargs.get('hidden', False)
-        self._rules = kwargs.get('rules', [])  # type: List[validation.rule.Rule]
+        self._rules = kwargs.get('rules', ())  # type: Tuple[validation.rule.Rule, ...]
         self._form_area = kwargs.get('form_area', 'body')
         self._replaces = kwargs.get('replaces')
         self._required = kwargs.get('required', False)
         self._enabled = kwargs.get('enabled', True)
         self._parent = kwargs.get('parent')
         self._children = []  # type: List[Abstract]
-        self._children_uids = []  # type: List[str]
+        self._children_index = {}  # type: Dict[str, Abstract]
+        self._children_keys = []  # type: List[Tuple[int, int]]
+        self._children_key_by_uid = {}  # type: Dict[str, Tuple[int, int]]
+        self._children_seq = 0
+        self._descendants_index = {}  # type: Dict[str, List[Abstract]]
         self._children_sep = kwargs.get('children_sep', '')
         self._last_children_weight = 0
         self._form_group = kwargs.get('form_group', True)
+        self._render_cache = kwargs.get('render_cache', True)
 
-        # Check validation rules
+        # Check validation rules. Rules are stored as a tuple, so they can be safely shared between clones.
         if not isinstance(self._rules, (list, tuple)):
-            self._rules = [self._rules]
-        if isinstance(self._rules, tuple):
-            self._rules = list(self._rules)
+            self._rules = (self._rules,)
+        if isinstance(self._rules, list):
+            self._rules = tuple(self._rules)
         for rule in self._rules:
             if not isinstance(rule, validation.rule.Rule):
                 raise TypeError('Instance of pytsite.validation.rule.Base expected.')
@@ -95,29 +184,42 @@ class Abstract(ABC):
         """
         self._on_form_submit(request)
 
+    @staticmethod
+    def _copy_element(em: htmler.Element) -> htmler.Element:
+        """Get a fresh copy of an element to build into, sharing its children
+        """
+        r = em.__class__(**em.attrs)
+        for child in em:
+            r.append_child(child)
+
+        return r
+
+    def _get_css(self) -> str:
+        """Hook to get wrapper's CSS classes for the current render
+        """
+        return self._css
+
+    def _get_data(self) -> dict:
+        """Hook to get wrapper's data attributes for the current render
+        """
+        return self._data
+
     def renderable(self, **kwargs) -> htmler.Element:
         """Get an HTML element representation of the widget
         """
-        cid = []
-        cur_cls = self.__class__
-        while cur_cls is not Abstract:
-            cid.append(cur_cls.cid())
-            cur_cls = cur_cls.__bases__[0]
-            if not self._inherit_cid:  # Breaks after first iteration
-                break
-
         # Wrapper div
-        self._wrap_em.set_attr('data_cid', ' '.join(reversed(cid)))
-        self._wrap_em.set_attr('data_uid', self._uid)
-        self._wrap_em.set_attr('data_weight', self._weight)
-        self._wrap_em.set_attr('data_form_area', self._form_area)
-        self._wrap_em.set_attr('data_hidden', self._hidden)
-        self._wrap_em.set_attr('data_enabled', self._enabled)
-        self._wrap_em.set_attr('data_parent_uid', self._parent.uid if self._parent else None)
+        wrap_em = self._copy_element(self._wrap_em)
+        wrap_em.set_attr('data_cid', self._cls_cid_chain if self._inherit_cid else self._cls_cid)
+        wrap_em.set_attr('data_uid', self._uid)
+        wrap_em.set_attr('data_weight', self._weight)
+        wrap_em.set_attr('data_form_area', self._form_area)
+        wrap_em.set_attr('data_hidden', self._hidden)
+        wrap_em.set_attr('data_enabled', self._enabled)
+        wrap_em.set_attr('data_parent_uid', self._parent.uid if self._parent else None)
 
         # Replaces
         if self._replaces:
-            self._wrap_em.set_attr('data_replaces', self._replaces)
+            wrap_em.set_attr('data_replaces', self._replaces)
 
         # Get widget's HTML element
         em = self._get_element(**kwargs)
@@ -129,9 +231,7 @@ class Abstract(ABC):
             raise TypeError('{} expected, got {}'.format(htmler.Element, type(em)))
 
         # Wrapper CSS
-        cls_css = self.__class__.__name__.lower()
-        cid_css = self.cid().lower().replace('_', '-').replace('.', '-')
-        wrap_css = 'pytsite-widget widget-{} widget-{} widget-uid-{} {}'.format(cls_css, cid_css, self._uid, self._css)
+        wrap_css = '{} widget-uid-{} {}'.format(self._cls_wrap_css, self._uid, self._get_css())
         if self._form_group:
             wrap_css += ' form-group'
         if self._hidden:
@@ -143,12 +243,13 @@ class Abstract(ABC):
                 wrap_css += ' has-warning'
             if self._has_error:
                 wrap_css += ' has-error'
-        self._wrap_em.set_attr('css', wrap_css)
+        wrap_em.set_attr('css', wrap_css)
 
         # Set widget's data attributes
-        if isinstance(self._data, dict):
-            for k, v in self._data.items():
-                self._wrap_em.set_attr('data_' + k, v)
+        data = self._get_data()
+        if isinstance(data, dict):
+            for k, v in data.items():
+                wrap_em.set_attr('data_' + k, v)
 
         # Wrap into size container
         h_sizer = None
@@ -165,14 +266,14 @@ class Abstract(ABC):
                 label = label.wrap(htmler.Div(css='row ' + self._h_size_row_css))
             if self._label_hidden:
                 label.set_attr('css', 'sr-only')
-            self._wrap_em.append_child(label)
+            wrap_em.append_child(label)
 
         # Append widget's element
-        self._wrap_em.append_child(em)
+        wrap_em.append_child(em)
 
         # Append help block
         if self._help:
-            self._wrap_em.append_child(htmler.Small(self._help, css='help-block form-text text-muted'))
+            wrap_em.append_child(htmler.Small(self._help, css='help-block form-text text-muted'))
 
         # Append messages placeholder
         if self._has_messages:
@@ -180,14 +281,100 @@ class Abstract(ABC):
             if h_sizer:
                 h_sizer.append_child(messages)
             else:
-                self._wrap_em.append_child(messages)
+                wrap_em.append_child(messages)
+
+        return wrap_em
+
+    def _get_render_cache_key_parts(self) -> Optional[List[str]]:
+        """Hook to get parts of render cache key
+
+        Return None to prevent caching.
+        """
+        parts = [self._cls_cid, lang.get_current(), self._parent.uid if self._parent else '']
+
+        for attr in self._cls_state_attrs:
+            v_repr = render_cache.key_repr(getattr(self, attr, None))
+            if v_repr is None:
+                return None
+            parts.append(v_repr)
+
+        # Attributes of subclasses which don't use __slots__
+        if hasattr(self, '__dict__'):
+            v_repr = render_cache.key_repr(self.__dict__)
+            if v_repr is None:
+                return None
+            parts.append(v_repr)
+
+        return parts
+
+    def get_render_cache_key(self) -> Optional[str]:
+        """Get render cache key of the widget's current state
+
+        Returns None if the widget must not be cached.
+        """
+        if not self._render_cache:
+            return None
+
+        parts = self._get_render_cache_key_parts()
+
+        return render_cache.make_key(*parts) if parts is not None else None
+
+    def _render_cached(self) -> Optional[str]:
+        """Get widget's HTML from the render cache, rendering and caching it on miss
+
+        Returns None if the render cache is not applicable to the widget.
+        """
+        if not render_cache.is_enabled():
+            return None
+
+        key = self.get_render_cache_key()
+        if key is None:
+            return None
 
-        return self._wrap_em
+        r = render_cache.get(key)
+        if r is None:
+            r = self.renderable().render()
+            render_cache.put(key, r)
+
+        return r
 
     def render(self, **kwargs) -> str:
         """Render the widget into a string
         """
-        return self.renderable(**kwargs).render()
+        with render_pass():
+            r = None if kwargs else self._render_cached()
+
+            return r if r is not None else self.renderable(**kwargs).render()
+
+    def iter_render(self, **kwargs) -> Iterator[str]:
+        """Render the widget into chunks of HTML
+
+        Chunks are produced depth-first while the element tree is traversed, so the output can be streamed.
+        """
+        with render_pass():
+            r = None if kwargs else self._render_cached()
+            if r is not None:
+                yield r
+            else:
+                yield from iter_node(self.renderable(**kwargs))
+
+    @staticmethod
+    def get_render_pass_storage() -> Optional[dict]:
+        """Get storage shared by all widgets rendered within the current render pass
+
+        A render pass lasts while the outermost `render()` or `iter_render()` call is in progress. Returns None if no
+        widget is being rendered.
+        """
+        return getattr(_render_pass, 'storage', None)
+
+    def render_to(self, writer: Union[IO, Callable[[str], None]], **kwargs):
+        """Render the widget into a writer
+
+        `writer` is either a file-like object or a callable accepting a string.
+        """
+        write = writer.write if hasattr(writer, 'write') else writer
+        for chunk in self.iter_render(**kwargs):
+            write(chunk)
 
     def __str__(self) -> str:
         return self.render()
@@ -195,6 +382,99 @@ class Abstract(ABC):
     def __repr__(self) -> str:
         return "{}.{}(uid='{}', parent={})".format(__name__, self.__class__.__name__, self.uid, repr(self.parent))
 
+    def clone(self):
+        """Get a copy of the widget and its descendants
+
+        Configuration (items, rules, labels, etc) is shared with the original widget, while value and state are copied,
+        so a widgets tree can be built once and cloned for each request.
+        """
+        memo = {}
+        clone = self._clone(memo)
+        clone._parent = None
+
+        for w in memo.values():
+            w._on_clone(memo)
+
+        for w in clone.iter_descendants():
+            clone._index_descendant(w)
+
+        return clone
+
+    def _clone(self, memo: dict):
+        """Make a shallow copy of the widget and copies of its children
+        """
+        clone = copy(self)
+        memo[id(self)] = clone
+
+        clone._children = []
+        for child in self._children:
+            child_clone = child._clone(memo)
+            child_clone._parent = clone
+            clone._children.append(child_clone)
+
+        clone._children_index = {c.uid: c for c in clone._children}
+        clone._children_keys = list(self._children_keys)
+        clone._children_key_by_uid = dict(self._children_key_by_uid)
+        clone._descendants_index = {}
+
+        return clone
+
+    def _prefetch(self):
+        """Hook called on each widget of a tree when a widget of the tree needs data prefetched for the entire tree
+        """
+        pass
+
+    def _prefetch_values(self, values: list):
+        """Hook called before copies of the widget are rendered with each of the given values
+        """
+        pass
+
+    def _get_value_slot(self, marker: str) -> Optional[Tuple[str, Callable[[Any], str]]]:
+        """Hook to let containers render the widget once and substitute values into its markup
+
+        A widget which supports it sets the marker as its value and returns markup which represents the marker in
+        widget's HTML along with a function which sets a value and returns markup to put in the marker's place.
+        None means the widget must be rendered for each value.
+        """
+        return None
+
+    def _get_value_typecode(self) -> Optional[str]:
+        """Hook to get `array` typecode which values of the widget can be stored with by containers
+
+        None means values must be stored as they are.
+        """
+        return None
+
+    def _prefetch_tree(self) -> bool:
+        """Call `_prefetch()` on each widget of the tree, once per render pass
+
+        Returns False if there is no render pass in progress, so nothing is prefetched.
+        """
+        storage = self.get_render_pass_storage()
+        if storage is None:
+            return False
+
+        root = self.root
+        prefetched = storage.setdefault('prefetched_trees', set())
+        if id(root) in prefetched:
+            return True
+        prefetched.add(id(root))
+
+        root._prefetch()
+        for w in root.iter_descendants():
+            w._prefetch()
+
+        return True
+
+    def _on_clone(self, memo: dict):
+        """Hook called on a clone after entire tree is copied
+
+        `memo` maps IDs of original widgets to their clones.
+        """
+        self._value = deepcopy(self._value)
+        if isinstance(self._data, dict):
+            self._data = dict(self._data)
+
     def get_val(self, **kwargs):
         """Get value of the widget
         """
@@ -256,7 +536,15 @@ class Abstract(ABC):
     def uid(self, value):
         """Set UID of the widget
         """
-        self._uid = value
+        parent = self._parent
+        if parent and parent._children_index.get(self._uid) is self:
+            parent._rekey_child(self._uid, value)
+            root = parent.root
+            root._unindex_descendant(self)
+            self._uid = value
+            root._index_descendant(self)
+        else:
+            self._uid = value
 
     @property
     def name(self) -> str:
@@ -284,6 +572,11 @@ class Abstract(ABC):
     def weight(self, value: int):
         self._weight = int(value)
 
+        # Keep parent's ordering in sync
+        parent = self._parent
+        if parent and parent._children_index.get(self._uid) is self:
+            parent._reorder_child(self)
+
     @property
     def label(self) -> str:
         """Get label of the widget
@@ -454,6 +747,14 @@ class Abstract(ABC):
     def enabled(self, value: bool):
         self._enabled = value
 
+    @property
+    def render_cache(self) -> bool:
+        return self._render_cache
+
+    @render_cache.setter
+    def render_cache(self, value: bool):
+        self._render_cache = value
+
     @property
     def form_group(self) -> bool:
         return self._form_group
@@ -474,13 +775,99 @@ class Abstract(ABC):
     def descendants(self):
         """Get descendants of the widget
         """
-        r = []
+        return list(self.iter_descendants())
 
-        for child in self.children:
-            r.append(child)
-            r += child.descendants
+    @property
+    def root(self):
+        """Get root widget of the tree
 
-        return r
+        :rtype: Abstract
+        """
+        w = self
+        while w._parent:
+            w = w._parent
+
+        return w
+
+    def iter_descendants(self, breadth_first: bool = False):
+        """Iterate over descendants of the widget
+
+        :rtype: Iterator[Abstract]
+        """
+        if breadth_first:
+            queue = deque((self,))
+            while queue:
+                for child in queue.popleft()._children:
+                    yield child
+                    if child._children:
+                        queue.append(child)
+        else:
+            stack = [iter(self._children)]
+            while stack:
+                child = next(stack[-1], None)
+                if child is None:
+                    stack.pop()
+                    continue
+
+                yield child
+                if child._children:
+                    stack.append(iter(child._children))
+
+    def _index_descendant(self, widget):
+        """Add a widget to the tree-wide index
+        """
+        self._descendants_index.setdefault(widget.uid, []).append(widget)
+
+    def _unindex_descendant(self, widget):
+        """Remove a widget from the tree-wide index
+        """
+        widgets = self._descendants_index.get(widget.uid)
+        if widgets:
+            widgets[:] = [w for w in widgets if w is not widget]
+            if not widgets:
+                del self._descendants_index[widget.uid]
+
+    def _insert_child(self, child, seq: int = None):
+        """Insert a child into the registry according to its weight
+        """
+        if seq is None:
+            seq = self._children_seq
+            self._children_seq += 1
+
+        key = (child.weight, seq)
+        pos = bisect_right(self._children_keys, key)
+        self._children_keys.insert(pos, key)
+        self._children.insert(pos, child)
+        self._children_key_by_uid[child.uid] = key
+        self._children_index[child.uid] = child
+
+    def _pop_child(self, uid: str):
+        """Remove a child from the registry
+
+        :rtype: Abstract
+        """
+        key = self._children_key_by_uid.pop(uid)
+        pos = bisect_left(self._children_keys, key)
+        del self._children_keys[pos]
+        del self._children[pos]
+
+        return self._children_index.pop(uid)
+
+    def _reorder_child(self, child):
+        """Move a child to the position according to its current weight, preserving its insertion order
+        """
+        seq = self._children_key_by_uid[child.uid][1]
+        self._pop_child(child.uid)
+        self._insert_child(child, seq)
+
+    def _rekey_child(self, old_uid: str, new_uid: str):
+        """Update index after child's UID change
+        """
+        if new_uid in self._children_index:
+            raise RuntimeError("Widget '{}' already contains descendant '{}'".format(self.uid, new_uid))
+
+        self._children_index[new_uid] = self._children_index.pop(old_uid)
+        self._children_key_by_uid[new_uid] = self._children_key_by_uid.pop(old_uid)
 
     def append_child(self, child):
         """Append a child widget
@@ -507,37 +894,51 @@ class Abstract(ABC):
         # Obviously, child must be placed in the same form's area as its parent
         child.form_area = self.form_area
 
-        self._children.append(child)
-        self._children_uids.append(child.uid)
-        self._children.sort(key=lambda x: x.weight)
+        self._insert_child(child)
+
+        # Move child's subtree index to the root of the tree
+        root = self.root
+        root._index_descendant(child)
+        if child._descendants_index:
+            for uid, widgets in child._descendants_index.items():
+                root._descendants_index.setdefault(uid, []).extend(widgets)
+            child._descendants_index = {}
+        elif child._children:
+            for w in child.iter_descendants():
+                root._index_descendant(w)
 
         return child
 
     def has_child(self, uid: str) -> bool:
         """Check if the widget has a child
         """
-        return uid in self._children_uids
+        return uid in self._children_index
 
     def get_child(self, uid: str):
         """Get child widget by uid
 
         :rtype: Abstract
         """
-        if not self.has_child(uid):
+        try:
+            return self._children_index[uid]
+        except KeyError:
             raise RuntimeError("Widget '{}' doesn't contain child '{}'.".format(self.uid, uid))
 
-        for w in self._children:
-            if w.uid == uid:
-                return w
-
     def remove_child(self, uid: str):
         """Remove child widget
         """
         if not self.has_child(uid):
             raise RuntimeError("Widget '{}' doesn't contain child '{}'".format(self.uid, uid))
 
-        self._children = [w for w in self._children if w.uid != uid]
-        self._children_uids.remove(uid)
+        child = self._pop_child(uid)
+
+        # Detached child becomes a root of its own subtree
+        root = self.root
+        root._unindex_descendant(child)
+        for w in child.iter_descendants():
+            root._unindex_descendant(w)
+            child._index_descendant(w)
+        child._parent = None
 
         return self
 
@@ -559,22 +960,42 @@ class Abstract(ABC):
 
         return replacement
 
+    def _find_descendant(self, uid: str):
+        """Find a descendant using root's index
+
+        :rtype: Optional[Abstract]
+        """
+        root = self.root
+        for w in root._descendants_index.get(uid, ()):
+            if root is self:
+                return w
+
+            ancestor = w._parent
+            while ancestor:
+                if ancestor is self:
+                    return w
+                ancestor = ancestor._parent
+
     def has_descendant(self, uid: str) -> bool:
         """Check if the widget contains descendant
         """
-        if self.has_child(uid):
-            return True
+        return self._find_descendant(uid) is not None
 
-        for child in self._children:
-            if child.has_descendant(uid):
-                return True
+    def get_descendant(self, uid: str):
+        """Get descendant widget by uid
 
-        return False
+        :rtype: Abstract
+        """
+        w = self._find_descendant(uid)
+        if w is None:
+            raise RuntimeError("Widget '{}' doesn't contain descendant '{}'.".format(self.uid, uid))
+
+        return w
 
     def add_rule(self, rule: validation.rule.Rule):
         """Add single validation rule
         """
-        self._rules.append(rule)
+        self._rules += (rule,)
 
         return self
 
@@ -589,12 +1010,12 @@ class Abstract(ABC):
     def get_rules(self) -> Tuple[validation.rule.Rule, ...]:
         """Get validation rules
         """
-        return tuple(self._rules)
+        return self._rules
 
     def clr_rules(self):
         """Clear validation rules.
         """
-        self._rules = []
+        self._rules = ()
 
         return self
 
@@ -608,18 +1029,75 @@ class Abstract(ABC):
     def get_package_name(cls) -> str:
         """Get instance's package name.
         """
-        return '.'.join(cls.__module__.split('.')[:-1])
+        return cls._cls_package_name
+
+    @classmethod
+    def resolve_msg_id(cls, partly_msg_id: str, language: str = None) -> str:
+        """Get full message ID, searching for translation up in hierarchy
+        """
+        global _resolved_msg_ids_packages_num
+
+        language = language or lang.get_current()
+
+        # Newly registered language packages may change resolution results
+        packages_num = len(lang.get_packages())
+        if packages_num != _resolved_msg_ids_packages_num:
+            _resolved_msg_ids.clear()
+            _msg_id_translations.clear()
+            _resolved_msg_ids_packages_num = packages_num
+
+        key = (cls, partly_msg_id, language)
+        try:
+            return _resolved_msg_ids[key]
+        except KeyError:
+            pass
+
+        full_msg_id = cls.get_package_name() + '@' + partly_msg_id
+        for super_cls in cls.__mro__:
+            if issubclass(super_cls, Abstract):
+                super_msg_id = super_cls.get_package_name() + '@' + partly_msg_id
+                if lang.is_translation_defined(super_msg_id, language):
+                    full_msg_id = super_msg_id
+                    break
+
+        _resolved_msg_ids[key] = full_msg_id
+
+        return full_msg_id
+
+    @staticmethod
+    def clear_msg_id_cache():
+        """Clear resolved message IDs cache
+
+        Should be called after translations are reloaded.
+        """
+        _resolved_msg_ids.clear()
+        _msg_id_translations.clear()
+
+    @classmethod
+    def _get_msg_id_translation(cls, key: tuple, builder: Callable[[], Any]) -> Any:
+        """Get a value derived from translations of message IDs, build it if necessary
+
+        `key` must contain the language and resolved message IDs the value is built from. Values are cleared along with
+        resolved message IDs cache.
+        """
+        try:
+            return _msg_id_translations[key]
+        except KeyError:
+            r = _msg_id_translations[key] = builder()
+            return r
 
     @classmethod
-    def resolve_msg_id(cls, partly_msg_id: str) -> str:
-        # Searching for translation up in hierarchy
+    def warm_up_msg_ids(cls, languages: List[str] = None):
+        """Resolve all message IDs the class uses
+        """
+        msg_ids = set()
         for super_cls in cls.__mro__:
             if issubclass(super_cls, Abstract):
-                full_msg_id = super_cls.get_package_name() + '@' + partly_msg_id
-                if lang.is_translation_defined(full_msg_id):
-                    return full_msg_id
+                msg_ids.update(super_cls.__dict__.get('_msg_ids', ()))
 
-        return cls.get_package_name() + '@' + partly_msg_id
+        for language in languages or lang.langs():
+            for msg_id in msg_ids:
+                cls.resolve_msg_id(msg_id, language)
 
     @classmethod
     def t(cls, partial_msg_id: str, args: dict = None) -> str:
@@ -632,3 +1110,6 @@ class Abstract(ABC):
         """Translate a string into plural form.
         """
         return lang.t_plural(cls.resolve_msg_id(partial_msg_id), num)
+
+
+Abstract._setup_class_meta()
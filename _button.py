@@ -13,6 +13,8 @@ class Button(_base.Abstract):
     """Button.
     """
 
+    __slots__ = ('_icon', '_color', '_dismiss', '_html_em')
+
     def __init__(self, uid: str, **kwargs):
         """Init.
         """
@@ -30,6 +32,11 @@ class Button(_base.Abstract):
         if self._dismiss:
             self._html_em.set_attr('data_dismiss', self._dismiss)
 
+    def _on_clone(self, memo: dict):
+        super()._on_clone(memo)
+
+        self._html_em = self._copy_element(self._html_em)
+
     @property
     def icon(self) -> str:
         return self._icon
@@ -50,27 +57,30 @@ class Button(_base.Abstract):
         """Render the widget.
         :param **kwargs:
         """
-        self._html_em.set_attr('uid', self._uid)
+        em = self._copy_element(self._html_em)
+        em.set_attr('uid', self._uid)
 
         if isinstance(self._color, list):
-            self._html_em.set_attr('css', 'btn ' + ' '.join('btn-' + c for c in self._color))
+            em.set_attr('css', 'btn ' + ' '.join('btn-' + c for c in self._color))
         else:
-            self._html_em.set_attr('css', 'btn btn-' + self._color)
+            em.set_attr('css', 'btn btn-' + self._color)
 
-        self._html_em.append_text(self.get_val())
-        if self._icon and not self._html_em.children:
-            self._html_em.append_child(htmler.I(css=self._icon))
+        em.append_text(self.get_val())
+        if self._icon and not len(em):
+            em.append_child(htmler.I(css=self._icon))
 
         for k, v in self._data.items():
-            self._html_em.set_attr('data_' + k, v)
+            em.set_attr('data_' + k, v)
 
-        return self._html_em
+        return em
 
 
 class Submit(Button):
     """Submit Button.
     """
 
+    __slots__ = ()
+
     def __init__(self, uid: str, **kwargs):
         """Init.
         """
@@ -86,6 +96,8 @@ class Link(Button):
     """Link Button.
     """
 
+    __slots__ = ()
+
     def __init__(self, uid: str, **kwargs):
         """Init.
         """
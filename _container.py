@@ -5,16 +5,294 @@ __email__ = 'a@shepetko.com'
 __license__ = 'MIT'
 
 import htmler
-from typing import List, Dict
+import re
+from typing import Any, Callable, List, Dict, Iterable, Iterator, Mapping, Optional, Sequence, Tuple, Union
 from abc import abstractmethod
-from pytsite import lang as lang, validation, util
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping as MappingABC, Sequence as SequenceABC
+from copy import deepcopy
+from inspect import isabstract
+from itertools import islice
+from json import dumps as json_dumps, loads as json_loads
+from pytsite import validation, util
+from plugins import http_api
 from ._base import Abstract
+from ._html import LazyElement, RenderedElement
+from . import _signing
+
+# Row number which marks number's place in row templates
+_ROW_NUM_MARKER = 987654320987
+
+# Characters which enclose markers of widgets' places in row templates
+_SLOT_MARKER_START, _SLOT_MARKER_END = '\ue000', '\ue001'
+
+# Converters of input values to types of typed arrays
+_TYPECODE_CONVERTERS = {'q': int, 'd': float}
+
+# Key of HTTP input which carries rows which were not rendered by a virtualized MultiRow
+_ROWS_PAYLOAD_KEY = '__rows__'
+
+# Registered MultiRow classes: class ID -> class
+_multi_row_classes = {}  # type: Dict[str, type]
+
+# Constructor arguments of a virtualized MultiRow which don't affect rendering of its rows
+_ROWS_SPEC_IGNORED_KWARGS = ('value', 'default', 'rules', 'parent', 'wrap_em', 'window_size')
+
+
+class _CellSlot:
+    """Stand-in for a row widget which must be rendered for each row
+
+    Row template gets a marker in place of the widget's markup and remembers arguments the widget is rendered with.
+    """
+
+    __slots__ = ('widget', 'marker', 'render_kwargs')
+
+    def __init__(self, widget: Abstract, marker: str):
+        """Init
+        """
+        self.widget = widget
+        self.marker = marker
+        self.render_kwargs = {}
+
+    @property
+    def uid(self) -> str:
+        return self.widget.uid
+
+    @property
+    def name(self) -> str:
+        return self.widget.name
+
+    @name.setter
+    def name(self, value: str):
+        self.widget.name = value
+
+    @property
+    def form_group(self) -> bool:
+        return self.widget.form_group
+
+    @form_group.setter
+    def form_group(self, value: bool):
+        self.widget.form_group = value
+
+    def _render(self, **kwargs) -> str:
+        self.render_kwargs = dict(kwargs)
+        return self.marker
+
+    def renderable(self) -> htmler.Element:
+        return RenderedElement(self._render)
+
+    def fill(self, value, render_kwargs: dict) -> str:
+        self.widget.set_val(value)
+        return self.widget.renderable().render(**render_kwargs)
+
+
+class _RowTemplate:
+    """Row of a MultiRow rendered once, rows are produced by filling its slots
+
+    Widgets which support value slots are rendered once with a marker value, other ones are rendered for each row.
+    """
+
+    __slots__ = ('_defaults', '_fills', '_cells', '_markers', '_row', '_compiled')
+
+    def __init__(self, owner: 'MultiRow', widgets: List[Abstract]):
+        """Init
+        """
+        self._defaults = {}  # type: Dict[str, Any]
+        self._fills = {}  # type: Dict[str, Callable[[Any], str]]
+        self._cells = {}  # type: Dict[str, _CellSlot]
+        self._markers = {str(_ROW_NUM_MARKER + 1): None}  # type: Dict[str, Optional[str]]
+        self._compiled = {}  # type: Dict[tuple, Optional[tuple]]
+
+        row_widgets = []
+        for i, w in enumerate(widgets):
+            # Rows which don't have a value of a widget show its initial value
+            self._defaults[w.uid] = deepcopy(w.get_val())
+
+            marker = '{}{}{}'.format(_SLOT_MARKER_START, i, _SLOT_MARKER_END)
+            slot = w._get_value_slot(marker)
+            if slot:
+                marker_markup, self._fills[w.uid] = slot
+                self._markers[marker_markup] = w.uid
+                row_widgets.append(w)
+            else:
+                cell = self._cells[w.uid] = _CellSlot(w, marker)
+                self._markers[marker] = w.uid
+                row_widgets.append(cell)
+
+        self._row = owner._get_row(row_widgets, _ROW_NUM_MARKER)
+
+    def _compile(self, **kwargs) -> Optional[tuple]:
+        """Render the row with markers and split it into constant parts and slots
+        """
+        markup = self._row.render(**kwargs)
+        chunks = re.split('({})'.format('|'.join(re.escape(m) for m in self._markers)), markup)
+        slots = tuple(self._markers[m] for m in chunks[1::2])
+
+        # Each marker must be found exactly once, otherwise rows cannot be produced by substitution
+        if len(slots) != len(self._markers) or len(set(slots)) != len(slots):
+            return None
+
+        # Widget's marker value must not leak out of its slot, i.e. into data attributes
+        if any(_SLOT_MARKER_START in part for part in chunks[::2]):
+            return None
+
+        return tuple(chunks[::2]), slots, {uid: cell.render_kwargs for uid, cell in self._cells.items()}
+
+    def render(self, row_num: int, values: dict, **kwargs) -> Optional[str]:
+        """Render a row
+
+        Returns None if the row cannot be rendered using the template.
+        """
+        key = (kwargs.get('indent', True), kwargs.get('depth', 0))
+        try:
+            compiled = self._compiled[key]
+        except KeyError:
+            compiled = self._compiled[key] = self._compile(**kwargs)
+
+        if compiled is None:
+            return None
+
+        defaults = self._defaults
+        for uid in values:
+            if uid not in defaults:
+                raise KeyError(uid)
+
+        parts, slots, cells_kwargs = compiled
+        fills, cells = self._fills, self._cells
+        r = [parts[0]]
+        for i, uid in enumerate(slots):
+            if uid is None:
+                r.append(str(row_num + 1))
+            else:
+                value = values[uid] if uid in values else deepcopy(defaults[uid])
+                r.append(cells[uid].fill(value, cells_kwargs[uid]) if uid in cells else fills[uid](value))
+            r.append(parts[i + 1])
+
+        return ''.join(r)
+
+
+class RowView(MappingABC):
+    """Read-only view of a row of columnar rows
+    """
+
+    __slots__ = ('_columns', '_index')
+
+    def __init__(self, columns: Mapping[str, Sequence], index: int):
+        """Init
+        """
+        self._columns = columns
+        self._index = index
+
+    def __getitem__(self, key: str):
+        return self._columns[key][self._index]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class ColumnarRows(SequenceABC):
+    """Rows stored as parallel sequences of columns' values
+
+    Rows are accessed as read-only views, so a row doesn't cost a dict. Columns may be lists or typed arrays.
+    """
+
+    __slots__ = ('_columns', '_len')
+
+    def __init__(self, columns: Mapping[str, Sequence]):
+        """Init
+        """
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError('All columns must have the same length')
+
+        self._columns = columns
+        self._len = lengths.pop() if lengths else 0
+
+    @property
+    def columns(self) -> Mapping[str, Sequence]:
+        """Get columns
+        """
+        return self._columns
+
+    def column(self, key: str) -> Sequence:
+        """Get values of a column
+        """
+        return self._columns[key]
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return ColumnarRows(OrderedDict((k, c[index]) for k, c in self._columns.items()))
+
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError('Row index out of range')
+
+        return RowView(self._columns, index)
+
+    def __iter__(self) -> Iterator[RowView]:
+        columns = self._columns
+        return (RowView(columns, i) for i in range(self._len))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ColumnarRows):
+            return self.to_list() == other.to_list()
+        if isinstance(other, (list, tuple)):
+            return self.to_list() == list(other)
+
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self.to_list())
+
+    def to_list(self) -> List[dict]:
+        """Get rows as a list of dicts
+        """
+        keys = list(self._columns)
+
+        return [dict(zip(keys, values)) for values in zip(*self._columns.values())] if keys else []
+
+
+class RowsValidationError(validation.error.RuleError):
+    """Errors of all rows of a MultiRow
+
+    Message ID and arguments are the ones of the first error, so the exception can be handled as a single RuleError.
+    """
+
+    def __init__(self, errors: Dict[int, Dict[str, validation.error.RuleError]]):
+        """Init
+        """
+        first = next(iter(next(iter(errors.values())).values()))
+        super().__init__(first.msg_id, first.msg_args)
+
+        self._errors = errors
+
+    @property
+    def errors(self) -> Dict[int, Dict[str, validation.error.RuleError]]:
+        """Get errors by positions of rows and UIDs of widgets
+        """
+        return self._errors
+
+    def __str__(self) -> str:
+        return '\n'.join(str(e) for row_errors in self._errors.values() for e in row_errors.values())
 
 
 class Container(Abstract):
     """Base Container Widget
     """
 
+    __slots__ = ('_body_css',)
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
@@ -34,16 +312,44 @@ class MultiRow(Abstract):
     """Multi Row Container Widget
     """
 
+    __slots__ = ('_max_rows', '_is_header_hidden', '_add_btn_label', '_add_btn_icon', '_columnar', '_window_size',
+                 '_rows_spec_kwargs')
+
+    _msg_ids = ('append', 'multi_row_validation_error')
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
+        # This must be set BEFORE calling parent init because it takes part in set_val()
+        self._columnar = kwargs.get('columnar', False)
+
         super().__init__(uid, **kwargs)
 
         self._css += ' widget-multi-row'
         self._max_rows = kwargs.get('max_rows')
         self._is_header_hidden = kwargs.get('is_header_hidden', False)
-        self._add_btn_label = kwargs.get('add_btn_label', lang.t('plugins.widget@append'))
+        self._add_btn_label = kwargs['add_btn_label'] if 'add_btn_label' in kwargs else self.t('append')
         self._add_btn_icon = kwargs.get('add_btn_icon', 'fa fa-fw fas fa-plus')
+        self._window_size = kwargs.get('window_size')
+
+        if self._window_size is not None and self._window_size < 1:
+            raise ValueError('Window size must be greater than zero')
+
+        # Rows which are loaded later are rendered by a widget built with the same arguments
+        self._rows_spec_kwargs = None
+        if self._window_size:
+            self._rows_spec_kwargs = {k: v for k, v in kwargs.items() if k not in _ROWS_SPEC_IGNORED_KWARGS}
+            try:
+                json_dumps(self._rows_spec_kwargs)
+            except TypeError as e:
+                raise TypeError('Arguments of a virtualized MultiRow must be JSON serializable: {}'.format(e))
+
+    @classmethod
+    def _setup_class_meta(cls):
+        super()._setup_class_meta()
+
+        # Rows of virtualized widgets are rendered by the HTTP API endpoint, which looks up widget's class by its ID
+        _multi_row_classes[cls._cls_cid] = cls
 
     @property
     def add_btn_label(self) -> str:
@@ -53,10 +359,107 @@ class MultiRow(Abstract):
     def add_btn_icon(self) -> str:
         return self._add_btn_icon
 
+    @property
+    def columnar(self) -> bool:
+        """Check if the value is stored as columns
+        """
+        return self._columnar
+
+    @property
+    def window_size(self) -> Optional[int]:
+        """Get number of rows rendered at once, None means all rows are rendered
+        """
+        return self._window_size
+
+    @property
+    def is_virtualized(self) -> bool:
+        """Check if only a part of rows is rendered on the page
+        """
+        return bool(self._window_size) and len(self.value) > self._window_size
+
+    @staticmethod
+    def _merge_rows_payload(value: Dict[str, Any]) -> Dict[str, list]:
+        """Append rows which were not rendered on the page to rows submitted by their inputs
+        """
+        try:
+            payload = json_loads(value[_ROWS_PAYLOAD_KEY] or '{}')
+        except (TypeError, ValueError):
+            raise ValueError('Invalid rows payload')
+        if not isinstance(payload, dict) or not all(isinstance(column, list) for column in payload.values()):
+            raise ValueError('Invalid rows payload')
+
+        columns = OrderedDict((k, v) for k, v in value.items() if k != _ROWS_PAYLOAD_KEY)
+        rendered_len = len(next(iter(columns.values()))) if columns else 0
+        payload_len = len(next(iter(payload.values()))) if payload else 0
+        for k in OrderedDict.fromkeys(list(columns) + list(payload)):
+            columns[k] = list(columns.get(k, [None] * rendered_len)) + payload.get(k, [None] * payload_len)
+
+        return columns
+
+    def _set_columnar_val(self, value: Union[ColumnarRows, Dict[str, Sequence], List[dict]]):
+        """Set value in columnar mode
+        """
+        if isinstance(value, ColumnarRows):
+            columns = value.columns
+        elif isinstance(value, dict):
+            # HTTP input is already a dict of columns, its lists are used as they are
+            columns = value
+            for column in columns.values():
+                if not isinstance(column, (list, tuple, array)):
+                    raise TypeError('List or tuple expected, {} given'.format(type(column)))
+        elif isinstance(value, (list, tuple)):
+            keys = None
+            for v in value:
+                if not isinstance(v, dict):
+                    raise TypeError('Dict expected, {} given'.format(type(v)))
+                if keys is None:
+                    keys = list(v)
+                elif len(v) != len(keys) or any(k not in v for k in keys):
+                    raise ValueError('All rows must have the same keys in columnar mode')
+            columns = OrderedDict((k, [v[k] for v in value]) for k in keys or ())
+        else:
+            raise TypeError('List or tuple expected, {} given'.format(type(value)))
+
+        rows = ColumnarRows(columns)
+
+        # Cleanup value
+        keep = [i for i, values in enumerate(zip(*columns.values())) if any(values)]
+        if len(keep) != len(rows):
+            columns = OrderedDict((k, [column[i] for i in keep]) for k, column in columns.items())
+
+        # Store numbers compactly
+        typed_columns = None
+        for w in self._get_widgets():
+            typecode = w._get_value_typecode()
+            column = columns.get(w.uid)
+            if typecode and column is not None and not isinstance(column, array):
+                # Columns which have empty or invalid values are left as they are
+                try:
+                    converter = _TYPECODE_CONVERTERS.get(typecode)
+                    converted = array(typecode, map(converter, column) if converter else column)
+                except (TypeError, ValueError, OverflowError):
+                    continue
+                typed_columns = typed_columns or OrderedDict(columns)
+                typed_columns[w.uid] = converted
+
+        if typed_columns is not None:
+            columns = typed_columns
+        if columns is not rows.columns:
+            rows = ColumnarRows(columns)
+
+        super().set_val(rows)
+
     def set_val(self, value: List[dict]):
         if value is None:
             value = []
 
+        # Virtualized widget submits rows which were not rendered in a hidden input
+        if isinstance(value, dict) and _ROWS_PAYLOAD_KEY in value:
+            value = self._merge_rows_payload(value)
+
+        if self._columnar:
+            return self._set_columnar_val(value)
+
         # If value comes from HTTP input, it usually is a dict, and it must be converted to a list
         if isinstance(value, dict):
             new_val = []
@@ -87,25 +490,83 @@ class MultiRow(Abstract):
 
         super().set_val(clean_value)
 
-    def validate(self):
-        """Validate widget's rules
+    @staticmethod
+    def _compile_column_validator(widget: Abstract) -> Callable[[Any], None]:
+        """Get a function which validates a value of a column using widget's rules
+        """
+        if type(widget).validate is not Abstract.validate:
+            def validate(value):
+                widget.value = value
+                widget.validate()
+
+            return validate
+
+        # Rules are shared by all values, so each value is validated by a rule in its initial state
+        rules = tuple((rule, rule.value) for rule in widget.get_rules())
+
+        def validate(value):
+            widget.value = value
+            value = widget.get_val()
+            for rule, initial_value in rules:
+                rule.value = initial_value
+                rule.validate(value)
+
+        return validate
+
+    def validate_rows(self) -> Dict[int, Dict[str, validation.error.RuleError]]:
+        """Validate all rows
+
+        Rules of each column are compiled once and applied to all values of the column. Returns errors by positions of
+        rows and UIDs of widgets, in order of rows and their values. Empty result means all rows are valid.
         """
-        for i in range(len(self.value)):
-            row_widgets = {w.uid: w for w in self._get_widgets()}  # type: Dict[str, Abstract]
-            for w_name, w_value in self.value[i].items():
-                widget = row_widgets[w_name]  # type: Abstract
-                widget.value = w_value
+        widgets = OrderedDict((w.uid, w) for w in self._get_widgets())  # type: Dict[str, Abstract]
+        rows = list(self._iter_row_values())
+        columns = self._value.columns if isinstance(self._value, ColumnarRows) else None
+        for uid in (columns if columns is not None else (uid for row_num, values in rows for uid in values)):
+            if uid not in widgets:
+                raise KeyError(uid)
+
+        # Validate column by column
+        cell_errors = {}
+        for uid, widget in widgets.items():
+            if columns is not None:
+                if uid not in columns:
+                    continue
+                cells = enumerate(columns[uid])
+            else:
+                cells = ((i, values[uid]) for i, (row_num, values) in enumerate(rows) if uid in values)
+
+            validate = self._compile_column_validator(widget)
+            for i, value in cells:
                 try:
-                    widget.validate()
+                    validate(value)
                 except validation.error.RuleError as e:
-                    msg_id = 'plugins.widget@multi_row_validation_error'
-                    msg_args = {
-                        'row_index': i + 1,
-                        'widget_label': widget.label,
-                        'orig_msg': str(e)
-                    }
+                    # Rules keep arguments of the last validated value in a dict shared with their errors
+                    cell_errors[(i, uid)] = validation.error.RuleError(e.msg_id, dict(e.msg_args or {}))
+
+        # Collect errors in order of rows
+        errors = OrderedDict()
+        if cell_errors:
+            msg_id = self.resolve_msg_id('multi_row_validation_error')
+            for i in sorted({i for i, uid in cell_errors}):
+                row_num, values = rows[i]
+                for uid in values:
+                    e = cell_errors.get((i, uid))
+                    if e is not None:
+                        errors.setdefault(i, OrderedDict())[uid] = validation.error.RuleError(msg_id, {
+                            'row_index': row_num + 1,
+                            'widget_label': widgets[uid].label,
+                            'orig_msg': str(e)
+                        })
+
+        return errors
 
-                    raise validation.error.RuleError(msg_id, msg_args)
+    def validate(self):
+        """Validate widget's rules
+        """
+        errors = self.validate_rows()
+        if errors:
+            raise RowsValidationError(errors)
 
     @abstractmethod
     def _get_widgets(self) -> List[Abstract]:
@@ -144,28 +605,127 @@ class MultiRow(Abstract):
 
         return slot_tr
 
-    def _get_rows(self) -> List[htmler.Tr]:
+    def _prefetch(self):
+        # Let widgets prepare data needed for all rendered rows at once
+        if not self.value:
+            return
+
+        if isinstance(self.value, ColumnarRows):
+            rows = self.value[:self._window_size] if self._window_size else self.value
+            for w in self._get_widgets():
+                w._prefetch_values(list(rows.columns[w.uid]) if w.uid in rows.columns else [None] * len(rows))
+            return
+
+        # Rows are taken in the shape of row widgets' values, whatever the value is stored like
+        rows = self._iter_row_values()
+        if self._window_size:
+            rows = islice(rows, self._window_size)
+        rows = [values for row_num, values in rows]
+        for w in self._get_widgets():
+            w._prefetch_values([values.get(w.uid) for values in rows])
+
+    def _iter_row_values(self) -> Iterator[Tuple[int, dict]]:
+        """Iterate over rows' numbers and values of rows' widgets
+        """
+        return enumerate(self.value)
+
+    def _build_row(self, row_num: int, values: dict) -> htmler.Tr:
+        """Build a row from scratch
+        """
+        row_widgets = {w.uid: w for w in self._get_widgets()}  # type: Dict[str, Abstract]
+        for w_name, w_value in values.items():
+            row_widgets[w_name].value = w_value
+
+        return self._get_row(list(row_widgets.values()), row_num)
+
+    def _iter_template_rows(self, rows: Iterable[Tuple[int, dict]]) -> Iterator[htmler.Element]:
+        """Build table body rows by filling a row template
+        """
+        template = _RowTemplate(self, self._get_widgets())
+
+        for row_num, values in rows:
+            def render(row_num=row_num, values=values, **kwargs) -> str:
+                markup = template.render(row_num, values, **kwargs)
+                return markup if markup is not None else self._build_row(row_num, values).render(**kwargs)
+
+            yield RenderedElement(render)
+
+    def _iter_rows(self) -> Iterator[htmler.Element]:
+        """Build table body rows one by one
+        """
+        if not self._prefetch_tree():
+            self._prefetch()
+
+        rows = self._iter_row_values()
+        if self._window_size:
+            rows = islice(rows, self._window_size)
+
+        return self._iter_template_rows(rows)
+
+    def _get_rows(self) -> List[htmler.Element]:
         """Build table body rows
         """
-        r = []
+        return list(self._iter_rows())
 
-        for i in range(len(self.value)):
-            row_widgets = {w.uid: w for w in self._get_widgets()}  # type: Dict[str, Abstract]
-            for w_name, w_value in self.value[i].items():
-                row_widgets[w_name].value = w_value
+    def render_rows(self, start: int = 0) -> str:
+        """Render all rows of the value as table body rows, numbering them from a position
 
-            r.append(self._get_row(list(row_widgets.values()), i))
+        Used by the HTTP API endpoint to render windows of virtualized widgets.
+        """
+        if not self._prefetch_tree():
+            self._prefetch()
 
-        return r
+        rows = ((start + row_num, values) for row_num, values in self._iter_row_values())
 
-    def _get_element(self, **kwargs) -> htmler.Element:
-        """Hook
+        return ''.join(row.render() for row in self._iter_template_rows(rows))
+
+    def get_rows_spec(self) -> dict:
+        """Get specification of a widget which renders rows of the virtualized widget
+
+        The widget is built with the same constructor arguments and the current name and state. Other changes made
+        after construction are not reproduced.
         """
-        self._data['header-hidden'] = self._is_header_hidden
+        kwargs = dict(self._rows_spec_kwargs or {})
+        kwargs.update(name=self.name, enabled=self._enabled)
+
+        return {'cid': self._cls_cid, 'uid': self._uid, 'kwargs': kwargs}
+
+    def _get_rows_payload(self) -> str:
+        """Get rows which are not rendered on the page as JSON encoded columns
+        """
+        if isinstance(self._value, ColumnarRows):
+            columns = OrderedDict((k, list(v[self._window_size:])) for k, v in self._value.columns.items())
+        else:
+            rows = [values for row_num, values in islice(self._iter_row_values(), self._window_size, None)]
+            columns = OrderedDict((w.uid, [values.get(w.uid) for values in rows]) for w in self._get_widgets())
+
+        return json_dumps(columns, ensure_ascii=False, separators=(',', ':'), default=str)
+
+    def _get_data(self) -> dict:
+        data = dict(super()._get_data())
+        data['header-hidden'] = self._is_header_hidden
 
         if self._max_rows:
-            self._data['max-rows'] = self._max_rows
+            data['max-rows'] = self._max_rows
+
+        if self.is_virtualized:
+            data['total-rows'] = len(self.value)
+            data['window-size'] = self._window_size
+            data['rows-url'] = http_api.url('widget@multi_row_rows')
+            data['rows-spec'] = _signing.sign(self.get_rows_spec())
+
+        return data
 
+    def _get_render_cache_key_parts(self) -> Optional[List[str]]:
+        # Specification of rows is signed within the current session
+        if self.is_virtualized:
+            return None
+
+        return super()._get_render_cache_key_parts()
+
+    def _get_element(self, **kwargs) -> htmler.Element:
+        """Hook
+        """
         base_row = self._get_widgets()
         table = htmler.Table(css='content-table')
 
@@ -175,7 +735,7 @@ class MultiRow(Abstract):
         row = htmler.Tr()
         thead.append_child(row)
         row.append_child(htmler.Th('&nbsp;', css='order-col'))
-        for w in self._get_widgets():
+        for w in base_row:
             row.append_child(htmler.Th(w.label, css='widget-col'))
         row.append_child(htmler.Th(css='actions-col'))
 
@@ -186,14 +746,13 @@ class MultiRow(Abstract):
         # Base slot
         tbody.append_child(self._get_row(base_row, add_css='base hidden sr-only'))
 
-        # Rows
-        for em in self._get_rows():
-            tbody.append_child(em)
+        # Rows are built while rendering
+        tbody.append_child(LazyElement(self._iter_rows))
 
         # Footer
         tfoot = htmler.Tfoot()
         tfoot_tr = htmler.Tr()
-        tfoot_td = htmler.Td(colspan=len(self._get_widgets()) + 2)
+        tfoot_td = htmler.Td(colspan=len(base_row) + 2)
         tfoot_tr.append_child(tfoot_td)
         tfoot.append_child(tfoot_tr)
         table.append_child(tfoot)
@@ -206,6 +765,12 @@ class MultiRow(Abstract):
                 add_btn.append_child(self._add_btn_label)
             tfoot_td.append_child(add_btn)
 
+        # Rows which are not rendered yet are submitted as they are
+        if self.is_virtualized:
+            tfoot_td.append_child(htmler.Input(type='hidden', css='rows-payload',
+                                               name='{}[{}]'.format(self.name, _ROWS_PAYLOAD_KEY),
+                                               value=self._get_rows_payload()))
+
         return table
 
 
@@ -213,26 +778,36 @@ class MultiRowList(MultiRow):
     """Works like a MultiRow, but stores value as a flat list, not as a list of dicts
     """
 
+    __slots__ = ('_is_unique',)
+
     def __init__(self, uid: str, **kwargs):
         self._is_unique = kwargs.get('is_unique', True)
         super().__init__(uid, **kwargs)
 
+        # Flat values cannot carry rows which are not rendered, so all rows are always rendered
+        self._window_size = None
+        self._rows_spec_kwargs = None
+
     def _get_row_widget_name(self, widget: Abstract):
         return '{}[]'.format(self.name)
 
-    def _get_rows(self) -> List[htmler.Tr]:
-        """Build table body rows
-        """
-        r = []
-
-        widgets_per_row = len(self._get_widgets())
+    def _iter_row_values(self) -> Iterator[Tuple[int, dict]]:
+        uids = [w.uid for w in self._get_widgets()]
+        widgets_per_row = len(uids)
         for row_num in range(0, len(self.value), widgets_per_row):
-            row_widgets = self._get_widgets()
-            for col_num in range(len(row_widgets)):
-                row_widgets[col_num].value = self.value[row_num + col_num]
-            r.append(self._get_row(row_widgets, row_num))
+            yield row_num, {uid: self.value[row_num + col_num] for col_num, uid in enumerate(uids)}
+
+    def _build_row(self, row_num: int, values: dict) -> htmler.Tr:
+        row_widgets = self._get_widgets()
+        for w in row_widgets:
+            w.value = values[w.uid]
 
-        return r
+        return self._get_row(row_widgets, row_num)
+
+    def _iter_rows(self) -> Iterator[htmler.Element]:
+        """Build table body rows one by one
+        """
+        return self._iter_template_rows(self._iter_row_values())
 
     def set_val(self, value: List[str]):
         if value is None:
@@ -244,24 +819,26 @@ class MultiRowList(MultiRow):
 
         self._value = util.cleanup_list(value, self._is_unique)
 
-    def validate(self):
-        row_widgets = self._get_widgets()
-        widgets_per_row = len(row_widgets)
-        for row_num in range(0, len(self.value), widgets_per_row):
-            for col_num in range(len(row_widgets)):
-                widget = row_widgets[col_num]
-                try:
-                    widget.value = self.value[row_num + col_num]
-                    widget.validate()
-                except validation.error.RuleError as e:
-                    msg_id = 'plugins.widget@multi_row_validation_error'
-                    msg_args = {
-                        'row_index': row_num + 1,
-                        'widget_label': widget.label,
-                        'orig_msg': str(e)
-                    }
 
-                    raise validation.error.RuleError(msg_id, msg_args)
+def get_multi_row_class(cid: str) -> type:
+    """Get a MultiRow class by its ID
+    """
+    cls = _multi_row_classes.get(cid)
+    if cls is None or isabstract(cls):
+        raise RuntimeError("MultiRow class '{}' is not found".format(cid))
+
+    return cls
+
+
+def build_multi_row(spec: dict, value=None) -> MultiRow:
+    """Build a widget which renders rows of a virtualized MultiRow, see `MultiRow.get_rows_spec()`
+    """
+    try:
+        cid, uid, kwargs = spec['cid'], spec['uid'], spec['kwargs']
+    except (KeyError, TypeError):
+        raise ValueError('Invalid MultiRow specification')
+
+    return get_multi_row_class(cid)(uid, value=value, **kwargs)
 
 
 class Card(Container):
@@ -271,6 +848,8 @@ class Card(Container):
     https://getbootstrap.com/docs/3.3/components/#panels
     """
 
+    __slots__ = ('_header_css', '_footer_css', '_header', '_footer')
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
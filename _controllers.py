@@ -0,0 +1,112 @@
+"""PytSite Widget Plugin Controllers
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+from hashlib import sha1
+from json import loads as json_loads
+from pytsite import routing, http, lang
+from . import _container, _items, _search, _select, _signing
+
+
+class Select2Search(routing.Controller):
+    """Search items of a catalog for Select2 widgets
+    """
+
+    max_age = 300
+
+    def exec(self) -> http.Response:
+        if not _items.is_catalog_registered(self.arg('catalog')):
+            raise self.not_found()
+
+        try:
+            page = int(self.arg('page', 1))
+            per_page = min(int(self.arg('per_page', 20)), 100)
+            min_length = int(self.arg('min_length', 0))
+            exclude = json_loads(self.arg('exclude')) if self.arg('exclude') else None
+        except ValueError as e:
+            raise self.warning(e, 400)
+
+        catalog = _items.get_catalog(self.arg('catalog'))
+        query = self.arg('q') or ''
+        linked_value = self.arg('linked') or None
+
+        # Responses depend only on catalog's content and request's arguments, so clients may revalidate them cheaply
+        etag = sha1(repr((
+            catalog.version, lang.get_current(), query, page, per_page, sorted(map(str, exclude or ())), linked_value,
+            min_length,
+        )).encode('utf-8')).hexdigest()
+        headers = {'ETag': '"{}"'.format(etag), 'Cache-Control': 'public, max-age={}'.format(self.max_age)}
+
+        if etag in self.request.if_none_match:
+            return http.Response(status=304, headers=headers)
+
+        return http.JSONResponse(_search.select2_results(
+            catalog,
+            query=query,
+            page=page,
+            per_page=per_page,
+            exclude=exclude,
+            linked_value=linked_value,
+            min_length=min_length,
+        ), headers=headers)
+
+
+class MultiRowRows(routing.Controller):
+    """Render a window of rows of a virtualized MultiRow widget
+    """
+
+    max_rows = 500
+
+    def exec(self) -> http.Response:
+        # Only widgets rendered by the server within the current session can be requested
+        try:
+            spec = _signing.unsign(self.arg('spec'))
+        except ValueError:
+            raise self.forbidden()
+
+        try:
+            start = int(self.arg('start', 0))
+            rows = json_loads(self.arg('rows') or '{}')
+            if start < 0:
+                raise ValueError('Start position must not be negative')
+            if not isinstance(rows, dict) or not all(isinstance(column, list) for column in rows.values()):
+                raise ValueError('Rows must be a dict of lists')
+            if any(len(column) > self.max_rows for column in rows.values()):
+                raise ValueError('Too many rows requested')
+        except ValueError as e:
+            raise self.warning(e, 400)
+
+        try:
+            widget = _container.build_multi_row(spec, rows)
+        except RuntimeError:
+            raise self.not_found()
+
+        return http.JSONResponse({'html': widget.render_rows(start)})
+
+
+class TabsPane(routing.Controller):
+    """Render a lazy tab of a Tabs widget
+    """
+
+    def exec(self) -> http.Response:
+        # Only widgets rendered by the server within the current session can be requested
+        try:
+            spec = _signing.unsign(self.arg('spec'))
+        except ValueError:
+            raise self.forbidden()
+
+        try:
+            widget = _select.build_tabs(spec)
+        except ValueError as e:
+            raise self.warning(e, 400)
+        except RuntimeError:
+            raise self.not_found()
+
+        try:
+            widget.get_tab_widgets(self.arg('tab'))
+        except RuntimeError:
+            raise self.not_found()
+
+        return http.JSONResponse({'html': widget.render_tab(self.arg('tab'))})
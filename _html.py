@@ -0,0 +1,239 @@
+"""PytSite Widget HTML Helpers
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+import htmler
+from typing import Callable, Iterable, Iterator, Tuple, Union
+from os import linesep
+
+
+class LazyElement(htmler.BlockElement):
+    """Tag-less element which children are produced on demand
+
+    Children are requested from the factory each time the element is iterated or rendered, so they don't have to be
+    kept in memory all together.
+    """
+
+    def __init__(self, children_factory: Callable[[], Iterable[htmler.Node]]):
+        """Init
+        """
+        super().__init__()
+
+        self._children_factory = children_factory
+
+    @property
+    def children(self):
+        """Get node's children
+
+        :rtype: Iterator[htmler.Node]
+        """
+        return iter(self._children_factory())
+
+    def __iter__(self):
+        return self.children
+
+    def _render_open_tag(self, **kwargs) -> str:
+        return ''
+
+    def _render_children(self, **kwargs) -> str:
+        return ''.join(child.render(**kwargs) for child in self)
+
+    def _render_close_tag(self, **kwargs) -> str:
+        return ''
+
+
+class RawInline(htmler.InlineElement):
+    """Inline element which markup is built directly as a string
+
+    Hot leaf widgets use it to avoid building a tree of htmler nodes. Output is the same as of the equivalent tree.
+    """
+
+    def __init__(self, markup: str):
+        """Init
+        """
+        super().__init__()
+
+        self._markup = markup
+
+    def set_attr(self, attr: str, value: str):
+        raise RuntimeError("Attributes of a pre-rendered element cannot be changed")
+
+    def append_child(self, child: htmler.Node):
+        raise ValueError("Pre-rendered element cannot contain children")
+
+    def render(self, **kwargs) -> str:
+        return self._markup
+
+
+class RawBlock(htmler.BlockElement):
+    """Block element which content is a single line of inline markup built directly as a string
+    """
+
+    def __init__(self, open_tag: str, content: str, close_tag: str):
+        """Init
+        """
+        super().__init__()
+
+        self._raw = (open_tag, content, close_tag)
+
+    def set_attr(self, attr: str, value: str):
+        raise RuntimeError("Attributes of a pre-rendered element cannot be changed")
+
+    def append_child(self, child: htmler.Node):
+        raise ValueError("Pre-rendered element cannot contain children")
+
+    def render(self, **kwargs) -> str:
+        return render_block(*self._raw, **kwargs)
+
+
+class RawBlockList(htmler.BlockElement):
+    """Tag-less element which renders a sequence of block elements built directly as strings
+
+    The factory produces `(open_tag, content, close_tag)` tuples, see `render_block()`, or regular block nodes for
+    cases the fast path does not cover.
+    """
+
+    def __init__(self, blocks_factory: Callable[[], Iterable[Union[Tuple[str, str, str], htmler.BlockElement]]]):
+        """Init
+        """
+        super().__init__()
+
+        self._blocks_factory = blocks_factory
+
+    def append_child(self, child: htmler.Node):
+        raise ValueError("Pre-rendered element cannot contain children")
+
+    def iter_render(self, **kwargs) -> Iterator[str]:
+        """Render blocks one by one
+        """
+        for block in self._blocks_factory():
+            yield render_raw(block, **kwargs)
+
+    def render(self, **kwargs) -> str:
+        return ''.join(self.iter_render(**kwargs))
+
+
+class RenderedElement(htmler.BlockElement):
+    """Tag-less block element which HTML is produced by a function
+
+    The function gets the same keyword arguments as `render()` does, so it can follow depth and indentation.
+    """
+
+    def __init__(self, renderer: Callable[..., str]):
+        """Init
+        """
+        super().__init__()
+
+        self._renderer = renderer
+
+    def append_child(self, child: htmler.Node):
+        raise ValueError("Pre-rendered element cannot contain children")
+
+    def render(self, **kwargs) -> str:
+        return self._renderer(**kwargs)
+
+
+def tag(name: str, attrs: dict) -> str:
+    """Build an opening tag the same way htmler renders it
+    """
+    return '<{}{}>'.format(name, htmler.html_attrs_str({k.replace('_', '-'): v for k, v in attrs.items()}))
+
+
+def render_block(open_tag: str, content: str, close_tag: str, **kwargs) -> str:
+    """Render a block element which has a single inline or text child the same way htmler does
+    """
+    if not kwargs.get('indent', True):
+        return open_tag + content + close_tag
+
+    indent_str = ' ' * htmler.block.INDENT_WIDTH * kwargs.get('depth', 0)
+
+    return indent_str + open_tag + linesep + \
+        indent_str + ' ' * htmler.block.INDENT_WIDTH + content + linesep + \
+        indent_str + close_tag + linesep
+
+
+def render_raw(block: Union[Tuple[str, str, str], htmler.Node], **kwargs) -> str:
+    """Render a block built by `option()` or a similar function
+    """
+    return block.render(**kwargs) if isinstance(block, htmler.Node) else render_block(*block, **kwargs)
+
+
+def option(value, title, selected: bool = False) -> Union[Tuple[str, str, str], htmler.Option]:
+    """Build an OPTION element as a string triple, see `render_block()`
+
+    Titles which are not strings are left to htmler.
+    """
+    if not isinstance(title, str):
+        em = htmler.Option(title, value=value)
+        if selected:
+            em.set_attr('selected', 'true')
+        return em
+
+    open_tag = '<option' if value is None else '<option value="{}"'.format(htmler.escape_html(str(value).strip()))
+
+    return (open_tag + ' selected>' if selected else open_tag + '>'), title, '</option>'
+
+
+def iter_node(node: htmler.Node, **kwargs) -> Iterator[str]:
+    """Render a node into chunks of HTML
+
+    Output is the same as `node.render(**kwargs)` produces.
+    """
+    if isinstance(node, LazyElement):
+        for child in node:
+            yield from iter_node(child, **kwargs)
+        return
+
+    if isinstance(node, RawBlockList):
+        yield from node.iter_render(**kwargs)
+        return
+
+    # Nodes with custom rendering are rendered as a whole
+    if not (isinstance(node, htmler.Element) and type(node).render is htmler.Element.render):
+        yield node.render(**kwargs)
+        return
+
+    open_tag = node._render_open_tag(**kwargs)
+    if open_tag:
+        yield open_tag
+
+    render_children = type(node)._render_children
+    if render_children is htmler.BlockElement._render_children:
+        yield from _iter_block_children(node, **kwargs)
+    elif render_children is htmler.Element._render_children:
+        for child in node:
+            yield from iter_node(child, **kwargs)
+    else:
+        yield node._render_children(**kwargs)
+
+    close_tag = node._render_close_tag(**kwargs)
+    if close_tag:
+        yield close_tag
+
+
+def _iter_block_children(node: htmler.BlockElement, **kwargs) -> Iterator[str]:
+    """Render children of a block element into chunks, following htmler's indentation rules
+    """
+    indent = kwargs.get('indent', True)
+    depth = kwargs.get('depth', 0) + 1
+    indent_str = ' ' * htmler.block.INDENT_WIDTH * depth
+    last_i = len(node) - 1
+
+    prev_child = None
+    for i, child in enumerate(node):
+        if indent:
+            if (i == 0 or isinstance(prev_child, htmler.BlockElement)) and \
+                    isinstance(child, (htmler.Text, htmler.InlineElement)):
+                yield indent_str
+            if isinstance(child, htmler.BlockElement) and isinstance(prev_child, (htmler.Text, htmler.InlineElement)):
+                yield linesep
+
+        kwargs['depth'] = depth
+        yield from iter_node(child, **kwargs)
+
+        if indent and i == last_i and isinstance(child, (htmler.Text, htmler.InlineElement)):
+            yield linesep
+
+        prev_child = child
@@ -5,20 +5,26 @@ __email__ = 'a@shepetko.com'
 __license__ = 'MIT'
 
 import htmler
-from typing import List
+from typing import Any, Callable, List, Optional, Tuple
 from pytsite import validation, router
 from ._base import Abstract
 from ._container import MultiRowList
+from ._html import RawInline, tag
+
+# Hooks which must not be overridden for a widget's value to be substituted into its pre-rendered markup
+_VALUE_SLOT_HOOKS = ('renderable', '_get_element', '_get_css', '_get_data')
 
 
 class Input(Abstract):
-    pass
+    __slots__ = ()
 
 
 class Hidden(Input):
     """Hidden Input Widget
     """
 
+    __slots__ = ()
+
     def __init__(self, uid: str, **kwargs):
         super().__init__(uid, **kwargs)
 
@@ -26,25 +32,41 @@ class Hidden(Input):
         self._form_group = False
         self._has_messages = False
 
-    def _get_element(self, **kwargs) -> htmler.Input:
-        inp = htmler.Input(
-            type='hidden',
-            id=self.uid,
-            name=self.name,
-            value=self.value,
-            required=self.required
-        )
+    def _get_element(self, **kwargs) -> htmler.Element:
+        attrs = {
+            'type': 'hidden',
+            'id': self.uid,
+            'name': self.name,
+            'value': self.value,
+            'required': self.required,
+        }
 
         for k, v in self._data.items():
-            inp.set_attr('data_' + k, v)
+            attrs['data_' + k] = v
+
+        return RawInline(tag('input', attrs))
 
-        return inp
+    def _get_value_slot(self, marker: str) -> Optional[Tuple[str, Callable[[Any], str]]]:
+        # Overridden hooks may put the value somewhere else than into the value attribute
+        if any(getattr(type(self), hook) is not getattr(Hidden, hook) for hook in _VALUE_SLOT_HOOKS):
+            return None
+
+        def fill(value) -> str:
+            self.set_val(value)
+            value = self.value
+            return ' value="{}"'.format(htmler.escape_html(str(value).strip())) if value is not None else ''
+
+        self._value = marker
+
+        return ' value="{}"'.format(marker), fill
 
 
 class Text(Input):
     """Text Input Widget
     """
 
+    __slots__ = ('_autocomplete', '_min_length', '_max_length', '_prepend', '_append', '_inputmask', '_type')
+
     def __init__(self, uid: str, **kwargs):
         """Init.
         """
@@ -106,51 +128,81 @@ class Text(Input):
     def inputmask(self, value: int):
         self._inputmask = value
 
-    def _get_element(self, **kwargs) -> htmler.Input:
-        """Render the widget
-        :param **kwargs:
+    def _get_input_attrs(self) -> dict:
+        """Get attributes of the input element
         """
-        inp = htmler.Input(
-            type=self._type,
-            id=self._uid,
-            name=self._name,
-            css='form-control',
-            autocomplete=self._autocomplete,
-            placeholder=self._placeholder,
-            required=self._required
-        )
+        attrs = {
+            'type': self._type,
+            'id': self._uid,
+            'name': self._name,
+            'css': 'form-control',
+            'autocomplete': self._autocomplete,
+            'placeholder': self._placeholder,
+            'required': self._required,
+        }
 
         value = self.get_val()
         if value:
-            inp.set_attr('value', value)
+            attrs['value'] = value
 
         if not self._enabled:
-            inp.set_attr('disabled', 'true')
+            attrs['disabled'] = 'true'
 
         if self._min_length:
-            inp.set_attr('minlength', self._min_length)
+            attrs['minlength'] = self._min_length
 
         if self._max_length:
-            inp.set_attr('maxlength', self._max_length)
+            attrs['maxlength'] = self._max_length
 
-        if self._prepend or self._append:
-            group = htmler.Div(css='input-group')
-            if self._prepend:
-                prepend = group.append_child(htmler.Div(css='input-group-addon input-group-prepend'))
-                prepend.append_child(htmler.Div(self._prepend, css='input-group-text'))
-            group.append_child(inp)
-            if self._append:
-                append = group.append_child(htmler.Div(css='input-group-addon input-group-append'))
-                append.append_child(htmler.Div(self._append, css='input-group-text'))
-            inp = group
+        return attrs
 
-        if self._inputmask:
-            inp.set_attr('data_inputmask', ','.join(["'{}': '{}'".format(k, v) for k, v in self._inputmask.items()]))
+    def _get_element(self, **kwargs) -> htmler.Element:
+        """Render the widget
+        :param **kwargs:
+        """
+        attrs = self._get_input_attrs()
+        inputmask = ','.join(["'{}': '{}'".format(k, v) for k, v in self._inputmask.items()]) \
+            if self._inputmask else None
+
+        # Plain input is built directly as a string
+        if not (self._prepend or self._append):
+            if inputmask:
+                attrs['data_inputmask'] = inputmask
+            return RawInline(tag('input', attrs))
+
+        group = htmler.Div(css='input-group')
+        if self._prepend:
+            prepend = group.append_child(htmler.Div(css='input-group-addon input-group-prepend'))
+            prepend.append_child(htmler.Div(self._prepend, css='input-group-text'))
+        group.append_child(htmler.Input(**attrs))
+        if self._append:
+            append = group.append_child(htmler.Div(css='input-group-addon input-group-append'))
+            append.append_child(htmler.Div(self._append, css='input-group-text'))
+
+        if inputmask:
+            group.set_attr('data_inputmask', inputmask)
+
+        return group
+
+    def _get_value_slot(self, marker: str) -> Optional[Tuple[str, Callable[[Any], str]]]:
+        # Only value attribute built by this class can be substituted, overridden hooks may use the value elsewhere
+        hooks = _VALUE_SLOT_HOOKS + ('_get_input_attrs',)
+        if any(getattr(type(self), hook) is not getattr(Text, hook) for hook in hooks):
+            return None
 
-        return inp
+        def fill(value) -> str:
+            self.set_val(value)
+            value = self.get_val()
+            return ' value="{}"'.format(htmler.escape_html(str(value).strip())) if value else ''
+
+        self._value = marker
+
+        return ' value="{}"'.format(marker), fill
 
 
 class Password(Text):
+    __slots__ = ()
+
     def __init__(self, uid: str, **kwargs):
         super().__init__(uid, **kwargs)
 
@@ -161,6 +213,8 @@ class Email(Text):
     """Email Input Widget
     """
 
+    __slots__ = ()
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
@@ -174,6 +228,8 @@ class Url(Text):
     """URL Input Widget
     """
 
+    __slots__ = ()
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
@@ -186,6 +242,8 @@ class DNSName(Text):
     """DNS Name Input Widget
     """
 
+    __slots__ = ()
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
@@ -198,6 +256,8 @@ class TextArea(Abstract):
     """Text Area Input Widget
     """
 
+    __slots__ = ('_rows', '_max_length')
+
     def __init__(self, uid: str, **kwargs):
         """Init.
         """
@@ -231,6 +291,8 @@ class TextArea(Abstract):
 
 
 class TypeaheadText(Text):
+    __slots__ = ()
+
     def __init__(self, uid: str, **kwargs):
         """Init.
         """
@@ -250,6 +312,8 @@ class TypeaheadText(Text):
 
 
 class Number(Text):
+    __slots__ = ('_convert_type', '_allow_minus', '_right_align', '_min', '_max')
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
@@ -288,11 +352,16 @@ class Number(Text):
 
         return super().set_val(value)
 
+    def _get_value_typecode(self) -> Optional[str]:
+        return {int: 'q', float: 'd'}.get(self._convert_type)
+
 
 class Integer(Number):
     """Integer Input Widget
     """
 
+    __slots__ = ()
+
     def __init__(self, uid: str, **kwargs):
         """Init.
         """
@@ -305,6 +374,8 @@ class Decimal(Number):
     """Decimal Input Widget
     """
 
+    __slots__ = ()
+
     def __init__(self, uid: str, **kwargs):
         """Init.
         """
@@ -317,6 +388,8 @@ class StringList(MultiRowList):
     """List of Strings Widget
     """
 
+    __slots__ = ('_autocomplete', '_min_length', '_max_length', '_prepend', '_append', '_inputmask')
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
@@ -352,6 +425,8 @@ class Tokens(Text):
     """Tokens Text Input Widget
     """
 
+    __slots__ = ('_local_source', '_remote_source')
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
@@ -388,6 +463,8 @@ class File(Abstract):
     """File Input Widget
     """
 
+    __slots__ = ('_max_files', '_multiple', '_accept', '_upload_endpoint')
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
@@ -0,0 +1,616 @@
+"""PytSite Widget Item Sources
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+import os
+import mmap
+import hashlib
+from typing import Any, Callable, Container, Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union
+from itertools import islice
+from struct import Struct
+from threading import Lock
+from pytsite import lang, validation
+from ._html import option, render_raw
+
+Item = Tuple[Any, Any]
+ItemsProvider = Callable[[int, Optional[int]], Iterable]
+
+
+class ItemSource:
+    """Lazy Source of Items
+
+    Wraps a list or tuple, any other iterable, or a callable provider of `(key, title)` pairs. Items are obtained,
+    checked and converted on first use, and only once. A provider is called as `provider(start, stop)` and must
+    return items of that window, `stop` is None for all remaining items. Slicing a source which is not consumed yet
+    asks the provider for the window only.
+    """
+
+    __slots__ = ('_source', '_converter', '_items', '_lock', '_version')
+
+    def __init__(self, source: Union[list, tuple, Iterable, ItemsProvider] = (),
+                 converter: Callable[[Any], Any] = None):
+        """Init
+        """
+        if isinstance(source, (str, bytes, dict)) or not (callable(source) or hasattr(source, '__iter__')):
+            raise TypeError('List, tuple, iterable or callable expected, got {}'.format(type(source)))
+
+        self._source = source
+        self._converter = converter
+        self._items = None  # type: Optional[Tuple[Item, ...]]
+        self._lock = Lock()
+        self._version = None  # type: Optional[str]
+
+    @property
+    def consumed(self) -> bool:
+        """Check if items are already obtained from the source
+        """
+        return self._items is not None
+
+    def _get_version(self) -> str:
+        """Compute version of items once
+        """
+        if self._version is None:
+            digest = hashlib.sha1()
+            for item in self._get_items():
+                digest.update(repr(item).encode('utf-8'))
+                digest.update(b'\n')
+            self._version = digest.hexdigest()[:16]
+
+        return self._version
+
+    @property
+    def version(self) -> Optional[str]:
+        """Get version of source's content
+
+        Returns None for lazy sources which items are not obtained yet, so getting the version doesn't consume them.
+        """
+        if self._items is None and not isinstance(self._source, (list, tuple)):
+            return None
+
+        return self._get_version()
+
+    def _convert(self, items: Iterable) -> Iterator[Item]:
+        """Check and convert items
+        """
+        converter = self._converter
+        for item in items:
+            if not (isinstance(item, (list, tuple)) and len(item) == 2):
+                raise TypeError('Each item must be a list or tuple and have exactly 2 elements')
+
+            yield (converter(item[0]) if converter else item[0]), item[1]
+
+    def _get_items(self) -> Tuple[Item, ...]:
+        """Consume the source
+        """
+        if self._items is None:
+            with self._lock:
+                if self._items is None:
+                    source = self._source
+                    if isinstance(source, ItemSource):
+                        items = source
+                    elif callable(source):
+                        items = source(0, None)
+                    else:
+                        items = source
+
+                    self._items = tuple(self._convert(items))
+                    self._source = None
+
+        return self._items
+
+    def __iter__(self) -> Iterator[Item]:
+        return iter(self._get_items())
+
+    def __len__(self) -> int:
+        return len(self._get_items())
+
+    def __bool__(self) -> bool:
+        return bool(self._get_items())
+
+    def __getitem__(self, index: Union[int, slice]):
+        if not isinstance(index, slice):
+            return self._get_items()[index]
+
+        if index.step not in (None, 1):
+            raise ValueError('Slice step is not supported')
+
+        source = self._source
+        if self._items is None and isinstance(source, ItemSource):
+            return tuple(self._convert(source[index]))
+
+        if self._items is None and callable(source):
+            start = index.start or 0
+            if start < 0 or (index.stop is not None and index.stop < 0):
+                raise ValueError('Negative slice indexes are not supported by item providers')
+            if index.stop is not None and index.stop <= start:
+                return ()
+
+            return tuple(islice(self._convert(source(start, index.stop)), None if index.stop is None else
+                                index.stop - start))
+
+        return self._get_items()[index]
+
+    def __add__(self, other):
+        """Concatenate two sources lazily
+
+        Items of each source are converted by its own converter only, windows are asked from each source separately.
+        """
+        if not isinstance(other, ItemSource):
+            other = ItemSource(other)
+
+        def provider(start: int, stop: Optional[int]) -> Tuple[Item, ...]:
+            r = tuple(self[start:stop])
+            if stop is not None and len(r) == stop - start:
+                return r
+
+            # The window reaches the end of the first source
+            offset = start + len(r) if r else len(self)
+
+            return r + tuple(other[max(start - offset, 0):None if stop is None else stop - offset])
+
+        return ItemSource(provider)
+
+
+class Catalog(ItemSource):
+    """Named Immutable Item Catalog
+
+    Catalogs are registered once per process and shared by all widgets which refer to them. If `translate` is True,
+    items' titles are treated as message IDs. Items' keys must be hashable. Options markup is pre-rendered once per
+    language, depth and indentation mode, selected and excluded options are patched in at render time.
+    """
+
+    __slots__ = ('_name', '_translate', '_linked', '_localized', '_options', '_keys')
+
+    def __init__(self, name: str, source: Union[list, tuple, Iterable, ItemsProvider],
+                 converter: Callable[[Any], Any] = None, translate: bool = False,
+                 linked: Callable[[Any], Container] = None):
+        """Init
+        """
+        super().__init__(source, converter)
+
+        self._name = name
+        self._translate = translate
+        self._linked = linked
+        self._localized = {}  # type: Dict[str, Tuple[Item, ...]]
+        self._options = {}  # type: Dict[tuple, Tuple[str, Tuple[str, ...], Dict[Any, Tuple[int, ...]]]]
+        self._keys = None  # type: Optional[Dict[Any, int]]
+
+    @property
+    def name(self) -> str:
+        """Get catalog's name
+        """
+        return self._name
+
+    @property
+    def translate(self) -> bool:
+        """Check if items' titles are message IDs
+        """
+        return self._translate
+
+    def get_items(self, language: str = None) -> Tuple[Item, ...]:
+        """Get items, translated if necessary
+        """
+        if not self._translate:
+            return self._get_items()
+
+        language = language or lang.get_current()
+        items = self._localized.get(language)
+        if items is None:
+            items = self._localized[language] = tuple((k, lang.t(t, language=language)) for k, t in self._get_items())
+
+        return items
+
+    @property
+    def version(self) -> str:
+        """Get version of catalog's content, which changes when items change
+        """
+        return self._get_version()
+
+    @property
+    def key_type(self) -> Optional[type]:
+        """Get type of items' keys, if it is fixed by the catalog
+        """
+        return None
+
+    def get_linked_keys(self, linked_value: Any) -> Optional[Container]:
+        """Get keys of items which are available when a linked select has a value
+
+        Returns None if the catalog doesn't depend on other selects.
+        """
+        return self._linked(linked_value) if self._linked else None
+
+    def __iter__(self) -> Iterator[Item]:
+        return iter(self.get_items())
+
+    def __getitem__(self, index: Union[int, slice]):
+        return self.get_items()[index] if self._translate or self.consumed else super().__getitem__(index)
+
+    def _get_keys(self) -> Dict[Any, int]:
+        """Get positions of items by their keys
+        """
+        if self._keys is None:
+            keys = {}
+            for i, item in enumerate(self._get_items()):
+                keys.setdefault(item[0], i)
+            self._keys = keys
+
+        return self._keys
+
+    def __contains__(self, key: Any) -> bool:
+        return _is_hashable(key) and key in self._get_keys()
+
+    def get_title(self, key: Any, default: Any = None, language: str = None) -> Any:
+        """Get title of an item
+        """
+        i = self._get_keys().get(key) if _is_hashable(key) else None
+
+        return default if i is None else self.get_items(language)[i][1]
+
+    def iter_search(self, query: str, language: str = None) -> Iterator[Item]:
+        """Iterate over items which titles start with a query, case insensitively
+        """
+        query = query.casefold()
+
+        return (item for item in self.get_items(language) if str(item[1]).casefold().startswith(query))
+
+    def search(self, query: str, limit: int = 20, language: str = None) -> Tuple[Item, ...]:
+        """Find items which titles start with a query, case insensitively
+        """
+        return tuple(islice(self.iter_search(query, language), limit))
+
+    def _get_options(self, language: str, **kwargs) -> Tuple[str, Tuple[str, ...], Dict[Any, Tuple[int, ...]]]:
+        """Get pre-rendered options
+        """
+        cache_key = (language, kwargs.get('indent', True), kwargs.get('depth', 0))
+        options = self._options.get(cache_key)
+
+        if options is None:
+            parts = []
+            positions = {}
+            for i, item in enumerate(self.get_items(language)):
+                parts.append(render_raw(option(item[0], item[1]), **kwargs))
+                positions.setdefault(item[0], []).append(i)
+
+            parts = tuple(parts)
+            options = self._options[cache_key] = (''.join(parts), parts, {k: tuple(v) for k, v in positions.items()})
+
+        return options
+
+    def render_options(self, selected: Container = (), exclude: Container = (), language: str = None,
+                       **kwargs) -> str:
+        """Render items as OPTION elements
+
+        Keyword arguments are the same as htmler's `render()` gets.
+        """
+        language = language or lang.get_current()
+        html, parts, positions = self._get_options(language, **kwargs)
+        if not (selected or exclude):
+            return html
+
+        items = self.get_items(language)
+        patches = {}
+        for key in selected:
+            for i in positions.get(key, ()) if _is_hashable(key) else ():
+                patches[i] = render_raw(option(items[i][0], items[i][1], True), **kwargs)
+        for key in exclude:
+            for i in positions.get(key, ()) if _is_hashable(key) else ():
+                patches[i] = ''
+
+        if not patches:
+            return html
+
+        parts = list(parts)
+        for i, part in patches.items():
+            parts[i] = part
+
+        return ''.join(parts)
+
+
+# Catalog file layout, all numbers are little-endian:
+#   header: magic, format version, key type, items count
+#   key offsets: count + 1 uint64, relative to the blobs section, items are sorted by key
+#   title offsets: count + 1 uint64, relative to the blobs section
+#   order: count uint32, sorted positions of items in their original order
+#   title order: count uint32, sorted positions of items ordered by case folded titles
+#   blobs: UTF-8 encoded keys followed by UTF-8 encoded titles
+_FILE_MAGIC = b'PWIC'
+_FILE_VERSION = 1
+_FILE_KEY_TYPES = (str, int)
+_file_header = Struct('<4sHHI')
+_file_offset = Struct('<Q')
+_file_offsets_pair = Struct('<QQ')
+_file_position = Struct('<I')
+
+
+def build_catalog_file(path: str, items: Iterable):
+    """Build a catalog file to be used by `MmapCatalog`
+
+    Items' keys must be either all strings or all integers, titles are converted to strings.
+    """
+    items = [(item[0], str(item[1])) for item in ItemSource(items)]
+    key_types = {type(item[0]) for item in items}
+    if len(key_types) > 1 or (key_types and key_types.pop() not in _FILE_KEY_TYPES):
+        raise TypeError('Items keys must be either all strings or all integers')
+    key_type = int if items and isinstance(items[0][0], int) else str
+
+    by_key = sorted(range(len(items)), key=lambda i: items[i][0])
+    sorted_pos = [0] * len(items)
+    for pos, i in enumerate(by_key):
+        sorted_pos[i] = pos
+    by_title = sorted(range(len(items)), key=lambda pos: items[by_key[pos]][1].casefold())
+
+    keys = [str(items[i][0]).encode('utf-8') for i in by_key]
+    titles = [items[i][1].encode('utf-8') for i in by_key]
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_file_header.pack(_FILE_MAGIC, _FILE_VERSION, _FILE_KEY_TYPES.index(key_type), len(items)))
+
+        offset = 0
+        for blob in keys:
+            f.write(_file_offset.pack(offset))
+            offset += len(blob)
+        f.write(_file_offset.pack(offset))
+        for blob in titles:
+            f.write(_file_offset.pack(offset))
+            offset += len(blob)
+        f.write(_file_offset.pack(offset))
+
+        for pos in sorted_pos:
+            f.write(_file_position.pack(pos))
+        for pos in by_title:
+            f.write(_file_position.pack(pos))
+
+        for blob in keys:
+            f.write(blob)
+        for blob in titles:
+            f.write(blob)
+
+    os.replace(tmp_path, path)
+
+
+class _MmapItems(Sequence):
+    """Read-only sequence of items stored in a memory mapped catalog file, in their original order
+    """
+
+    __slots__ = ('_catalog',)
+
+    def __init__(self, catalog):
+        self._catalog = catalog  # type: MmapCatalog
+
+    def __len__(self) -> int:
+        return self._catalog._count
+
+    def __getitem__(self, index: Union[int, slice]):
+        catalog = self._catalog
+        if isinstance(index, slice):
+            return tuple(catalog._get_item(catalog._get_order(i)) for i in range(*index.indices(catalog._count)))
+
+        if index < 0:
+            index += catalog._count
+        if not 0 <= index < catalog._count:
+            raise IndexError('Item index out of range')
+
+        return catalog._get_item(catalog._get_order(index))
+
+    def __iter__(self) -> Iterator[Item]:
+        catalog = self._catalog
+        for i in range(catalog._count):
+            yield catalog._get_item(catalog._get_order(i))
+
+
+class MmapCatalog(Catalog):
+    """Item Catalog Stored in a Memory Mapped File
+
+    The file is built offline by `build_catalog_file()` and mapped read-only, so its pages are shared between worker
+    processes. Items are decoded on demand and options markup is not cached, so memory usage of a process doesn't grow
+    with catalog's size.
+    """
+
+    __slots__ = ('_path', '_mmap', '_count', '_key_type', '_key_offsets_pos', '_title_offsets_pos', '_order_pos',
+                 '_title_order_pos', '_blobs_pos', '_view')
+
+    def __init__(self, name: str, path: str, linked: Callable[[Any], Container] = None):
+        """Init
+        """
+        super().__init__(name, (), linked=linked)
+
+        self._path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            stat = os.fstat(f.fileno())
+            self._version = '{:x}-{:x}'.format(stat.st_size, stat.st_mtime_ns)
+
+        if len(self._mmap) < _file_header.size:
+            raise ValueError("'{}' is not a catalog file".format(path))
+        magic, version, key_type, count = _file_header.unpack_from(self._mmap, 0)
+        if magic != _FILE_MAGIC or version != _FILE_VERSION or key_type >= len(_FILE_KEY_TYPES):
+            raise ValueError("'{}' is not a catalog file or its version is not supported".format(path))
+
+        self._count = count
+        self._key_type = _FILE_KEY_TYPES[key_type]
+        self._key_offsets_pos = _file_header.size
+        self._title_offsets_pos = self._key_offsets_pos + (count + 1) * _file_offset.size
+        self._order_pos = self._title_offsets_pos + (count + 1) * _file_offset.size
+        self._title_order_pos = self._order_pos + count * _file_position.size
+        self._blobs_pos = self._title_order_pos + count * _file_position.size
+        self._view = _MmapItems(self)
+        self._items = self._view
+
+    @property
+    def path(self) -> str:
+        """Get catalog file's path
+        """
+        return self._path
+
+    @property
+    def key_type(self) -> Optional[type]:
+        return self._key_type
+
+    def _get_items(self) -> Sequence[Item]:
+        return self._view
+
+    def _get_blob(self, offsets_pos: int, pos: int) -> str:
+        """Decode a key or a title
+        """
+        start, end = _file_offsets_pair.unpack_from(self._mmap, offsets_pos + pos * _file_offset.size)
+
+        return self._mmap[self._blobs_pos + start:self._blobs_pos + end].decode('utf-8')
+
+    def _get_key(self, pos: int) -> Any:
+        """Get key of an item by its sorted position
+        """
+        key = self._get_blob(self._key_offsets_pos, pos)
+
+        return int(key) if self._key_type is int else key
+
+    def _get_item(self, pos: int) -> Item:
+        """Get an item by its sorted position
+        """
+        return self._get_key(pos), self._get_blob(self._title_offsets_pos, pos)
+
+    def _get_order(self, i: int) -> int:
+        """Get sorted position of an item by its original position
+        """
+        return _file_position.unpack_from(self._mmap, self._order_pos + i * _file_position.size)[0]
+
+    def _get_title_order(self, i: int) -> int:
+        """Get sorted position of an item by its position in titles order
+        """
+        return _file_position.unpack_from(self._mmap, self._title_order_pos + i * _file_position.size)[0]
+
+    def _find(self, key: Any) -> Optional[int]:
+        """Find sorted position of an item by its key
+        """
+        if not isinstance(key, self._key_type):
+            try:
+                key = self._key_type(key)
+            except (TypeError, ValueError):
+                return None
+
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._get_key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        return lo if lo < self._count and self._get_key(lo) == key else None
+
+    def __contains__(self, key: Any) -> bool:
+        return self._find(key) is not None
+
+    def get_title(self, key: Any, default: Any = None, language: str = None) -> Any:
+        pos = self._find(key)
+
+        return default if pos is None else self._get_blob(self._title_offsets_pos, pos)
+
+    def iter_search(self, query: str, language: str = None) -> Iterator[Item]:
+        """Iterate over items which titles start with a query, case insensitively, in titles order
+
+        Items are looked up in the index of the file, nothing is loaded into memory.
+        """
+        query = query.casefold()
+
+        # Find the first title which is not less than the query
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._get_blob(self._title_offsets_pos, self._get_title_order(mid)).casefold() < query:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        for i in range(lo, self._count):
+            item = self._get_item(self._get_title_order(i))
+            if not item[1].casefold().startswith(query):
+                break
+            yield item
+
+    def render_options(self, selected: Container = (), exclude: Container = (), language: str = None,
+                       **kwargs) -> str:
+        return ''.join(render_raw(option(key, title, key in selected), **kwargs) for key, title in self._view
+                       if not (exclude and key in exclude))
+
+    def close(self):
+        """Unmap the file
+        """
+        self._mmap.close()
+
+
+class ItemKey(validation.rule.Rule):
+    """Rule which checks that a value, or each value of a list, is a key of a catalog's item
+    """
+
+    def __init__(self, value=None, msg_id: str = None, msg_args: dict = None, **kwargs):
+        """Init
+        """
+        super().__init__(value, msg_id or 'plugins.widget@validation_item_key', msg_args)
+
+        self._catalog = kwargs.get('catalog')  # type: Catalog
+        if not isinstance(self._catalog, Catalog):
+            raise TypeError('Instance of {} expected, got {}'.format(Catalog, type(self._catalog)))
+
+    def _do_validate(self):
+        """Do actual validation of the rule
+        """
+        for v in self._value if isinstance(self._value, (list, tuple)) else (self._value,):
+            if v not in (None, '') and v not in self._catalog:
+                self._msg_args.update({'value': str(v)})
+                raise validation.RuleError(self._msg_id, self._msg_args)
+
+
+_catalogs = {}  # type: Dict[str, Catalog]
+_catalogs_lock = Lock()
+
+
+def _is_hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+
+    return True
+
+
+def register_catalog(catalog: Catalog) -> Catalog:
+    """Register an item catalog
+    """
+    if not isinstance(catalog, Catalog):
+        raise TypeError('Instance of {} expected, got {}'.format(Catalog, type(catalog)))
+
+    with _catalogs_lock:
+        if catalog.name in _catalogs:
+            raise RuntimeError("Item catalog '{}' is already registered".format(catalog.name))
+
+        _catalogs[catalog.name] = catalog
+
+    return catalog
+
+
+def is_catalog_registered(name: str) -> bool:
+    """Check if an item catalog is registered
+    """
+    return name in _catalogs
+
+
+def get_catalog(name: str) -> Catalog:
+    """Get a registered item catalog
+    """
+    try:
+        return _catalogs[name]
+    except KeyError:
+        raise RuntimeError("Item catalog '{}' is not registered".format(name))
+
+
+def make_source(items: Union[ItemSource, list, tuple, Iterable, ItemsProvider],
+                converter: Callable[[Any], Any] = None) -> ItemSource:
+    """Make an item source
+    """
+    if isinstance(items, ItemSource) and converter is None:
+        return items
+
+    return ItemSource(items, converter)
@@ -13,6 +13,8 @@ from . import _base
 
 
 class DataTable(_base.Abstract):
+    __slots__ = ('_rows_url', '_data_fields', '_default_sort_field', '_default_sort_order', '_toolbar')
+
     def __init__(self, uid: str, **kwargs):
         super().__init__(uid, **kwargs)
 
@@ -32,6 +34,12 @@ class DataTable(_base.Abstract):
 
         self._css += ' widget-data-table'
 
+    def _on_clone(self, memo: dict):
+        super()._on_clone(memo)
+
+        self._data_fields = list(self._data_fields)
+        self._toolbar = self._copy_element(self._toolbar)
+
     @property
     def toolbar(self) -> htmler.Div:
         return self._toolbar
@@ -105,6 +113,8 @@ class DataTable(_base.Abstract):
 
 
 class BootstrapTable(DataTable):
+    __slots__ = ('_search', '_checkbox')
+
     def __init__(self, uid: str, **kwargs):
         super().__init__(uid, **kwargs)
 
@@ -172,6 +182,8 @@ class BootstrapTable(DataTable):
 
 
 class TreeTable(DataTable):
+    __slots__ = ('_update_rows_url',)
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
@@ -184,16 +196,15 @@ class TreeTable(DataTable):
         self._form_group = False
         self._css += ' widget-tree-table'
 
-    def render(self, **kwargs) -> str:
-        """Render the widget
-        """
-        self._data['rows_url'] = self._rows_url
-        self._data['update_rows_url'] = self._update_rows_url
-        self._data['fields'] = ','.join(['{}:{}'.format(v[0], v[1]) for v in self.data_fields])
-        self._data['sort_field'] = self._default_sort_field
-        self._data['sort_order'] = self._default_sort_order
+    def _get_data(self) -> dict:
+        data = dict(super()._get_data())
+        data['rows_url'] = self._rows_url
+        data['update_rows_url'] = self._update_rows_url
+        data['fields'] = ','.join(['{}:{}'.format(v[0], v[1]) for v in self.data_fields])
+        data['sort_field'] = self._default_sort_field
+        data['sort_order'] = self._default_sort_order
 
-        return super().render(**kwargs)
+        return data
 
     def _get_element(self, **kwargs) -> htmler.Element:
         """Get widget's HTML element
@@ -213,6 +224,8 @@ class VideoPlayer(_base.Abstract):
     """Video player widget.
     """
 
+    __slots__ = ()
+
     def _get_element(self, **kwargs) -> htmler.Element:
         """Render the widget.
         :param **kwargs:
@@ -0,0 +1,278 @@
+"""PytSite Widget Render Cache
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+import htmler
+from typing import Optional, Any
+from array import array
+from collections.abc import Mapping, Sequence
+from datetime import date, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from hashlib import sha1
+from threading import Lock
+from pytsite import cache
+from ._items import ItemSource, Catalog
+
+# Types which representation is stable and reflects value's state
+_STABLE_REPR_TYPES = (type(None), bool, int, float, complex, str, bytes, Decimal, date, time, timedelta, Enum, type)
+
+
+class Backend(ABC):
+    """Abstract Render Cache Backend
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Get an item
+        """
+        pass
+
+    @abstractmethod
+    def put(self, key: str, value: str):
+        """Put an item
+        """
+        pass
+
+    @abstractmethod
+    def rm(self, key: str):
+        """Remove an item
+        """
+        pass
+
+    @abstractmethod
+    def clear(self):
+        """Remove all items
+        """
+        pass
+
+
+class MemoryBackend(Backend):
+    """In-process LRU Backend
+    """
+
+    def __init__(self, max_size: int = 1000):
+        """Init
+        """
+        self._max_size = max_size
+        self._items = OrderedDict()  # type: OrderedDict[str, str]
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+
+            return value
+
+    def put(self, key: str, value: str):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self._max_size:
+                self._items.popitem(False)
+
+    def rm(self, key: str):
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class PoolBackend(Backend):
+    """Backend Based on PytSite Cache Pool
+
+    Uses the application's cache driver, so items can be shared between worker processes.
+    """
+
+    def __init__(self, pool_uid: str = 'plugins.widget.render', ttl: int = 3600):
+        """Init
+        """
+        self._pool = cache.get_pool(pool_uid) if cache.has_pool(pool_uid) else cache.create_pool(pool_uid)
+        self._ttl = ttl
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            return self._pool.get(key)
+        except cache.error.KeyNotExist:
+            return None
+
+    def put(self, key: str, value: str):
+        self._pool.put(key, value, self._ttl)
+
+    def rm(self, key: str):
+        try:
+            self._pool.rm(key)
+        except cache.error.KeyNotExist:
+            pass
+
+    def clear(self):
+        self._pool.clear()
+
+
+_backend = None  # type: Optional[Backend]
+_enabled = False
+_hits = 0
+_misses = 0
+_stats_lock = Lock()
+
+
+def enable(backend: Backend = None):
+    """Enable render cache
+    """
+    global _enabled
+
+    if backend:
+        set_backend(backend)
+
+    _enabled = True
+
+
+def disable():
+    """Disable render cache
+    """
+    global _enabled
+
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Check if the render cache is enabled
+    """
+    return _enabled
+
+
+def set_backend(backend: Backend):
+    """Set cache backend
+    """
+    global _backend
+
+    if not isinstance(backend, Backend):
+        raise TypeError('Instance of {} expected, got {}'.format(Backend, type(backend)))
+
+    _backend = backend
+
+
+def get_backend() -> Backend:
+    """Get cache backend
+    """
+    global _backend
+
+    if _backend is None:
+        _backend = MemoryBackend()
+
+    return _backend
+
+
+def get(key: str) -> Optional[str]:
+    """Get a rendered fragment
+    """
+    global _hits, _misses
+
+    value = get_backend().get(key)
+
+    with _stats_lock:
+        if value is None:
+            _misses += 1
+        else:
+            _hits += 1
+
+    return value
+
+
+def put(key: str, value: str):
+    """Put a rendered fragment
+    """
+    get_backend().put(key, value)
+
+
+def rm(key: str):
+    """Remove a rendered fragment
+    """
+    get_backend().rm(key)
+
+
+def clear():
+    """Remove all rendered fragments
+    """
+    get_backend().clear()
+
+
+def stats() -> dict:
+    """Get hits and misses counters
+    """
+    return {'hits': _hits, 'misses': _misses}
+
+
+def reset_stats():
+    """Reset hits and misses counters
+    """
+    global _hits, _misses
+
+    with _stats_lock:
+        _hits = _misses = 0
+
+
+def key_repr(value: Any) -> Optional[str]:
+    """Get a stable string representation of a value to be used as a part of a cache key
+
+    Returns None if the value cannot be represented, i.e. rendering must not be cached. Item sources are represented
+    by versions of their content, so they are never consumed to build a key.
+    """
+    # Avoid circular import
+    from ._base import Abstract
+
+    if isinstance(value, _STABLE_REPR_TYPES):
+        return repr(value)
+    elif isinstance(value, Abstract):
+        return value.get_render_cache_key()
+    elif isinstance(value, Catalog):
+        return 'catalog:{!r}:{}'.format(value.name, value.version)
+    elif isinstance(value, ItemSource):
+        version = value.version
+        return 'items:{}'.format(version) if version is not None else None
+    elif isinstance(value, htmler.Node):
+        return value.render()
+    elif isinstance(value, Mapping):
+        parts = []
+        for k, v in sorted(value.items(), key=lambda i: repr(i[0])):
+            k_repr, v_repr = key_repr(k), key_repr(v)
+            if k_repr is None or v_repr is None:
+                return None
+            parts.append('{}:{}'.format(k_repr, v_repr))
+        return '{' + ','.join(parts) + '}'
+    elif isinstance(value, (Sequence, array)):
+        parts = []
+        for v in value:
+            v_repr = key_repr(v)
+            if v_repr is None:
+                return None
+            parts.append(v_repr)
+        return '[' + ','.join(parts) + ']'
+    elif isinstance(value, (set, frozenset)):
+        parts = []
+        for v in value:
+            v_repr = key_repr(v)
+            if v_repr is None:
+                return None
+            parts.append(v_repr)
+        return '{' + ','.join(sorted(parts)) + '}'
+
+    # Representation of other objects may change between processes or not reflect their state
+    return None
+
+
+def make_key(*parts: str) -> str:
+    """Build a cache key from its parts
+    """
+    return sha1('\x00'.join(parts).encode('utf-8')).hexdigest()
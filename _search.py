@@ -0,0 +1,166 @@
+"""PytSite Widget Items Search
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from array import array
+from itertools import islice
+from threading import Lock
+from pytsite import lang
+from ._items import Catalog, Item, MmapCatalog
+
+
+class SearchIndex:
+    """Case Insensitive Index of Items' Titles
+
+    Queries shorter than 3 characters match beginnings of titles and are looked up in titles sorted alphabetically.
+    Longer queries match any part of titles and are looked up through trigrams' posting lists.
+    """
+
+    __slots__ = ('_items', '_titles', '_sorted', '_trigrams')
+
+    def __init__(self, items: Sequence[Item]):
+        """Init
+        """
+        self._items = items
+        self._titles = [str(item[1]).casefold() for item in items]  # type: List[str]
+        self._sorted = array('I', sorted(range(len(self._titles)), key=self._titles.__getitem__))
+        self._trigrams = {}  # type: Dict[str, array]
+
+        for i, title in enumerate(self._titles):
+            for trigram in {title[j:j + 3] for j in range(len(title) - 2)}:
+                postings = self._trigrams.get(trigram)
+                if postings is None:
+                    postings = self._trigrams[trigram] = array('I')
+                postings.append(i)
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def _iter_prefixed(self, query: str) -> Iterator[int]:
+        """Iterate over positions of items which titles start with a query, in titles order
+        """
+        titles, sorted_pos = self._titles, self._sorted
+        lo, hi = 0, len(sorted_pos)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if titles[sorted_pos[mid]] < query:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        for i in range(lo, len(sorted_pos)):
+            pos = sorted_pos[i]
+            if not titles[pos].startswith(query):
+                break
+            yield pos
+
+    def _iter_containing(self, query: str) -> Iterator[int]:
+        """Iterate over positions of items which titles contain a query, in items order
+        """
+        shortest = None
+        for trigram in {query[j:j + 3] for j in range(len(query) - 2)}:
+            postings = self._trigrams.get(trigram)
+            if postings is None:
+                return
+            if shortest is None or len(postings) < len(shortest):
+                shortest = postings
+
+        titles = self._titles
+        for pos in shortest:
+            if query in titles[pos]:
+                yield pos
+
+    def iter_positions(self, query: str = '') -> Iterator[int]:
+        """Iterate over positions of matching items
+        """
+        query = query.casefold().strip()
+        if not query:
+            return iter(range(len(self._titles)))
+
+        return self._iter_prefixed(query) if len(query) < 3 else self._iter_containing(query)
+
+    def search(self, query: str = '', offset: int = 0, limit: int = 20,
+               key_filter: Callable[[Any], bool] = None) -> Tuple[Tuple[Item, ...], bool]:
+        """Find items
+
+        Returns found items and a flag which tells if there are more of them.
+        """
+        items = self._items
+
+        return _paginate((items[pos] for pos in self.iter_positions(query)), offset, limit, key_filter)
+
+
+def _paginate(found: Iterable[Item], offset: int, limit: int,
+              key_filter: Callable[[Any], bool] = None) -> Tuple[Tuple[Item, ...], bool]:
+    """Get a page of found items and a flag which tells if there are more of them
+    """
+    if key_filter:
+        found = (item for item in found if key_filter(item[0]))
+
+    r = tuple(islice(found, offset, offset + limit + 1))
+
+    return r[:limit], len(r) > limit
+
+
+_indexes = {}  # type: Dict[Tuple[str, str], SearchIndex]
+_indexes_lock = Lock()
+
+
+def get_index(catalog: Catalog, language: str = None) -> SearchIndex:
+    """Get search index of a catalog, build it if necessary
+    """
+    language = language or lang.get_current()
+    index_key = (catalog.name, language if catalog.translate else None)
+
+    index = _indexes.get(index_key)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(index_key)
+            if index is None:
+                index = _indexes[index_key] = SearchIndex(catalog.get_items(language))
+
+    return index
+
+
+def drop_index(catalog_name: str):
+    """Drop search indexes of a catalog
+    """
+    with _indexes_lock:
+        for index_key in [k for k in _indexes if k[0] == catalog_name]:
+            del _indexes[index_key]
+
+
+def select2_results(catalog: Catalog, query: str = '', page: int = 1, per_page: int = 20,
+                    exclude: Iterable[str] = None, linked_value: Optional[str] = None,
+                    min_length: int = 0, language: str = None) -> dict:
+    """Search a catalog and return results in Select2's format
+
+    Memory mapped catalogs are searched by titles' prefixes through indexes of their files, so no search index is built
+    in memory for them.
+    """
+    if len(query.strip()) < min_length:
+        return {'results': [], 'pagination': {'more': False}}
+
+    key_filters = []
+    if exclude:
+        exclude = set(exclude)
+        key_filters.append(lambda key: str(key) not in exclude)
+    linked_keys = catalog.get_linked_keys(linked_value) if linked_value is not None else None
+    if linked_keys is not None:
+        key_filters.append(lambda key: key in linked_keys)
+
+    offset = (max(page, 1) - 1) * per_page
+    key_filter = (lambda key: all(f(key) for f in key_filters)) if key_filters else None
+    if isinstance(catalog, MmapCatalog):
+        # Memory mapped catalogs are searched by titles' prefixes through the index of their files
+        items, more = _paginate(catalog.iter_search(query.strip(), language), offset, per_page, key_filter)
+    else:
+        items, more = get_index(catalog, language).search(query, offset, per_page, key_filter)
+
+    return {
+        'results': [{'id': item[0], 'text': item[1]} for item in items],
+        'pagination': {'more': more},
+    }
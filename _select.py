@@ -5,21 +5,43 @@ __email__ = 'a@shepetko.com'
 __license__ = 'MIT'
 
 import htmler
-from typing import Union, List, Tuple
+from typing import Union, List, Tuple, Optional, Iterable, Callable, Mapping
 from collections import OrderedDict
 from math import ceil
 from datetime import datetime
-from json import dumps as json_dumps
-from pytsite import lang, validation, util, router
-from plugins import hreflang
-from ._base import Abstract
+from threading import Lock
+from json import dumps as json_dumps, loads as json_loads
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+from binascii import Error as BinasciiError
+from pytsite import lang, validation, util, router, http
+from plugins import hreflang, http_api
+from ._base import Abstract, render_pass
+from ._html import LazyElement, RawBlock, RawBlockList, RenderedElement, option, render_raw, tag
+from ._items import ItemSource, Catalog, ItemKey, make_source, get_catalog
 from ._input import Text
+from . import _signing
+
+# Cursor of the last page, it can't be produced by Pager.encode_cursor()
+_LAST_PAGE_CURSOR = 'last'
+
+# Page number's placeholder in pager's links
+_PAGE_PLACEHOLDER = '__page__'
+
+# Rendered windows of pager's links
+_pager_windows = OrderedDict()  # type: OrderedDict
+_pager_windows_lock = Lock()
+_PAGER_WINDOWS_MAX = 1024
+
+# Registered Tabs classes: class ID -> class
+_tabs_classes = {}  # type: dict
 
 
 class Checkbox(Abstract):
     """Single Checkbox Widget
     """
 
+    __slots__ = ('_bootstrap_version',)
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
@@ -49,31 +71,52 @@ class Checkbox(Abstract):
         self.set_val(value)
 
     def _get_element(self, **kwargs) -> htmler.Element:
-        div = htmler.Div(css='form-check' if self._bootstrap_version == 4 else 'checkbox')
-        div.append_child(htmler.Input(type='hidden', name=self._name))
+        inp_attrs = {
+            'id': self._uid,
+            'name': self._name,
+            'type': 'checkbox',
+            'value': 'True',
+            'checked': self.checked,
+            'required': self.required,
+        }
+
+        content = tag('input', {'type': 'hidden', 'name': self._name})
+        if self._bootstrap_version == 4:
+            inp_attrs['css'] = 'form-check-input'
+            content += tag('input', inp_attrs)
+            content += tag('label', {'label_for': self._uid, 'css': 'form-check-label'})
+        else:
+            content += tag('label', {'label_for': self._uid})
+            content += tag('input', inp_attrs)
+        content += str(self._label) + '</label>'
+
+        return RawBlock(tag('div', {'css': 'form-check' if self._bootstrap_version == 4 else 'checkbox'}), content,
+                        '</div>')
 
-        inp = htmler.Input(id=self._uid, name=self._name, type='checkbox', value='True', checked=self.checked,
-                           required=self.required)
-        label = htmler.Label(label_for=self._uid)
 
-        if self._bootstrap_version == 3:
-            label.append_child(inp)
-            label.append_text(self._label)
-            div.append_child(label)
-        elif self._bootstrap_version == 4:
-            inp.set_attr('css', 'form-check-input')
-            label.set_attr('css', 'form-check-label')
-            label.append_text(self._label)
-            div.append_child(inp)
-            div.append_child(label)
+def _make_index(values: Iterable) -> Union[frozenset, tuple]:
+    """Build a membership index of values, falling back to a tuple for unhashable ones
+    """
+    values = tuple(values)
 
-        return div
+    try:
+        return frozenset(values)
+    except TypeError:
+        return values
 
 
 class Select(Abstract):
     """Select Widget.
     """
 
+    __slots__ = ('_multiple', '_int_keys', '_catalog_int_keys', '_append_none_item', '_none_item_title', '_exclude',
+                 '_exclude_index', '_items', '_value_index')
+
+    _msg_ids = ('select_none_item',)
+
+    # Indexes are derived from other attributes
+    _render_cache_ignored_attrs = Abstract._render_cache_ignored_attrs + ('_exclude_index', '_value_index')
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
@@ -82,6 +125,17 @@ class Select(Abstract):
             kwargs.setdefault('default', [])
 
         self._int_keys = kwargs.get('int_keys', False)
+        self._catalog_int_keys = False
+        self._value_index = None
+
+        # Catalogs are shared as is, values are converted to the type of catalog's keys
+        catalog = kwargs.get('catalog')
+        if catalog is None and isinstance(kwargs.get('items'), Catalog):
+            catalog = kwargs['items']
+        if catalog is not None and not isinstance(catalog, Catalog):
+            catalog = get_catalog(catalog)
+        if catalog is not None and catalog.key_type is int:
+            self._int_keys = self._catalog_int_keys = True
 
         super().__init__(uid, **kwargs)
 
@@ -89,17 +143,24 @@ class Select(Abstract):
             self._name += '[]'
 
         self._append_none_item = kwargs.get('append_none_item', not self.required)
-        self._none_item_title = kwargs.get('none_item_title', '--- ' + lang.t('widget@select_none_item') + ' ---')
-        self._exclude = kwargs.get('exclude', [])
-
-        self._items = []
-        items = kwargs.get('items', [])
-        if not isinstance(items, (list, tuple)):
-            raise TypeError('List or tuple expected')
-        for item in items:
-            if not (isinstance(item, (list, tuple)) and len(item) == 2):
-                raise TypeError('Each item must be a list or tuple and have exactly 2 elements')
-            self._items.append((int(item[0]) if self._int_keys else item[0], item[1]))
+        self._none_item_title = kwargs['none_item_title'] if 'none_item_title' in kwargs else \
+            '--- ' + self.t('select_none_item') + ' ---'
+        self._exclude = tuple(kwargs.get('exclude', ()))
+        self._exclude_index = _make_index(self._exclude)
+
+        # Items are obtained from the source on first use only, and then can be safely shared between clones
+        if catalog is not None:
+            self._items = catalog
+            if not kwargs.get('tags'):
+                self.add_rule(ItemKey(catalog=catalog))
+        else:
+            self._items = make_source(kwargs.get('items', ()), int if self._int_keys else None)
+
+    @property
+    def items(self) -> ItemSource:
+        """Get items source
+        """
+        return self._items
 
     def set_val(self, value: Union[int, str, list, tuple, None]):
         """Set value of the widget
@@ -116,12 +177,34 @@ class Select(Abstract):
 
             if self._int_keys:
                 if self._multiple:
-                    for i in range(len(value)):
-                        value[i] = int(value[i])
+                    value = list(map(int, value))
+                elif value == '' and self._catalog_int_keys:
+                    # Nothing is chosen in a select over a catalog, which keys are converted implicitly
+                    value = None
                 else:
                     value = int(value)
 
         super().set_val(value)
+        self._value_index = None
+
+        return self
+
+    def clr_val(self):
+        super().clr_val()
+        self._value_index = None
+
+    def _get_value_index(self) -> Union[frozenset, tuple]:
+        """Get membership index of selected keys
+
+        The index is rebuilt after set_val() or clr_val(), so the value should not be modified in place.
+        """
+        if self._value_index is None:
+            if self._multiple:
+                self._value_index = _make_index(self._value or ())
+            else:
+                self._value_index = _make_index(() if self._value is None else (self._value,))
+
+        return self._value_index
 
     def _get_select_html_em(self) -> htmler.Element:
         select = htmler.Select(
@@ -143,21 +226,34 @@ class Select(Abstract):
         if self._append_none_item:
             select.append_child(htmler.Option(self._none_item_title, value=''))
 
+        select.append_child(self._get_options_em())
+
+        return select
+
+    def _get_options_em(self) -> htmler.Element:
+        """Get element which renders options of items
+        """
+        if isinstance(self._items, Catalog):
+            return RenderedElement(self._render_catalog_options)
+
+        return RawBlockList(self._iter_options)
+
+    def _iter_options(self):
+        """Build options of the select element directly as strings
+        """
+        exclude = self._exclude_index
+        selected_keys = self._get_value_index()
+
         for item in self._items:
-            if self._exclude and item[0] in self._exclude:
+            if exclude and item[0] in exclude:
                 continue
 
-            option = htmler.Option(item[1], value=item[0])
-            if self._multiple:
-                if item[0] in self._value:
-                    option.set_attr('selected', 'true')
-            else:
-                if item[0] == self._value:
-                    option.set_attr('selected', 'true')
+            yield option(item[0], item[1], item[0] in selected_keys)
 
-            select.append_child(option)
-
-        return select
+    def _render_catalog_options(self, **kwargs) -> str:
+        """Render options of the select element using catalog's pre-rendered markup
+        """
+        return self._items.render_options(self._get_value_index(), self._exclude_index, **kwargs)
 
     def _get_element(self, **kwargs) -> htmler.Element:
         r = htmler.TagLessElement()
@@ -170,7 +266,43 @@ class Select(Abstract):
         return r
 
 
+class _LabelBatch:
+    """Batch of values which labels are resolved by a single resolver call
+    """
+
+    __slots__ = ('_resolver', '_pending', '_labels')
+
+    def __init__(self, resolver: Callable[[frozenset], Mapping]):
+        self._resolver = resolver
+        self._pending = set()
+        self._labels = {}
+
+    def add(self, keys: Iterable):
+        """Add values to be resolved with the next resolver call
+        """
+        for k in keys:
+            if k not in self._labels:
+                self._pending.add(k)
+
+    def get(self, keys: Iterable) -> dict:
+        """Get labels of values, resolving all pending ones if necessary
+        """
+        self.add(keys)
+
+        if self._pending:
+            resolved = self._resolver(frozenset(self._pending)) or {}
+            for k in self._pending:
+                self._labels[k] = resolved.get(k)
+            self._pending = set()
+
+        return {k: self._labels[k] for k in keys}
+
+
 class Select2(Select):
+    __slots__ = ('_theme', '_ajax_url', '_ajax_url_query', '_ajax_delay', '_ajax_cache', '_ajax_cache_ttl',
+                 '_ajax_cache_version', '_ajax_search', '_label_resolver', '_linked_select',
+                 '_linked_select_ajax_query_attr', '_maximum_selection_length', '_minimum_input_length', '_tags')
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
@@ -179,8 +311,13 @@ class Select2(Select):
         self._ajax_url_query = kwargs.get('ajax_url_query', {})
         self._ajax_delay = kwargs.get('ajax_delay', 250)
         self._ajax_cache = kwargs.get('ajax_cache', True)
+        self._ajax_cache_ttl = kwargs.get('ajax_cache_ttl', 300)
+        self._ajax_cache_version = kwargs.get('ajax_cache_version')
+        self._ajax_search = kwargs.get('ajax_search', False)
+        self._label_resolver = kwargs.get('label_resolver')
         self._linked_select = kwargs.get('linked_select')  # type: Select2
-        self._linked_select_ajax_query_attr = kwargs.get('linked_select_ajax_query_attr')
+        self._linked_select_ajax_query_attr = kwargs.get('linked_select_ajax_query_attr',
+                                                         'linked' if self._ajax_search else None)
         self._maximum_selection_length = kwargs.get('maximum_selection_length', 0)
         self._minimum_input_length = kwargs.get('minimum_input_length', 0)
         self._multiple = kwargs.get('multiple', False)
@@ -191,33 +328,138 @@ class Select2(Select):
 
         super().__init__(uid, **kwargs)
 
-    def _get_element(self, **kwargs) -> htmler.Element:
-        select = self._get_select_html_em()
-        select.set_attr('style', 'width: 100%;')
+        if self._ajax_search and not isinstance(self._items, Catalog):
+            raise ValueError('Built-in search requires an items catalog')
+
+    def _on_clone(self, memo: dict):
+        super()._on_clone(memo)
 
-        self._data['linked_select_ajax_query_attr'] = self._linked_select_ajax_query_attr
+        self._ajax_url_query = dict(self._ajax_url_query)
+        self._linked_select = memo.get(id(self._linked_select), self._linked_select)
+
+    def _get_data(self) -> dict:
+        data = dict(super()._get_data())
+        data['linked_select_ajax_query_attr'] = self._linked_select_ajax_query_attr
 
         if self._multiple:
-            self._data['multiple'] = True
+            data['multiple'] = True
+
+        ajax_url = self._ajax_url
+        ajax_url_query = dict(self._ajax_url_query)
+        ajax_cache_version = self._ajax_cache_version
+        if self._ajax_search:
+            ajax_url = http_api.url('widget@select2_search', {'catalog': self._items.name})
+            ajax_cache_version = self._items.version
+            if self._minimum_input_length:
+                ajax_url_query['min_length'] = self._minimum_input_length
 
         if self._exclude:
             exclude = json_dumps([str(excl) for excl in self._exclude])
-            self._data['exclude'] = exclude
-            self._ajax_url_query['exclude'] = exclude
+            data['exclude'] = exclude
+            ajax_url_query['exclude'] = exclude
 
         if self._linked_select:
-            self._data['linked_select'] = self._linked_select.uid
-            self._data['linked_select_value'] = self._linked_select.value
+            data['linked_select'] = self._linked_select.uid
+            data['linked_select_value'] = self._linked_select.value
 
         if self._append_none_item:
-            self._data['append_none_item'] = self._append_none_item
-            self._data['none_item_title'] = self._none_item_title
+            data['append_none_item'] = self._append_none_item
+            data['none_item_title'] = self._none_item_title
+
+        if ajax_url:
+            data['ajax_url'] = ajax_url
+            data['ajax_url_query'] = json_dumps(ajax_url_query)
+            data['ajax_delay'] = self._ajax_delay
+            data['ajax_cache'] = self._ajax_cache
+            if self._ajax_cache:
+                # Client side cache of responses is dropped when the version changes
+                data['ajax_cache_ttl'] = self._ajax_cache_ttl
+                if ajax_cache_version is not None:
+                    data['ajax_cache_version'] = ajax_cache_version
+
+        return data
+
+    @property
+    def label_resolver(self) -> Optional[Callable[[frozenset], Mapping]]:
+        """Get selected values' label resolver
+        """
+        return self._label_resolver
+
+    def _get_selected_keys(self) -> list:
+        """Get selected keys which are not excluded, in order of the value
+        """
+        if self._value is None or self._value == '':
+            return []
+
+        exclude = self._exclude_index
+
+        return [k for k in (self._value if self._multiple else (self._value,)) if not (exclude and k in exclude)]
+
+    def _resolve_catalog_labels(self, keys: frozenset) -> dict:
+        """Resolve labels using the catalog
+        """
+        return {k: self._items.get_title(k) for k in keys if k in self._items}
+
+    def _get_label_batch(self):
+        """Get label batch for the current render pass
+
+        Widgets which share a label resolver share a batch within a render pass, so the resolver is called once for
+        all their values.
+        """
+        if not self._label_resolver:
+            return _LabelBatch(self._resolve_catalog_labels)
 
-        if self._ajax_url:
-            self._data['ajax_url'] = self._ajax_url
-            self._data['ajax_url_query'] = json_dumps(self._ajax_url_query)
-            self._data['ajax_delay'] = self._ajax_delay
-            self._data['ajax_cache'] = self._ajax_cache
+        storage = self.get_render_pass_storage()
+        if storage is None:
+            return _LabelBatch(self._label_resolver)
+
+        batches = storage.setdefault('select2_label_batches', {})
+        batch = batches.get(self._label_resolver)
+        if batch is None:
+            batch = batches[self._label_resolver] = _LabelBatch(self._label_resolver)
+
+        # Collect values of all widgets of the tree
+        self._prefetch_tree()
+
+        return batch
+
+    def _prefetch(self):
+        if self._label_resolver:
+            self._get_label_batch().add(self._get_selected_keys())
+
+    def _prefetch_values(self, values: list):
+        if not self._label_resolver or self.get_render_pass_storage() is None:
+            return
+
+        keys = []
+        for value in values:
+            self.set_val(value)
+            keys.extend(self._get_selected_keys())
+        self.clr_val()
+
+        self._get_label_batch().add(keys)
+
+    def _get_options_em(self) -> htmler.Element:
+        if not (self._label_resolver or self._ajax_search):
+            return super()._get_options_em()
+
+        # Only options of selected values are rendered, other ones are loaded via AJAX
+        batch = self._get_label_batch()
+        keys = self._get_selected_keys()
+        batch.add(keys)
+
+        def render_options(**kwargs) -> str:
+            labels = batch.get(keys)
+            if self._tags:
+                labels = {k: str(k) if v is None else v for k, v in labels.items()}
+
+            return ''.join(render_raw(option(k, labels[k], True), **kwargs) for k in keys if labels[k] is not None)
+
+        return RenderedElement(render_options)
+
+    def _get_element(self, **kwargs) -> htmler.Element:
+        select = self._get_select_html_em()
+        select.set_attr('style', 'width: 100%;')
 
         select.set_attr('data_theme', self._theme)
         select.set_attr('data_minimum_input_length', self._minimum_input_length)
@@ -242,6 +484,8 @@ class Checkboxes(Select):
     """Group of Checkboxes Widget
     """
 
+    __slots__ = ('_bootstrap_version', '_item_renderer')
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
@@ -251,35 +495,34 @@ class Checkboxes(Select):
         if self._bootstrap_version not in (3, 4):
             self._bootstrap_version = 3
 
-        self._item_renderer = kwargs.get('item_renderer', self._default_item_renderer)
+        self._item_renderer = kwargs.get('item_renderer')
 
     def _default_item_renderer(self, item: Tuple[str, str]) -> htmler.Element:
-        checked = True if item[0] in self.value else False
-        div = htmler.Div(css='form-check' if self._bootstrap_version == 4 else 'checkbox')
-        inp = htmler.Input(type='checkbox', name=self.name, value=item[0], checked=checked,
-                           required=self.required)
-        label = htmler.Label()
-
-        if self._bootstrap_version == 3:
-            label.append_child(inp)
-            label.append_text(item[1])
-            div.append_child(label)
-        elif self._bootstrap_version == 4:
-            inp.set_attr('css', 'form-check-input')
-            label.set_attr('css', 'form-check-label')
-            label.append_text(item[1])
-            div.append_child(inp)
-            div.append_child(label)
-
-        return div
+        inp_attrs = {
+            'type': 'checkbox',
+            'name': self.name,
+            'value': item[0],
+            'checked': item[0] in self._get_value_index(),
+            'required': self.required,
+        }
+
+        if self._bootstrap_version == 4:
+            inp_attrs['css'] = 'form-check-input'
+            content = tag('input', inp_attrs) + '<label class="form-check-label">'
+        else:
+            content = '<label>' + tag('input', inp_attrs)
+        content += str(item[1]) + '</label>'
+
+        return RawBlock('<div class="form-check">' if self._bootstrap_version == 4 else '<div class="checkbox">',
+                        content, '</div>')
 
     def _get_element(self, **kwargs) -> htmler.Element:
         """Render the widget
         """
         container = htmler.TagLessElement()
         container.append_child(htmler.Input(type='hidden', name=self.name))  # It is important to have an empty input!
-        for item in self._items:
-            container.append_child(self._item_renderer(item))
+        item_renderer = self._item_renderer or self._default_item_renderer
+        container.append_child(LazyElement(lambda: (item_renderer(item) for item in self._items)))
 
         return container
 
@@ -288,20 +531,22 @@ class Language(Select):
     """Select Language Widget
     """
 
+    __slots__ = ()
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
         super().__init__(uid, **kwargs)
-        self._items = kwargs.get('items', [])
 
-        for code in lang.langs():
-            self._items.append_child((code, lang.lang_title(code)))
+        self._items += tuple((code, lang.lang_title(code)) for code in lang.langs())
 
 
 class LanguageNav(Abstract):
     """Language Nav Widget
     """
 
+    __slots__ = ('_dropdown', '_dropup', '_language_titles', '_bs_version')
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
@@ -316,6 +561,23 @@ class LanguageNav(Abstract):
         self._language_titles = kwargs.get('language_titles', {})
         self._bs_version = kwargs.get('bs_version', 4)
 
+    def _get_render_cache_key_parts(self) -> Optional[List[str]]:
+        parts = super()._get_render_cache_key_parts()
+        if parts is not None:
+            # Links depend on current request
+            parts.append(router.current_url())
+            parts.extend(hreflang.get(lng) or '' for lng in lang.langs())
+
+        return parts
+
+    def _get_css(self) -> str:
+        if len(lang.langs()) == 1:
+            return self._css
+        elif self._dropdown or self._dropup:
+            return self._css + ' navbar-nav' if self._bs_version == 3 else self._css
+        else:
+            return self._css + ' nav-pills'
+
     def _get_element(self, **kwargs) -> htmler.Element:
         if len(lang.langs()) == 1:
             return htmler.TagLessElement()
@@ -326,7 +588,6 @@ class LanguageNav(Abstract):
         if self._dropdown or self._dropup:
             # Root element
             if self._bs_version == 3:
-                self._css += ' navbar-nav'
                 dropdown_root = htmler.Li(css='dropdown' if self._dropdown else 'dropup')
                 toggler = htmler.A(
                     self._language_titles.get(self._language) or lang.lang_title(self.language),
@@ -369,8 +630,6 @@ class LanguageNav(Abstract):
 
         # Simple list
         else:
-            self._css += ' nav-pills'
-
             for lng in lang.langs():
                 lng_title = self._language_titles.get(lng) or lang.lang_title(lng)
                 li = htmler.Li(css='nav-item {}'.format('active' if lng == self._language else ''))
@@ -394,6 +653,8 @@ class DateTime(Text):
     """Date/Time Select Widget
     """
 
+    __slots__ = ('_datepicker', '_timepicker', '_mask', '_format')
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
@@ -429,44 +690,80 @@ class DateTime(Text):
         """
         return super().get_val(**kwargs)
 
-    def _get_element(self, **kwargs) -> htmler.Input:
-        """Render the widget
-        :param **kwargs:
-        """
-        value = self.get_val()
-
-        self._data.update({
+    def _get_data(self) -> dict:
+        data = dict(super()._get_data())
+        data.update({
             'datepicker': self._datepicker,
             'timepicker': self._timepicker,
             'format': self._format.replace('%M', 'i').replace('%', ''),
             'mask': self._mask,
         })
 
-        return super()._get_element(**kwargs).set_attr('value', value.strftime(self._format) if value else '')
+        return data
+
+    def _get_input_attrs(self) -> dict:
+        attrs = super()._get_input_attrs()
+        value = self.get_val()
+        attrs['value'] = value.strftime(self._format) if value else ''
+
+        return attrs
 
 
 class Pager(Abstract):
     """Pagination Widget
+
+    In 'offset' mode pages are addressed by numbers and the caller uses `skip` and `limit`. If `total_items` is None or
+    `estimated_total` is True, the total number of items is not counted: the caller fetches `limit + 1` items and tells
+    the pager if there is a next page via `has_next` or `set_has_next()`, a sliding window of pages is rendered without
+    the link to the last page. In 'cursor' mode pages are addressed by opaque `after` and `before` cursors which carry
+    keys of page's boundary items, so the caller fetches items by keys instead of skipping them, and tells the pager
+    about fetched page via `set_cursors()`.
     """
 
-    def __init__(self, uid: str, total_items: int, per_page: int = 100, visible_numbers: int = 5,
-                 http_api_ep: str = None, **kwargs):
+    __slots__ = ('_total_items', '_items_per_page', '_http_api_ep', '_total_pages', '_visible_numbers', '_current_page',
+                 '_mode', '_after', '_before', '_reverse', '_first_cursor', '_last_cursor', '_has_previous',
+                 '_has_next', '_estimated_total')
+
+    _msg_ids = ('first_page', 'previous_page', 'next_page', 'last_page', 'page_num')
+
+    def __init__(self, uid: str, total_items: int = None, per_page: int = 100, visible_numbers: int = 5,
+                 http_api_ep: str = None, mode: str = 'offset', has_next: bool = None, estimated_total: bool = False,
+                 **kwargs):
         """Init.
         """
         super().__init__(uid, **kwargs)
 
+        if mode not in ('offset', 'cursor'):
+            raise ValueError("Unsupported pagination mode: '{}'".format(mode))
+
         self._form_group = False
         self._has_messages = False
 
+        self._mode = mode
         self._total_items = total_items
         self._items_per_page = per_page
         self._http_api_ep = http_api_ep
-        self._total_pages = int(ceil(self._total_items / self._items_per_page))
         self._visible_numbers = visible_numbers
+        self._after = self._before = self._first_cursor = self._last_cursor = None
+        self._reverse = self._has_previous = self._has_next = False
+        self._estimated_total = mode == 'offset' and (estimated_total or total_items is None)
+
+        if mode == 'cursor':
+            self._init_cursors()
+            return
+
+        if self._estimated_total:
+            self._init_open_ended(has_next)
+            return
+
+        self._total_pages = int(ceil(self._total_items / self._items_per_page))
 
         if self._visible_numbers > self._total_pages:
             self._visible_numbers = self._total_pages
 
+        if self._total_pages == 1:
+            self._hidden = True
+
         # Detect current page
         try:
             self._current_page = int(router.request().inp.get('page', 1))
@@ -485,36 +782,224 @@ class Pager(Abstract):
         self._data['per_page'] = self._items_per_page
         self._data['visible_numbers'] = self._visible_numbers
 
-    def _get_element(self, **kwargs) -> htmler.Element:
-        """Get widget's HTML element
+    def _init_open_ended(self, has_next: Optional[bool]):
+        """Detect current page when the total number of items is unknown or estimated
         """
-        if self._total_pages == 0:
-            return htmler.TagLessElement()
+        self._total_pages = int(ceil(self._total_items / self._items_per_page)) if self._total_items else None
+
+        # Estimated total may be lower than the actual one, so the current page is not limited by it
+        try:
+            self._current_page = max(int(router.request().inp.get('page', 1)), 1)
+        except ValueError:
+            self._current_page = 1
+
+        self.set_has_next(has_next)
+
+        self._data['http_api_ep'] = self._http_api_ep
+        self._data['current_page'] = self._current_page
+        self._data['per_page'] = self._items_per_page
+        self._data['visible_numbers'] = self._visible_numbers
+        self._data['estimated_total'] = True
+
+    def _init_cursors(self):
+        """Detect requested page in cursor mode
+        """
+        self._total_pages = None
+        self._current_page = None
+
+        inp = router.request().inp
+        try:
+            if inp.get('after'):
+                self._after = self.decode_cursor(inp['after'])
+            elif inp.get('before') == _LAST_PAGE_CURSOR:
+                self._reverse = True
+            elif inp.get('before'):
+                self._before = self.decode_cursor(inp['before'])
+                self._reverse = True
+        except ValueError:
+            # Broken cursors lead to the first page
+            self._after = self._before = None
+            self._reverse = False
+
+        # Until the caller tells about fetched page, only the fact that it is not the first one is known
+        self._has_previous = self._after is not None or self._reverse
 
-        start_visible_num = self._current_page - ceil((self._visible_numbers - 1) / 2)
+        self._data['http_api_ep'] = self._http_api_ep
+        self._data['mode'] = self._mode
+        self._data['per_page'] = self._items_per_page
+
+    @staticmethod
+    def encode_cursor(value) -> str:
+        """Encode a JSON serializable value into an URL safe cursor
+        """
+        return urlsafe_b64encode(json_dumps(value, separators=(',', ':')).encode('utf-8')).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor: str):
+        """Decode a cursor
+        """
+        try:
+            return json_loads(urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8'))
+        except (TypeError, BinasciiError, UnicodeDecodeError) as e:
+            raise ValueError('Invalid cursor: {}'.format(e))
+
+    def set_has_next(self, has_next: Optional[bool]):
+        """Tell the pager if there is a page after the current one, when the total number of items is not exact
+
+        None means unknown, in which case the estimated total is used, if any, or the next page is assumed to exist.
+        """
+        if not self._estimated_total:
+            raise RuntimeError('Next page can be set only in offset mode without exact total number of items')
+
+        self._has_next = has_next
+        self._hidden = self._current_page == 1 and self._get_last_page() == 1
+
+    def _get_last_page(self) -> int:
+        """Get number of the last page known to exist
+        """
+        if not self._estimated_total:
+            return self._total_pages
+
+        if self._has_next is False:
+            return self._current_page
+        if self._has_next is None and self._total_pages:
+            return max(self._total_pages, self._current_page)
+
+        return max(self._total_pages or 0, self._current_page + 1)
+
+    def set_cursors(self, first, last, has_more: bool):
+        """Set keys of the first and the last items of fetched page in cursor mode
+
+        `has_more` tells if there are more items in the fetching direction, i. e. it is True if `limit + 1` items were
+        fetched.
+        """
+        if self._mode != 'cursor':
+            raise RuntimeError('Cursors can be set only in cursor mode')
+
+        self._first_cursor = self.encode_cursor(first) if first is not None else None
+        self._last_cursor = self.encode_cursor(last) if last is not None else None
+
+        if not self._reverse:
+            self._has_previous = self._after is not None
+            self._has_next = has_more
+        else:
+            self._has_previous = has_more
+            self._has_next = self._before is not None
+
+        self._hidden = not (self._has_previous or self._has_next)
+
+    def _get_data(self) -> dict:
+        if self._estimated_total:
+            data = dict(super()._get_data())
+            data['has_next'] = self._current_page < self._get_last_page()
+            return data
+
+        if self._mode != 'cursor':
+            return super()._get_data()
+
+        data = dict(super()._get_data())
+        data['first_cursor'] = self._first_cursor or ''
+        data['last_cursor'] = self._last_cursor or ''
+        data['has_previous'] = self._has_previous
+        data['has_next'] = self._has_next
+
+        return data
+
+    def _get_render_cache_key_parts(self) -> Optional[List[str]]:
+        parts = super()._get_render_cache_key_parts()
+        if parts is not None:
+            # Links depend on current request
+            parts.append(router.current_url())
+            if self._mode == 'cursor':
+                parts.extend((str(self._first_cursor), str(self._last_cursor), str(self._has_previous),
+                              str(self._has_next)))
+            elif self._estimated_total:
+                parts.append(str(self._has_next))
+
+        return parts
+
+    def _get_cursor_element(self) -> htmler.Element:
+        """Get widget's HTML element in cursor mode
+        """
+        ul = htmler.Ul(css='pagination ' + self._css)
+        links_url = router.current_url()
+        has_previous = self._has_previous
+        has_next = self._has_next
+
+        # All links are rendered to let client side switch them, unavailable ones are disabled
+        for css, text, title, query, enabled in (
+                ('first-page', '«', self.t('first_page'), {'after': '', 'before': ''}, has_previous),
+                ('previous-page', '‹', self.t('previous_page'), {'after': '', 'before': self._first_cursor},
+                 has_previous and self._first_cursor),
+                ('next-page', '›', self.t('next_page'), {'after': self._last_cursor, 'before': ''},
+                 has_next and self._last_cursor),
+                ('last-page', '»', self.t('last_page'), {'after': '', 'before': _LAST_PAGE_CURSOR}, has_next),
+        ):
+            li = htmler.Li(css=css + ' page-item' + ('' if enabled else ' disabled'))
+            li.append_child(htmler.A(text, css='page-link', title=title,
+                                     href=router.url(links_url, query=query) if enabled else '#'))
+            ul.append_child(li)
+
+        return ul
+
+    def _get_links_template(self) -> Optional[Tuple[str, str]]:
+        """Get URL of pages' links split at page number's place
+
+        Returns None if the URL cannot be split unambiguously.
+        """
+        parts = router.url(router.current_url(), query={'page': _PAGE_PLACEHOLDER}).split(_PAGE_PLACEHOLDER)
+
+        return tuple(parts) if len(parts) == 2 else None
+
+    @classmethod
+    def _get_link_titles(cls, language: str) -> dict:
+        """Get links' titles translated into a language, page number's title is split at number's place
+        """
+        msg_ids = tuple(cls.resolve_msg_id(msg_id, language)
+                        for msg_id in ('first_page', 'previous_page', 'next_page', 'page_num'))
+
+        return cls._get_msg_id_translation(('pager_link_titles', language, msg_ids), lambda: {
+            'first_page': lang.t(msg_ids[0], language=language),
+            'previous_page': lang.t(msg_ids[1], language=language),
+            'next_page': lang.t(msg_ids[2], language=language),
+            'page_num': tuple(lang.t(msg_ids[3], {'num': _PAGE_PLACEHOLDER}, language).split(_PAGE_PLACEHOLDER)),
+        })
+
+    def _build_links_em(self, template: Optional[Tuple[str, str]], titles: dict, last_page: int) -> htmler.Element:
+        """Build list of links to pages
+        """
+        visible_numbers = min(self._visible_numbers, last_page)
+        start_visible_num = self._current_page - ceil((visible_numbers - 1) / 2)
         if start_visible_num < 1:
             start_visible_num = 1
-        end_visible_num = start_visible_num + (self._visible_numbers - 1)
+        end_visible_num = start_visible_num + (visible_numbers - 1)
 
-        if end_visible_num > self._total_pages:
-            end_visible_num = self._total_pages
-            start_visible_num = end_visible_num - (self._visible_numbers - 1)
+        if end_visible_num > last_page:
+            end_visible_num = last_page
+            start_visible_num = end_visible_num - (visible_numbers - 1)
+
+        if template:
+            def href(num: int) -> str:
+                return str(num).join(template)
+        else:
+            links_url = router.current_url()
 
+            def href(num: int) -> str:
+                return router.url(links_url, query={'page': num})
+
+        page_num_title = titles['page_num']
         ul = htmler.Ul(css='pagination ' + self._css)
-        links_url = router.current_url()
 
         # Link to the first page
         if start_visible_num > 1:
             li = htmler.Li(css='first-page page-item')
-            a = htmler.A('«', css='page-link', title=lang.t('plugins.widget@first_page'),
-                         href=router.url(links_url, query={'page': 1}))
+            a = htmler.A('«', css='page-link', title=titles['first_page'], href=href(1))
             li.append_child(a)
             ul.append_child(li)
 
             # Link to the previous page
             li = htmler.Li(css='previous-page page-item')
-            a = htmler.A('‹', css='page-link', title=lang.t('plugins.widget@previous_page'),
-                         href=router.url(links_url, query={'page': self._current_page - 1}))
+            a = htmler.A('‹', css='page-link', title=titles['previous_page'], href=href(self._current_page - 1))
             li.append_child(a)
             ul.append_child(li)
 
@@ -523,36 +1008,90 @@ class Pager(Abstract):
             li = htmler.Li(css='page page-item', data_page=num)
             if self._current_page == num:
                 li.set_attr('css', 'page page-item active')
-            a = htmler.A(str(num), css='page-link', title=lang.t('plugins.widget@page_num', {'num': num}),
-                         href=router.url(links_url, query={'page': num}))
+            a = htmler.A(str(num), css='page-link', title=str(num).join(page_num_title), href=href(num))
             li.append_child(a)
             ul.append_child(li)
 
-        if end_visible_num < self._total_pages:
+        if end_visible_num < last_page or (self._estimated_total and self._current_page < last_page):
             # Link to the next page
             li = htmler.Li(css='next-page page-item')
-            a = htmler.A('›', css='page-link', title=lang.t('plugins.widget@next_page'),
-                         href=router.url(links_url, query={'page': self._current_page + 1}))
+            a = htmler.A('›', css='page-link', title=titles['next_page'], href=href(self._current_page + 1))
             li.append_child(a)
             ul.append_child(li)
 
+        if end_visible_num < last_page and not self._estimated_total:
             # Link to the last page
             li = htmler.Li(css='last-page page-item')
-            a = htmler.A('»', css='page-link', title=lang.t('plugins.widget@page_num', {'num': self._total_pages}),
-                         href=router.url(links_url, query={'page': self._total_pages}))
+            a = htmler.A('»', css='page-link', title=str(self._total_pages).join(page_num_title),
+                         href=href(self._total_pages))
             li.append_child(a)
             ul.append_child(li)
 
         return ul
 
-    def render(self):
-        if self._total_pages == 1:
-            self.hide()
+    def _get_element(self, **kwargs) -> htmler.Element:
+        """Get widget's HTML element
+        """
+        if self._mode == 'cursor':
+            return self._get_cursor_element()
+
+        last_page = self._get_last_page()
+        if last_page == 0:
+            return htmler.TagLessElement()
+
+        # Links are the same for all pagers which are on the same page of the same URL
+        language = lang.get_current()
+        template = self._get_links_template()
+        titles = self._get_link_titles(language)
+        window_key = (template, self._current_page, last_page, self._total_pages, self._visible_numbers,
+                      self._estimated_total, self._css, language, tuple(titles.values()))
+
+        def render(**render_kwargs) -> str:
+            key = window_key + (render_kwargs.get('indent', True), render_kwargs.get('depth', 0))
+            with _pager_windows_lock:
+                markup = _pager_windows.get(key)
+                if markup is not None:
+                    _pager_windows.move_to_end(key)
+                    return markup
+
+            markup = self._build_links_em(template, titles, last_page).render(**render_kwargs)
+            if template:
+                with _pager_windows_lock:
+                    _pager_windows[key] = markup
+                    if len(_pager_windows) > _PAGER_WINDOWS_MAX:
+                        _pager_windows.popitem(last=False)
+
+            return markup
 
-        return super().render()
+        return RenderedElement(render)
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    @property
+    def after(self):
+        """Get key after which items of requested page start, in cursor mode
+        """
+        return self._after
+
+    @property
+    def before(self):
+        """Get key before which items of requested page end, in cursor mode
+        """
+        return self._before
+
+    @property
+    def reverse(self) -> bool:
+        """Check if items of requested page should be fetched in reverse order, in cursor mode
+        """
+        return self._reverse
 
     @property
     def skip(self):
+        if self._mode == 'cursor':
+            raise RuntimeError('Use cursors instead of skip in cursor mode')
+
         skip = (self._current_page - 1) * self._items_per_page
         return skip if skip >= 0 else 0
 
@@ -568,26 +1107,111 @@ class Pager(Abstract):
     def total_pages(self):
         return self._total_pages
 
+    @property
+    def estimated_total(self) -> bool:
+        """Check if the total number of items is unknown or estimated
+        """
+        return self._estimated_total
+
+    @property
+    def has_next(self) -> Optional[bool]:
+        if self._mode == 'offset' and not self._estimated_total:
+            return self._current_page < self._total_pages
+
+        return self._has_next
+
+
+class TabsValidationError(validation.error.RuleError):
+    """Errors of widgets of all tabs
+
+    Message ID and arguments are the ones of the first error, so the exception can be handled as a single RuleError.
+    """
+
+    def __init__(self, errors: Mapping[str, Mapping[str, validation.error.RuleError]]):
+        """Init
+        """
+        first = next(iter(next(iter(errors.values())).values()))
+        super().__init__(first.msg_id, first.msg_args)
+
+        self._errors = errors
+
+    @property
+    def errors(self) -> Mapping[str, Mapping[str, validation.error.RuleError]]:
+        """Get errors by IDs of tabs and UIDs of widgets
+        """
+        return self._errors
+
+    def __str__(self) -> str:
+        return '\n'.join(str(e) for tab_errors in self._errors.values() for e in tab_errors.values())
+
 
 class Tabs(Abstract):
     """Tabs Widget
+
+    In lazy mode only the first tab is rendered, other tabs are loaded through the HTTP API when they are shown for the
+    first time. The endpoint builds the widget again from its class, UID, name and `tab_args`, signed within the user's
+    session, so lazy mode works only for subclasses which add all their tabs in the constructor. Tabs are preferably
+    added with factories of widgets, which are called only when widgets of a tab are actually needed.
     """
 
+    __slots__ = ('_tabs', '_lazy', '_tab_args')
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
         super().__init__(uid, **kwargs)
 
         self._tabs = OrderedDict()
+        self._lazy = kwargs.get('lazy', False)
+        self._tab_args = kwargs.get('tab_args', {})
+
+        if self._lazy and type(self) is Tabs:
+            raise RuntimeError('Lazy tabs must be added by a subclass of Tabs')
 
-    def add_tab(self, tab_id: str, title: str):
+        try:
+            json_dumps(self._tab_args)
+        except TypeError as e:
+            raise TypeError('Tab arguments must be JSON serializable: {}'.format(e))
+
+    @classmethod
+    def _setup_class_meta(cls):
+        super()._setup_class_meta()
+
+        # Lazy tabs are rendered by the HTTP API endpoint, which looks up widget's class by its ID
+        _tabs_classes[cls._cls_cid] = cls
+
+    def _on_clone(self, memo: dict):
+        super()._on_clone(memo)
+
+        tabs = OrderedDict()
+        for tab_id, tab in self._tabs.items():
+            tabs[tab_id] = {
+                'title': tab['title'],
+                'widgets': [w.clone() for w in tab['widgets']],
+                'factory': tab['factory'],
+            }
+        self._tabs = tabs
+
+    @property
+    def lazy(self) -> bool:
+        """Check if only the first tab is rendered on the page
+        """
+        return self._lazy
+
+    @property
+    def tab_args(self) -> dict:
+        """Get arguments which are passed to the constructor when a lazy tab is loaded
+        """
+        return self._tab_args
+
+    def add_tab(self, tab_id: str, title: str, widgets_factory: Callable[[], Iterable[Abstract]] = None):
         """Add a tab.
         """
         tab_id = tab_id.replace('.', '-')
         if tab_id in self._tabs:
             raise RuntimeError("Tab '{}' is already added".format(tab_id))
 
-        self._tabs[tab_id] = {'title': title, 'widgets': []}
+        self._tabs[tab_id] = {'title': title, 'widgets': [], 'factory': widgets_factory}
 
         return self
 
@@ -604,6 +1228,86 @@ class Tabs(Abstract):
 
         return widget
 
+    def get_tab_widgets(self, tab_id: str) -> List[Abstract]:
+        """Get widgets of a tab, sorted by weight
+
+        Widgets' factory of the tab is called on first request.
+        """
+        try:
+            tab = self._tabs[tab_id]
+        except KeyError:
+            raise RuntimeError("Tab '{}' is not found".format(tab_id))
+
+        if tab['factory']:
+            tab['widgets'].extend(tab['factory']())
+            tab['factory'] = None
+
+        return sorted(tab['widgets'], key=lambda x: x.weight)
+
+    def get_tabs_spec(self) -> dict:
+        """Get specification of a widget which renders lazy tabs
+        """
+        return {'cid': self._cls_cid, 'uid': self._uid, 'name': self.name, 'tab_args': self._tab_args}
+
+    def render_tab(self, tab_id: str) -> str:
+        """Render widgets of a tab
+
+        Used by the HTTP API endpoint to render lazy tabs.
+        """
+        with render_pass():
+            return ''.join(w.renderable().render() for w in self.get_tab_widgets(tab_id))
+
+    def _on_form_submit(self, request: http.Request):
+        # Widgets of lazy tabs are not the form's ones, so they are filled by the submitted values here.
+        # Widgets of tabs which were never shown keep their default values.
+        if self._lazy:
+            inp = request.inp
+            for tab_id in self._tabs:
+                for w in self.get_tab_widgets(tab_id):
+                    if w.name in inp:
+                        w.set_val(inp[w.name])
+
+    def validate(self):
+        """Validate widget's rules
+        """
+        super().validate()
+
+        if not self._lazy:
+            return
+
+        # Tabs which were not rendered are validated as well
+        errors = OrderedDict()
+        for tab_id in self._tabs:
+            for w in self.get_tab_widgets(tab_id):
+                try:
+                    w.validate()
+                except validation.error.RuleError as e:
+                    # Rules, which may be shared by clones, keep arguments of the last validated value in a dict shared
+                    # with their errors
+                    errors.setdefault(tab_id, OrderedDict())[w.uid] = validation.error.RuleError(
+                        e.msg_id, dict(e.msg_args or {}))
+
+        if errors:
+            raise TabsValidationError(errors)
+
+    def _get_render_cache_key_parts(self) -> Optional[List[str]]:
+        # Specification of lazy tabs is signed within the current session.
+        # Widgets which are not built yet cannot be represented in the key.
+        if self._lazy or any(tab['factory'] for tab in self._tabs.values()):
+            return None
+
+        return super()._get_render_cache_key_parts()
+
+    def _get_data(self) -> dict:
+        if not self._lazy:
+            return super()._get_data()
+
+        data = dict(super()._get_data())
+        data['tab-url'] = http_api.url('widget@tabs_pane')
+        data['tab-spec'] = _signing.sign(self.get_tabs_spec())
+
+        return data
+
     def _get_element(self, **kwargs) -> htmler.Element:
         tab_panel = htmler.Div(role='tabpanel')
         tabs_nav = htmler.Ul(css='nav nav-tabs', role='tablist')
@@ -621,15 +1325,46 @@ class Tabs(Abstract):
             tab_content_div = htmler.Div('', css=tab_content_css, id='tab-uid-' + tab_id)
             tabs_content.append_child(tab_content_div)
 
-            for widget in sorted(tab['widgets'], key=lambda x: x.weight):  # type: Abstract
-                tab_content_div.append_child(widget.renderable())
+            # Lazy tabs are loaded when they are shown for the first time
+            if self._lazy and tab_count > 0:
+                tab_content_div.set_attr('data_lazy_tab', tab_id)
+
+            # Widgets are rendered while rendering the tab
+            elif tab['widgets'] or tab['factory']:
+                tab_content_div.append_child(LazyElement(
+                    lambda t_id=tab_id: (w.renderable() for w in self.get_tab_widgets(t_id))
+                ))
 
             tab_count += 1
 
         return tab_panel
 
 
+def get_tabs_class(cid: str) -> type:
+    """Get a Tabs subclass by its ID
+    """
+    cls = _tabs_classes.get(cid)
+    if cls is None or cls is Tabs:
+        raise RuntimeError("Tabs class '{}' is not found".format(cid))
+
+    return cls
+
+
+def build_tabs(spec: dict) -> Tabs:
+    """Build a widget which renders lazy tabs, see `Tabs.get_tabs_spec()`
+    """
+    try:
+        cid, uid, name, tab_args = spec['cid'], spec['uid'], spec['name'], spec['tab_args']
+    except (KeyError, TypeError):
+        raise ValueError('Invalid Tabs specification')
+
+    # Constructor of the widget only adds tabs, widgets of a tab are built when they are needed
+    return get_tabs_class(cid)(uid, name=name, lazy=True, tab_args=tab_args)
+
+
 class Score(Abstract):
+    __slots__ = ('_min', '_max', '_show_numbers')
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
@@ -641,12 +1376,14 @@ class Score(Abstract):
         self._max = kwargs.get('max', 5)
         self._show_numbers = kwargs.get('show_numbers', True)
 
+    def _get_css(self) -> str:
+        return self._css + ' enabled' if self._enabled else self._css
+
     def _get_element(self, **kwargs) -> htmler.Element:
         cont = htmler.Div(css='switches-wrap')
 
         if self._enabled:
             cont.append_child(htmler.Input(name=self.uid, type='hidden', value=self.get_val()))
-            self.css += ' enabled'
 
         for i in range(self._min, self._max + 1):
             a = htmler.Span(css='switch score-' + str(i), data_score=str(i))
@@ -663,6 +1400,8 @@ class Score(Abstract):
 
 
 class TrafficLightScore(Score):
+    __slots__ = ()
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
@@ -672,21 +1411,26 @@ class TrafficLightScore(Score):
 
 
 class ColorPicker(Text):
+    __slots__ = ()
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
         super().__init__(uid, **kwargs)
 
-    def _get_element(self, **kwargs):
-        self._data['color'] = self.value
+    def _get_data(self) -> dict:
+        data = dict(super()._get_data())
+        data['color'] = self.value
 
-        return super()._get_element()
+        return data
 
 
 class Breadcrumb(Abstract):
     """Breadcrumb Widget
     """
 
+    __slots__ = ('_items',)
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
@@ -697,6 +1441,11 @@ class Breadcrumb(Abstract):
 
         self._items = list(kwargs.get('items', []))
 
+    def _on_clone(self, memo: dict):
+        super()._on_clone(memo)
+
+        self._items = list(self._items)
+
     def _get_element(self) -> htmler.Element:
         """Hook
         """
@@ -0,0 +1,61 @@
+"""PytSite Widget Signed Data
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+import hmac
+from typing import Any
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+from binascii import Error as BinasciiError
+from hashlib import sha256
+from json import dumps as json_dumps, loads as json_loads
+from secrets import token_hex
+from pytsite import reg, router
+
+# Session key of the signing key
+_SESSION_KEY = 'widget.signing_key'
+
+
+def _get_key() -> bytes:
+    """Get signing key of the current session
+
+    Data signed within a session cannot be used within other ones. Without a session, i.e. in console, the key is
+    taken from the 'widget.signing_key' registry entry.
+    """
+    session = router.session()
+    if session is not None:
+        key = session.get(_SESSION_KEY)
+        if key is None:
+            key = session[_SESSION_KEY] = token_hex(32)
+    else:
+        key = reg.get('widget.signing_key')
+        if not key:
+            raise RuntimeError("There is no session to sign data within and 'widget.signing_key' is not configured")
+
+    return key.encode('utf-8')
+
+
+def _digest(payload: str) -> str:
+    return hmac.new(_get_key(), payload.encode('ascii'), sha256).hexdigest()
+
+
+def sign(value: Any) -> str:
+    """Encode a JSON serializable value into a signed token
+    """
+    payload = urlsafe_b64encode(json_dumps(value, separators=(',', ':')).encode('utf-8')).decode('ascii').rstrip('=')
+
+    return payload + '.' + _digest(payload)
+
+
+def unsign(token: str) -> Any:
+    """Decode a value from a signed token
+    """
+    try:
+        payload, signature = token.rsplit('.', 1)
+        if not hmac.compare_digest(signature, _digest(payload)):
+            raise ValueError('Invalid token signature')
+
+        return json_loads(urlsafe_b64decode(payload + '=' * (-len(payload) % 4)).decode('utf-8'))
+    except (AttributeError, TypeError, BinasciiError, UnicodeError):
+        raise ValueError('Invalid token')
@@ -5,14 +5,17 @@ __email__ = 'a@shepetko.com'
 __license__ = 'MIT'
 
 import htmler
-from typing import Union
+from typing import Union, Iterator
 from . import _base
+from ._html import LazyElement
 
 
 class HTML(_base.Abstract):
     """Wrapper widget for pytsite.html.Element instances.
     """
 
+    __slots__ = ('_em',)
+
     def __init__(self, uid: str, **kwargs):
         """Init.
         :param em: pytsite.html.Element
@@ -31,6 +34,8 @@ class Text(_base.Abstract):
     """Static Text Widget.
     """
 
+    __slots__ = ('_text',)
+
     def __init__(self, uid: str, **kwargs):
         """Init
         """
@@ -60,6 +65,8 @@ class Text(_base.Abstract):
 
 
 class Table(_base.Abstract):
+    __slots__ = ('_thead', '_tbody', '_tfoot')
+
     def __init__(self, uid: str, **kwargs):
         """Init.
         """
@@ -69,6 +76,13 @@ class Table(_base.Abstract):
         self._tbody = []
         self._tfoot = []
 
+    def _on_clone(self, memo: dict):
+        super()._on_clone(memo)
+
+        self._thead = list(self._thead)
+        self._tbody = list(self._tbody)
+        self._tfoot = list(self._tfoot)
+
     def add_row(self, cells: Union[list, tuple], index: int = None, part: str = 'tbody'):
         if not isinstance(cells, (list, tuple)):
             raise TypeError('List or tuple expected, got {}'.format(type(cells)))
@@ -83,6 +97,29 @@ class Table(_base.Abstract):
         else:
             self._tbody.insert(index, cells)
 
+    def _iter_rows(self, part: list) -> Iterator[htmler.Tr]:
+        """Build rows of a table part one by one
+        """
+        for row in part:
+            tr = htmler.Tr()
+            for cell in row:
+                td = htmler.Th() if part is self._thead else htmler.Td()
+
+                if isinstance(cell, dict):
+                    if 'content' in cell:
+                        td.append_text(cell['content'])
+                    for attr, attr_v in cell.items():
+                        if attr != 'content':
+                            td.set_attr(attr, attr_v)
+                elif isinstance(cell, str):
+                    td.append_text(cell)
+                else:
+                    raise TypeError('Dict or str expected, got {}'.format(type(cell)))
+
+                tr.append_child(td)
+
+            yield tr
+
     def _get_element(self, **kwargs) -> htmler.Element:
         table = htmler.Table(css='table table-bordered table-hover')
 
@@ -99,24 +136,7 @@ class Table(_base.Abstract):
 
             table.append_child(t_part)
 
-            # Append rows
-            for row in part:
-                tr = htmler.Tr()
-                for cell in row:
-                    td = htmler.Th() if part is self._thead else htmler.Td()
-
-                    if isinstance(cell, dict):
-                        if 'content' in cell:
-                            td.append_text(cell.pop('content'))
-                        for attr in cell.keys():
-                            td.set_attr(attr, cell[attr])
-                    elif isinstance(cell, str):
-                        td.append_text(cell)
-                    else:
-                        raise TypeError('Dict or str expected, got {}'.format(type(cell)))
-
-                    tr.append_child(td)
-
-                t_part.append_child(tr)
+            # Rows are built while rendering
+            t_part.append_child(LazyElement(lambda p=part: self._iter_rows(p)))
 
         return table
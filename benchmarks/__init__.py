@@ -0,0 +1,5 @@
+"""PytSite Widget Plugin Benchmarks
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
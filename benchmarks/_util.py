@@ -0,0 +1,68 @@
+"""PytSite Widget Benchmarks Utilities
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+from typing import Callable, Iterable, Sequence
+from timeit import Timer
+
+
+def best_time(func: Callable, number: int = 1, repeat: int = 5) -> float:
+    """Get best time of a single call of a function, in seconds
+    """
+    return min(Timer(func).repeat(repeat, number)) / number
+
+
+def fmt_time(seconds: float) -> str:
+    """Format a time with a suitable unit
+    """
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return '{:.2f} {}'.format(seconds / scale, unit)
+
+    return '{:.0f} ns'.format(seconds / 1e-9)
+
+
+def print_table(headers: Sequence[str], rows: Iterable[Sequence]):
+    """Print a plain text table
+    """
+    rows = [[str(c) for c in row] for row in rows]
+    widths = [max(len(str(h)), *(len(r[i]) for r in rows)) for i, h in enumerate(headers)]
+
+    print('  '.join(str(h).rjust(w) for h, w in zip(headers, widths)))
+    print('  '.join('-' * w for w in widths))
+    for row in rows:
+        print('  '.join(c.rjust(w) for c, w in zip(row, widths)))
+
+
+def build_form(size: int):
+    """Build a form-like tree of about `size` widgets, grouped into cards of ten fields
+
+    :rtype: plugins.widget.container.Container
+    """
+    from plugins.widget import container, input, select
+
+    items = [('item_{}'.format(i), 'Item {}'.format(i)) for i in range(20)]
+    form = container.Container('form')
+    card = None
+
+    for i in range(size - 1):
+        if i % 11 == 0:
+            card = form.append_child(container.Card('card_{}'.format(i), title='Card {}'.format(i)))
+            continue
+
+        uid = 'field_{}'.format(i)
+        kind = i % 4
+        if kind == 0:
+            widget = input.Text(uid, label='Text {}'.format(i), value='Value {}'.format(i), required=True)
+        elif kind == 1:
+            widget = input.Integer(uid, label='Integer {}'.format(i), value=i)
+        elif kind == 2:
+            widget = select.Select(uid, label='Select {}'.format(i), items=items, value='item_{}'.format(i % 20))
+        else:
+            widget = select.Checkbox(uid, label='Checkbox {}'.format(i), value=bool(i % 2))
+
+        card.append_child(widget)
+
+    return form
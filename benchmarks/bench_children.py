@@ -0,0 +1,63 @@
+"""PytSite Widget Children Registry Benchmark
+
+Builds forms of 10 to 10,000 children and measures appending children, looking them up, replacing and removing them.
+Run from an application's root: `python -m plugins.widget.benchmarks.bench_children`.
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+from plugins.widget import container, input
+from ._util import best_time, fmt_time, print_table
+
+SIZES = (10, 100, 1000, 10000)
+
+
+def build(size: int) -> container.Container:
+    form = container.Container('form')
+    for i in range(size):
+        # Mix of automatic and explicit weights, explicit ones are inserted between existing children
+        weight = (i * 37 % size) * 100 + 50 if i % 3 == 0 else 0
+        form.append_child(input.Text('field_{}'.format(i), weight=weight))
+
+    return form
+
+
+def lookup(form: container.Container, size: int):
+    for i in range(size):
+        uid = 'field_{}'.format(i)
+        if form.has_child(uid):
+            form.get_child(uid)
+
+
+def replace_and_remove(form: container.Container, size: int):
+    for i in range(0, size, 2):
+        form.replace_child('field_{}'.format(i), input.Text('new_{}'.format(i)))
+    for i in range(1, size, 2):
+        form.remove_child('field_{}'.format(i))
+
+
+def time_on_fresh(func, size: int) -> float:
+    """Time a function which changes a form, on a freshly built one
+    """
+    form = build(size)
+
+    return best_time(lambda: func(form), repeat=1)
+
+
+def main():
+    rows = []
+    for size in SIZES:
+        repeat = 5 if size < 10000 else 3
+        t_build = best_time(lambda: build(size), repeat=repeat)
+        form = build(size)
+        t_lookup = best_time(lambda: lookup(form, size), repeat=repeat)
+        t_change = min(time_on_fresh(lambda f: replace_and_remove(f, size), size) for _ in range(repeat))
+        rows.append((size, fmt_time(t_build), fmt_time(t_build / size), fmt_time(t_lookup / size),
+                     fmt_time(t_change / size)))
+
+    print_table(('children', 'build', 'per append', 'per lookup', 'per replace/remove'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+"""PytSite Widget Cloning Benchmark
+
+Compares building of widget trees of 50, 500 and 5000 widgets from scratch against cloning of prebuilt ones.
+Run from an application's root: `python -m plugins.widget.benchmarks.bench_clone`.
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+from ._util import best_time, build_form, fmt_time, print_table
+
+SIZES = (50, 500, 5000)
+
+
+def main():
+    rows = []
+    for size in SIZES:
+        repeat = 5 if size < 5000 else 3
+        prototype = build_form(size)
+        t_build = best_time(lambda: build_form(size), repeat=repeat)
+        t_clone = best_time(prototype.clone, repeat=repeat)
+        rows.append((size, fmt_time(t_build), fmt_time(t_clone), '{:.1f}x'.format(t_build / t_clone)))
+
+    print_table(('widgets', 'build', 'clone', 'speedup'), rows)
+
+
+if __name__ == '__main__':
+    main()
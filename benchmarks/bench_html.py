@@ -0,0 +1,45 @@
+"""PytSite Widget HTML Building Benchmark
+
+Compares rendering of elements built directly as strings against the same elements built by htmler, the way it was done
+before 4.19, for `input.Hidden`, `input.Text`, `select.Checkbox` and options of `select.Select` of several sizes.
+Reference htmler builders are shared with tests. Run from an application's root:
+`python -m plugins.widget.benchmarks.bench_html`.
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+from plugins.widget import input, select
+from ..tests.test_html import checkbox_em, hidden_em, options_em, text_em
+from ._util import best_time, fmt_time, print_table
+
+OPTION_COUNTS = (10, 100, 1000, 10000)
+
+
+def main():
+    cases = [
+        ('Hidden', input.Hidden('h', value='value', data_x=1), hidden_em),
+        ('Text', input.Text('t', value='value', placeholder='Placeholder', max_length=10), text_em),
+        ('Checkbox', select.Checkbox('c', label='Agree', value=True), checkbox_em),
+    ]
+
+    rows = []
+    for name, widget, reference in cases:
+        t_htmler = best_time(lambda: reference(widget).render(), number=1000)
+        t_string = best_time(lambda: widget._get_element().render(), number=1000)
+        rows.append((name, fmt_time(t_htmler), fmt_time(t_string), '{:.1f}x'.format(t_htmler / t_string)))
+
+    for count in OPTION_COUNTS:
+        items = [('item_{}'.format(i), 'Item {}'.format(i)) for i in range(count)]
+        widget = select.Select('s', items=items, value='item_{}'.format(count // 2))
+        number = max(1, 10000 // count)
+        t_htmler = best_time(lambda: options_em(widget).render(), number=number)
+        t_string = best_time(lambda: widget._get_options_em().render(), number=number)
+        rows.append(('{} options'.format(count), fmt_time(t_htmler), fmt_time(t_string),
+                     '{:.1f}x'.format(t_htmler / t_string)))
+
+    print_table(('element', 'htmler', 'string', 'speedup'), rows)
+
+
+if __name__ == '__main__':
+    main()
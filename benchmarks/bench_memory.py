@@ -0,0 +1,124 @@
+"""PytSite Widget Memory Benchmark
+
+Measures memory allocated per widget instance, using tracemalloc, for each widget class of `input`, `select`,
+`container`, `misc`, `static` and `button` modules. Widgets keep their attributes in `__slots__`; for comparison, the
+same attributes are also kept in instance dicts of plain objects, the way widgets stored them before 4.19.
+Run from an application's root: `python -m plugins.widget.benchmarks.bench_memory`.
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+import gc
+import sys
+import tracemalloc
+from inspect import isabstract
+from typing import Callable, Iterator, List, Tuple
+import htmler
+from plugins.widget import Abstract, _button, _container, _input, _misc, _select, _static
+from ._util import print_table
+
+INSTANCES = 1000
+
+# Arguments required by some widget classes
+KWARGS = {
+    _input.TypeaheadText: {'source_url': 'https://example.com/search'},
+    _misc.BootstrapTable: {'rows_url': 'https://example.com/rows'},
+    _misc.TreeTable: {'rows_url': 'https://example.com/rows', 'update_rows_url': 'https://example.com/update'},
+    _static.HTML: {'em': htmler.Div('Content')},
+}
+
+
+class _Rows(_container.MultiRow):
+    __slots__ = ()
+
+    def _get_widgets(self):
+        return [_input.Text('title')]
+
+
+class _RowsList(_container.MultiRowList):
+    __slots__ = ()
+
+    def _get_widgets(self):
+        return [_input.Text('title')]
+
+
+def iter_classes() -> Iterator[Tuple[str, str, type]]:
+    """Iterate over instantiable widget classes of measured modules
+
+    Abstract multi row classes are measured through minimal subclasses.
+    """
+    for module in (_input, _select, _container, _misc, _static, _button):
+        module_name = module.__name__.split('.')[-1].lstrip('_')
+        for cls in vars(module).values():
+            if isinstance(cls, type) and issubclass(cls, Abstract) and cls.__module__ == module.__name__:
+                name = cls.__name__
+                if cls is _container.MultiRow:
+                    cls = _Rows
+                elif cls is _container.MultiRowList:
+                    cls = _RowsList
+                if not isabstract(cls):
+                    yield module_name, name, cls
+
+
+def measure(build: Callable[[], List]) -> float:
+    """Measure memory allocated by a function which builds a list of `INSTANCES` objects, per object
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        objects = build()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del objects
+
+    return size / INSTANCES
+
+
+def bytes_per_widget(cls: type) -> Tuple[float, float]:
+    """Measure memory allocated by one instance of a widget class, with attributes kept in slots and in a dict
+    """
+    kwargs = KWARGS.get(cls, {})
+
+    # Warm up class level caches, they must not be accounted
+    cls('warm_up', **kwargs)
+
+    with_slots = measure(lambda: [cls('widget_{}'.format(i), **kwargs) for i in range(INSTANCES)])
+
+    # Same attributes, set one by one in the same order, so instance dicts share keys like they did in widgets
+    slots = [a for c in reversed(cls.__mro__) for a in c.__dict__.get('__slots__', ()) if a != '__weakref__']
+    widgets = [cls('widget_{}'.format(i), **kwargs) for i in range(INSTANCES)]
+    attrs = [[(a, getattr(w, a)) for a in slots if hasattr(w, a)] for w in widgets]
+    dict_cls = type(cls.__name__, (), {})
+
+    def build_dict_instances() -> list:
+        r = []
+        for w_attrs in attrs:
+            o = dict_cls()
+            for k, v in w_attrs:
+                setattr(o, k, v)
+            r.append(o)
+        return r
+
+    # Values of attributes are the same, so only the difference of instances' own storage is taken
+    with_dict = with_slots - sys.getsizeof(widgets[0]) + measure(build_dict_instances)
+
+    return with_slots, with_dict
+
+
+def main():
+    rows = []
+    for module_name, name, cls in iter_classes():
+        with_slots, with_dict = bytes_per_widget(cls)
+        rows.append((module_name, name, '{:.0f}'.format(with_dict), '{:.0f}'.format(with_slots),
+                     '{:.0f}%'.format((with_dict - with_slots) / with_dict * 100)))
+
+    print_table(('module', 'class', 'dict, bytes', 'slots, bytes', 'saved'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""PytSite Widget Render Benchmark
+
+Renders each widget of forms of hundreds of widgets, as forms do, and reports time per widget, along with the cost of
+class level render metadata (class IDs chain, wrapper CSS classes and package name) computed on each render, as it was
+done before 4.19, against reading of values precomputed per class.
+Run from an application's root: `python -m plugins.widget.benchmarks.bench_render`.
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+from plugins.widget import Abstract
+from ._util import best_time, build_form, fmt_time, print_table
+
+SIZES = (100, 300, 900)
+
+
+def compute_meta(widget: Abstract) -> tuple:
+    """Compute class level render metadata the way it was done on each render before 4.19
+    """
+    cls = widget.__class__
+
+    cid = []
+    cur_cls = cls
+    while cur_cls is not Abstract:
+        cid.append(cur_cls.cid())
+        cur_cls = cur_cls.__bases__[0]
+
+    cls_css = cls.__name__.lower()
+    cid_css = cls.cid().lower().replace('_', '-').replace('.', '-')
+    package_name = '.'.join(cls.__module__.split('.')[:-1])
+
+    return ' '.join(reversed(cid)), 'pytsite-widget widget-{} widget-{}'.format(cls_css, cid_css), package_name
+
+
+def read_meta(widget: Abstract) -> tuple:
+    """Read class level render metadata precomputed per class
+    """
+    return widget._cls_cid_chain, widget._cls_wrap_css, widget.get_package_name()
+
+
+def main():
+    rows = []
+    for size in SIZES:
+        form = build_form(size)
+        widgets = [form] + list(form.iter_descendants())
+        n = len(widgets)
+
+        t_render = best_time(lambda: [w.render() for w in widgets])
+        t_computed = best_time(lambda: [compute_meta(w) for w in widgets])
+        t_cached = best_time(lambda: [read_meta(w) for w in widgets])
+        rows.append((n, fmt_time(t_render), fmt_time(t_render / n), fmt_time(t_computed / n),
+                     fmt_time(t_cached / n), fmt_time((t_computed - t_cached) / n)))
+
+    print_table(('widgets', 'render', 'per widget', 'meta computed', 'meta cached', 'saved per widget'), rows)
+
+
+if __name__ == '__main__':
+    main()
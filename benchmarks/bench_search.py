@@ -0,0 +1,72 @@
+"""PytSite Widget Items Search Benchmark
+
+Measures building of search indexes and query latency of Select2 search over catalogs of 1k, 100k and 1M items with 50
+excluded items, along with a linear case insensitive scan over the same items for comparison.
+Run from an application's root: `python -m plugins.widget.benchmarks.bench_search`.
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+from random import Random
+from time import perf_counter
+from plugins.widget import items
+from plugins.widget._search import get_index, select2_results
+from ._util import best_time, fmt_time, print_table
+
+SIZES = (1000, 100000, 1000000)
+
+# Short queries are looked up by prefix, longer ones by trigrams
+QUERIES = ('k', 'ka', 'kal', 'rimo', 'xyzzy')
+
+_SYLLABLES = ('ka', 'lo', 'mi', 'ra', 'se', 'to', 'vu', 'ne', 'di', 'po', 'zu', 'be', 'ga', 'fi', 'ho', 'je')
+
+
+def make_items(size: int) -> list:
+    """Generate items with titles of two to three pseudo words
+    """
+    rnd = Random(size)
+    r = []
+    for i in range(size):
+        words = [''.join(rnd.choice(_SYLLABLES) for _ in range(rnd.randint(2, 4))) for _ in range(rnd.randint(2, 3))]
+        r.append(('item_{}'.format(i), ' '.join(words).capitalize()))
+
+    return r
+
+
+def linear_scan(source: list, query: str, per_page: int = 20) -> list:
+    """Search the way a naive endpoint does
+    """
+    query = query.casefold()
+    r = []
+    for item in source:
+        if query in item[1].casefold():
+            r.append(item)
+            if len(r) > per_page:
+                break
+
+    return r
+
+
+def main():
+    rows = []
+    for size in SIZES:
+        source = make_items(size)
+        catalog = items.Catalog('bench_search_{}'.format(size), source)
+        exclude = ['item_{}'.format(i) for i in range(0, size, size // 50)]
+
+        start = perf_counter()
+        get_index(catalog)
+        t_index = perf_counter() - start
+
+        for query in QUERIES:
+            t_query = best_time(lambda: select2_results(catalog, query, exclude=exclude), number=10)
+            t_page = best_time(lambda: select2_results(catalog, query, page=5, exclude=exclude), number=10)
+            t_scan = best_time(lambda: linear_scan(source, query), repeat=3)
+            rows.append((size, fmt_time(t_index), repr(query), fmt_time(t_query), fmt_time(t_page), fmt_time(t_scan)))
+
+    print_table(('items', 'index build', 'query', 'page 1', 'page 5', 'linear scan'), rows)
+
+
+if __name__ == '__main__':
+    main()
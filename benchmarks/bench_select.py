@@ -0,0 +1,46 @@
+"""PytSite Widget Selection Benchmark
+
+Renders multiple `select.Select` and `select.Checkboxes` over a matrix of item counts and selection sizes. Every tenth
+item is excluded. Run from an application's root: `python -m plugins.widget.benchmarks.bench_select`.
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+from plugins.widget import select
+from ._util import best_time, fmt_time, print_table
+
+ITEM_COUNTS = (100, 2000, 20000)
+SELECTION_SIZES = (1, 10, 100, 1000)
+
+
+def main():
+    rows = []
+    for item_count in ITEM_COUNTS:
+        items = [(str(i), 'Item {}'.format(i)) for i in range(item_count)]
+        int_items = [(i, 'Item {}'.format(i)) for i in range(item_count)]
+        exclude = [str(i) for i in range(5, item_count, 10)]
+        repeat = 5 if item_count < 20000 else 3
+
+        for selection_size in SELECTION_SIZES:
+            if selection_size > item_count:
+                continue
+
+            # Selected values are spread over all items
+            step = item_count // selection_size
+            value = [str(i) for i in range(0, item_count, step)][:selection_size]
+
+            t_select = best_time(lambda: select.Select('w', items=items, value=value, exclude=exclude,
+                                                       multiple=True).render(), repeat=repeat)
+            t_int_keys = best_time(lambda: select.Select('w', items=int_items, value=value, int_keys=True,
+                                                         multiple=True).render(), repeat=repeat)
+            t_checkboxes = best_time(lambda: select.Checkboxes('w', items=items, value=value,
+                                                               exclude=exclude).render(), repeat=repeat)
+            rows.append((item_count, selection_size, fmt_time(t_select), fmt_time(t_int_keys),
+                         fmt_time(t_checkboxes)))
+
+    print_table(('items', 'selected', 'Select', 'Select, int_keys', 'Checkboxes'), rows)
+
+
+if __name__ == '__main__':
+    main()
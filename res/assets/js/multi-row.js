@@ -9,6 +9,20 @@ setupWidget('plugins.widget._container.MultiRow', widget => {
     let slotsContainer = widget.em.find('.slots');
     let addBtn = widget.em.find('.button-add-slot');
 
+    // Virtualized mode: rows which are not rendered yet are kept in the hidden input as columns
+    const windowSize = parseInt(widget.data('windowSize'));
+    const rowsUrl = widget.data('rowsUrl');
+    const rowsSpec = widget.data('rowsSpec');
+    const payloadInput = widget.em.find('input.rows-payload');
+    const payload = payloadInput.length ? JSON.parse(payloadInput.val()) : {};
+    let loading = false;
+
+    function pendingRowsCount() {
+        const keys = Object.keys(payload);
+
+        return keys.length ? payload[keys[0]].length : 0;
+    }
+
     function refresh() {
         const slots = slotsContainer.find('.slot:not(.base)');
 
@@ -24,7 +38,7 @@ setupWidget('plugins.widget._container.MultiRow', widget => {
             });
         }
 
-        if (slots.length >= maxRows)
+        if (slots.length + pendingRowsCount() >= maxRows)
             addBtn.addClass('hidden sr-only');
         else
             addBtn.removeClass('hidden sr-only');
@@ -78,6 +92,62 @@ setupWidget('plugins.widget._container.MultiRow', widget => {
         setupSlot(i, $(em));
     });
 
+    if (rowsUrl && pendingRowsCount()) {
+        const sentinel = widget.em.find('tfoot');
+
+        function loadWindow(observer) {
+            if (loading || !pendingRowsCount())
+                return;
+
+            const rows = {};
+            Object.keys(payload).forEach(k => rows[k] = payload[k].slice(0, windowSize));
+
+            loading = true;
+            $.ajax({
+                url: rowsUrl,
+                method: 'POST',
+                data: {
+                    spec: rowsSpec,
+                    start: slotsContainer.find('.slot:not(.base)').length,
+                    rows: JSON.stringify(rows),
+                },
+                dataType: 'json',
+            }).done(r => {
+                // Loaded rows are submitted by their own inputs from now on
+                Object.keys(payload).forEach(k => payload[k].splice(0, windowSize));
+                payloadInput.val(JSON.stringify(payload));
+
+                $(r.html).filter('.slot').each(function () {
+                    const newSlot = $(this);
+                    slotsContainer.append(newSlot);
+                    setupSlot(slotsContainer.find('.slot').length - 2, newSlot);
+                });
+
+                loading = false;
+
+                if (!pendingRowsCount()) {
+                    observer.disconnect();
+                    payloadInput.remove();
+                    return;
+                }
+
+                // Observing again reports whether the end of the table is still visible
+                observer.unobserve(sentinel[0]);
+                observer.observe(sentinel[0]);
+            }).fail(() => {
+                // Next window is requested when the end of the table becomes visible again
+                loading = false;
+            });
+        }
+
+        const observer = new IntersectionObserver(entries => {
+            if (entries.some(entry => entry.isIntersecting))
+                loadWindow(observer);
+        }, {rootMargin: '200px'});
+
+        observer.observe(sentinel[0]);
+    }
+
     addBtn.click(function (e) {
         e.preventDefault();
 
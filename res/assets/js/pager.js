@@ -3,6 +3,202 @@ import setupWidget from '@pytsite/widget';
 import {lang} from '@pytsite/assetman';
 import httpApi from '@pytsite/http-api';
 
+// Cursor of the last page
+const LAST_PAGE_CURSOR = 'last';
+
+/**
+ * Setup pager in cursor mode.
+ *
+ * HTTP API endpoint receives either 'after' or 'before' cursor and must respond with an object which contains
+ * 'first_cursor' and 'last_cursor' of fetched page and 'has_more' flag, see select.Pager.set_cursors().
+ *
+ * @param widget
+ * @param httpApiEp
+ */
+function setupCursorMode(widget, httpApiEp) {
+    const em = widget.em;
+    const perPage = parseInt(em.data('perPage'));
+    const buttons = em.find('li');
+    let firstCursor = em.data('firstCursor');
+    let lastCursor = em.data('lastCursor');
+    let hasPrevious = em.data('hasPrevious') === 'True';
+    let hasNext = em.data('hasNext') === 'True';
+    let request = null;
+
+    /**
+     * Enable or disable buttons according to current state.
+     */
+    function refresh() {
+        buttons.filter('.first-page').toggleClass('disabled', !hasPrevious);
+        buttons.filter('.previous-page').toggleClass('disabled', !(hasPrevious && firstCursor));
+        buttons.filter('.next-page').toggleClass('disabled', !(hasNext && lastCursor));
+        buttons.filter('.last-page').toggleClass('disabled', !hasNext);
+    }
+
+    /**
+     * Make an HTTP API request.
+     *
+     * @param {string} after
+     * @param {string} before
+     */
+    function loadData(after, before) {
+        const args = {count: perPage};
+        if (after)
+            args.after = after;
+        else if (before)
+            args.before = before;
+
+        // Responses of previous clicks are not interesting anymore
+        const thisRequest = request = httpApi.get(httpApiEp, args);
+
+        thisRequest.then(r => {
+            if (thisRequest !== request)
+                return;
+
+            const reverse = !!before;
+            firstCursor = r.first_cursor || '';
+            lastCursor = r.last_cursor || '';
+            hasPrevious = reverse ? !!r.has_more : !!after;
+            hasNext = reverse ? before !== LAST_PAGE_CURSOR : !!r.has_more;
+            refresh();
+
+            $(window).trigger('plugins.widget.select.pager.httpApiLoad', [r, args, widget]);
+        }).catch(r => {
+            if (thisRequest === request)
+                $(window).trigger('plugins.widget.select.pager.httpApiError', [r, args, widget]);
+        });
+    }
+
+    buttons.click(function (e) {
+        e.preventDefault();
+
+        const btn = $(this);
+        if (btn.hasClass('disabled'))
+            return;
+
+        if (btn.hasClass('first-page'))
+            loadData();
+        else if (btn.hasClass('previous-page'))
+            loadData(null, firstCursor);
+        else if (btn.hasClass('next-page'))
+            loadData(lastCursor);
+        else if (btn.hasClass('last-page'))
+            loadData(null, LAST_PAGE_CURSOR);
+    });
+
+    // Init
+    const query = new URLSearchParams(window.location.search);
+    loadData(query.get('after'), query.get('before'));
+}
+
+/**
+ * Setup pager in offset mode with unknown or estimated total number of items.
+ *
+ * HTTP API endpoint receives 'skip' and 'count' arguments and should respond with an object which contains
+ * 'has_more' flag, i. e. whether it was able to fetch 'count + 1' items. Links are rebuilt after each load.
+ *
+ * @param widget
+ * @param httpApiEp
+ */
+function setupOpenEndedMode(widget, httpApiEp) {
+    const em = widget.em;
+    const ul = em.find('ul.pagination');
+    const perPage = parseInt(em.data('perPage'));
+    const visibleNumbers = parseInt(em.data('visibleNumbers'));
+    let currentPage = parseInt(em.data('currentPage'));
+    let hasNext = em.data('hasNext') === 'True';
+    let request = null;
+
+    /**
+     * Build a link.
+     *
+     * @param {string} css
+     * @param {string} text
+     * @param {string} title
+     * @param {number} pageNum
+     */
+    function link(css, text, title, pageNum) {
+        const url = new URL(window.location.href);
+        url.searchParams.set('page', pageNum);
+
+        const a = $('<a class="page-link">').text(text).attr({title: title, href: url.toString()});
+
+        return $('<li>').addClass(css + ' page-item').attr('data-page-num', pageNum).append(a);
+    }
+
+    /**
+     * Rebuild links, only the next page is known to exist after the current one.
+     */
+    function rebuild() {
+        const lastPage = hasNext ? currentPage + 1 : currentPage;
+        const visible = Math.min(visibleNumbers, lastPage);
+        let start = Math.max(currentPage - Math.ceil((visible - 1) / 2), 1);
+        let end = start + visible - 1;
+        if (end > lastPage) {
+            end = lastPage;
+            start = end - visible + 1;
+        }
+
+        ul.empty();
+
+        if (start > 1) {
+            ul.append(link('first-page', '«', lang.t('plugins.widget@first_page'), 1));
+            ul.append(link('previous-page', '‹', lang.t('plugins.widget@previous_page'), currentPage - 1));
+        }
+
+        for (let num = start; num <= end; num++) {
+            const li = link('page', String(num), lang.t('plugins.widget@page_num', {num: num}), num);
+            li.attr('data-page', num).toggleClass('active', num === currentPage);
+            ul.append(li);
+        }
+
+        if (currentPage < lastPage)
+            ul.append(link('next-page', '›', lang.t('plugins.widget@next_page'), currentPage + 1));
+
+        em.toggleClass('hidden sr-only', currentPage === 1 && !hasNext);
+        em.attr('data-current-page', currentPage);
+    }
+
+    /**
+     * Make an HTTP API request.
+     *
+     * @param {number} pageNum
+     */
+    function loadData(pageNum) {
+        // Responses of previous clicks are not interesting anymore
+        const thisRequest = request = httpApi.get(httpApiEp, {
+            skip: (pageNum - 1) * perPage,
+            count: perPage
+        });
+
+        thisRequest.then(r => {
+            if (thisRequest !== request)
+                return;
+
+            currentPage = pageNum;
+            hasNext = !!r.has_more;
+            rebuild();
+
+            $(window).trigger('plugins.widget.select.pager.httpApiLoad', [r, pageNum, widget]);
+        }).catch(r => {
+            if (thisRequest === request)
+                $(window).trigger('plugins.widget.select.pager.httpApiError', [r, pageNum, widget]);
+        });
+    }
+
+    // Links are rebuilt, so clicks are handled by the list
+    ul.on('click', 'li', function (e) {
+        e.preventDefault();
+
+        const btn = $(this);
+        if (!btn.hasClass('active'))
+            loadData(parseInt(btn.attr('data-page-num')));
+    });
+
+    // Init
+    loadData(currentPage);
+}
+
 setupWidget('plugins.widget._select.Pager', widget => {
     const em = widget.em;
     const httpApiEp = em.data('httpApiEp');
@@ -10,6 +206,16 @@ setupWidget('plugins.widget._select.Pager', widget => {
     if (!httpApiEp)
         return;
 
+    if (em.data('mode') === 'cursor') {
+        setupCursorMode(widget, httpApiEp);
+        return;
+    }
+
+    if (em.data('estimatedTotal') === 'True') {
+        setupOpenEndedMode(widget, httpApiEp);
+        return;
+    }
+
     var buttons = em.find('li');
     var totalItems = parseInt(em.data('totalItems'));
     var currentPage = parseInt(em.data('currentPage'));
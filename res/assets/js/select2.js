@@ -2,73 +2,198 @@ import 'select2';
 import 'select2/dist/css/select2.css';
 import 'select2-bootstrap-theme/dist/select2-bootstrap.css';
 import '@ttskch/select2-bootstrap4-theme/dist/select2-bootstrap4.css'
+import $ from 'jquery';
 import setupWidget from '@pytsite/widget';
-import assetman from '@pytsite/assetman';
 
-setupWidget('plugins.widget._select.Select2', widget => {
-    function processResults(data) {
-        if (widget.data('appendNoneItem')) {
-            data['results'].unshift({
-                id: '',
-                text: widget.data('noneItemTitle'),
-            });
+/**
+ * Bounded LRU cache of AJAX responses, shared by all Select2 widgets of the page
+ */
+class ResponseCache {
+    /**
+     * Constructor
+     *
+     * @param {number} maxSize
+     */
+    constructor(maxSize) {
+        this.maxSize = maxSize;
+        this.entries = new Map();
+    }
+
+    /**
+     * Get a response
+     *
+     * @param {string} key
+     * @returns {object|undefined}
+     */
+    get(key) {
+        const entry = this.entries.get(key);
+        if (!entry)
+            return undefined;
+
+        if (entry.expires < Date.now()) {
+            this.entries.delete(key);
+            return undefined;
         }
 
-        return data;
+        // Move the entry to the end of the queue
+        this.entries.delete(key);
+        this.entries.set(key, entry);
+
+        return entry.data;
     }
 
-    const select2Opts = {language: document.documentElement.lang};
+    /**
+     * Put a response
+     *
+     * @param {string} key
+     * @param {object} data
+     * @param {number} ttl seconds
+     */
+    put(key, data, ttl) {
+        this.entries.delete(key);
+        this.entries.set(key, {data: data, expires: Date.now() + ttl * 1000});
+
+        while (this.entries.size > this.maxSize)
+            this.entries.delete(this.entries.keys().next().value);
+    }
+}
+
+const responseCache = new ResponseCache(500);
+
+// Requests in progress, shared by widgets which ask for the same data
+const inFlightRequests = new Map();
+
+/**
+ * Fetch data, using cached responses and sharing requests in progress
+ *
+ * @param {object} params
+ * @param {function} success
+ * @param {function} failure
+ * @param {boolean} useCache
+ * @param {string} cacheVersion
+ * @param {number} cacheTtl
+ * @returns {{abort: function}}
+ */
+function transport(params, success, failure, useCache, cacheVersion, cacheTtl) {
+    const key = [cacheVersion, params.url, JSON.stringify(params.data)].join('\n');
+
+    if (useCache) {
+        const cached = responseCache.get(key);
+        if (cached !== undefined) {
+            success(cached);
+            return {abort: () => null};
+        }
+    }
+
+    let request = inFlightRequests.get(key);
+    if (!request) {
+        request = {xhr: $.ajax({url: params.url, data: params.data, dataType: 'json'}), subscribers: 0};
+        inFlightRequests.set(key, request);
+        request.xhr.always(() => inFlightRequests.delete(key));
+        if (useCache)
+            request.xhr.done(data => responseCache.put(key, data, cacheTtl));
+    }
+
+    let aborted = false;
+    request.subscribers++;
+    request.xhr.done(data => {
+        if (!aborted)
+            success(data);
+    }).fail((xhr, status) => {
+        if (!aborted && status !== 'abort')
+            failure();
+    });
+
+    return {
+        abort: () => {
+            if (aborted)
+                return;
+
+            aborted = true;
+
+            // Cancel the request if nobody else waits for it
+            if (--request.subscribers === 0)
+                request.xhr.abort();
+        }
+    };
+}
+
+setupWidget('plugins.widget._select.Select2', widget => {
+    const thisSelect = widget.em.find('select');
     const ajaxUrl = widget.data('ajaxUrl');
+    const select2Opts = {language: document.documentElement.lang};
+
+    // Query argument and value of the linked select
+    let linkedQueryAttr = null;
+    let linkedValue = null;
+
+    function processResults(data, params) {
+        // Cached responses are shared, so they must not be modified
+        if (widget.data('appendNoneItem') && !params.term && (params.page || 1) === 1) {
+            return {
+                results: [{id: '', text: widget.data('noneItemTitle')}].concat(data.results),
+                pagination: data.pagination,
+            };
+        }
+
+        return data;
+    }
 
     if (ajaxUrl) {
+        const useCache = widget.data('ajaxCache') === 'True';
+        const cacheVersion = String(widget.data('ajaxCacheVersion') || '');
+        const cacheTtl = parseInt(widget.data('ajaxCacheTtl')) || 300;
+
         Object.assign(select2Opts, {
             ajax: {
-                url: assetman.url(ajaxUrl, widget.data('ajaxUrlQuery')),
-                delay: widget.data('ajaxDelay'),
+                url: ajaxUrl,
+                delay: parseInt(widget.data('ajaxDelay')),
+                data: params => {
+                    const query = Object.assign({}, widget.data('ajaxUrlQuery'), {
+                        q: params.term || '',
+                        page: params.page || 1,
+                    });
+
+                    if (linkedQueryAttr)
+                        query[linkedQueryAttr] = linkedValue;
+
+                    return query;
+                },
                 processResults: processResults,
-                cache: widget.data('ajaxCache') === 'True',
+                transport: (params, success, failure) => {
+                    return transport(params, success, failure, useCache, cacheVersion, cacheTtl);
+                },
             }
         })
     }
 
     // Setup Select2
-    widget.em.find('select').select2(select2Opts);
+    thisSelect.select2(select2Opts);
 
     // Setup linked selects
     if (widget.form !== undefined) {
         widget.form.em.on('forward:form:pytsite', function () {
-            const thisSelect = widget.em.find('select');
-
             // Search for linked select widget
             const linkedSelectUid = widget.data('linkedSelect');
             const linkedSelectWidget = linkedSelectUid ? widget.form.getWidget(linkedSelectUid) : null;
             if (!linkedSelectWidget)
                 return;
 
+            linkedQueryAttr = widget.data('linkedSelectAjaxQueryAttr') ||
+                linkedSelectWidget.data('linkedSelectAjaxQueryAttr');
+
             const linkedSelect = linkedSelectWidget.em.find('select');
             linkedSelect.change(function () {
+                // Select2 instance is kept, AJAX query data is built using the current value of the linked select
+                linkedValue = linkedSelect.val();
+
                 // If linked select's value was REALLY changed
-                if (widget.em.attr('data-linked-select-value') !== linkedSelect.val()) {
-                    widget.em.attr('data-linked-select-value', linkedSelect.val());
+                if (widget.em.attr('data-linked-select-value') !== linkedValue) {
+                    widget.em.attr('data-linked-select-value', linkedValue);
                     thisSelect.val(null);
-                    thisSelect.prop('disabled', !linkedSelect.val());
+                    thisSelect.prop('disabled', !linkedValue);
                     thisSelect.trigger('change');
                 }
-
-                // Build AJAX URL query args
-                const ajaxArgs = widget.data('ajaxUrlQuery');
-                ajaxArgs[linkedSelectWidget.data('linkedSelectAjaxQueryAttr')] = linkedSelect.val();
-
-                // Re-create select with new AJAX URL
-                thisSelect.select2('destroy');
-                thisSelect.select2({
-                    ajax: {
-                        url: assetman.url(widget.data('ajaxUrl'), ajaxArgs),
-                        delay: parseInt(widget.data('ajaxDelay')),
-                        processResults: processResults,
-                        cache: widget.data('ajaxCache') === 'True',
-                    }
-                });
             });
 
             linkedSelect.trigger('change');
@@ -0,0 +1,43 @@
+import $ from 'jquery';
+import setupWidget, {Widget} from '@pytsite/widget';
+
+setupWidget('plugins.widget._select.Tabs', widget => {
+    const tabUrl = widget.data('tabUrl');
+    const tabSpec = widget.data('tabSpec');
+    if (!tabUrl)
+        return;
+
+    function loadTab(pane) {
+        if (pane.hasClass('loading'))
+            return;
+
+        pane.addClass('loading');
+        $.ajax({url: tabUrl, data: {spec: tabSpec, tab: pane.data('lazyTab')}, dataType: 'json'}).done(r => {
+            pane.html(r.html);
+            pane.removeAttr('data-lazy-tab');
+
+            // Nested widgets are initialized by their parents
+            pane.find('.pytsite-widget').each(function () {
+                if ($(this).is('.initialized, .initializing'))
+                    return;
+
+                new Widget(this, widget.form, childWidget => {
+                    // CAUTION: skip appending childWidget to the DOM of the parent, it is already in the pane
+                    widget.appendChild(childWidget, null);
+                });
+            });
+
+            $(window).trigger('plugins.widget.select.tabs.tabLoad', [pane.attr('id'), widget]);
+        }).fail(() => {
+            $(window).trigger('plugins.widget.select.tabs.tabLoadError', [pane.attr('id'), widget]);
+        }).always(() => {
+            pane.removeClass('loading');
+        });
+    }
+
+    widget.em.find('a[data-toggle="tab"]').on('show.bs.tab', function () {
+        const pane = widget.em.find('.tab-pane[data-lazy-tab]').filter(`[id="${$(this).attr('href').substr(1)}"]`);
+        if (pane.length)
+            loadTab(pane);
+    });
+});
@@ -13,6 +13,7 @@ module.exports = {
         path.join(__dirname, 'js/pager.js'),
         path.join(__dirname, 'js/score.js'),
         path.join(__dirname, 'js/select2.js'),
+        path.join(__dirname, 'js/tabs.js'),
         path.join(__dirname, 'js/text.js'),
         path.join(__dirname, 'js/tokens.js'),
         path.join(__dirname, 'js/tree-table.js'),
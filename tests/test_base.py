@@ -0,0 +1,28 @@
+"""PytSite Widget Plugin Base Tests
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+from plugins.widget import input
+
+
+class _Mixin:
+    def _get_css(self) -> str:
+        return 'mixed'
+
+
+class _MixedText(_Mixin, input.Text):
+    pass
+
+
+def test_cid_chain_skips_mixins_listed_first():
+    chain = _MixedText._cls_cid_chain.split()
+
+    assert chain[-1] == _MixedText.cid()
+    assert input.Text.cid() in chain
+    assert input.Input.cid() in chain
+    assert not any('_Mixin' in cid for cid in chain)
+    assert chain.index(input.Input.cid()) < chain.index(input.Text.cid())
+
+    assert 'value="x"' in _MixedText('title', value='x').render()
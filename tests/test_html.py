@@ -0,0 +1,168 @@
+"""PytSite Widget Plugin HTML Building Tests
+
+Elements which are built directly as strings are compared against the same elements built by htmler, the way it was
+done before.
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+import pytest
+import htmler
+from plugins.widget import input, items, select
+from plugins.widget._html import iter_node
+
+_RENDER_KWARGS = ({}, {'indent': False}, {'depth': 2})
+
+
+def hidden_em(w: input.Hidden) -> htmler.Element:
+    inp = htmler.Input(type='hidden', id=w.uid, name=w.name, value=w.value, required=w.required)
+    for k, v in w.data.items():
+        inp.set_attr('data_' + k, v)
+
+    return inp
+
+
+def text_em(w: input.Text) -> htmler.Element:
+    inp = htmler.Input(type=w._type, id=w.uid, name=w.name, css='form-control', autocomplete=w.autocomplete,
+                       placeholder=w.placeholder, required=w.required)
+
+    value = w.get_val()
+    if value:
+        inp.set_attr('value', value)
+    if not w.enabled:
+        inp.set_attr('disabled', 'true')
+    if w.min_length:
+        inp.set_attr('minlength', w.min_length)
+    if w.max_length:
+        inp.set_attr('maxlength', w.max_length)
+
+    if w.prepend or w.append:
+        group = htmler.Div(css='input-group')
+        if w.prepend:
+            prepend = group.append_child(htmler.Div(css='input-group-addon input-group-prepend'))
+            prepend.append_child(htmler.Div(w.prepend, css='input-group-text'))
+        group.append_child(inp)
+        if w.append:
+            append = group.append_child(htmler.Div(css='input-group-addon input-group-append'))
+            append.append_child(htmler.Div(w.append, css='input-group-text'))
+        inp = group
+
+    if w.inputmask:
+        inp.set_attr('data_inputmask', ','.join(["'{}': '{}'".format(k, v) for k, v in w.inputmask.items()]))
+
+    return inp
+
+
+def checkbox_em(w: select.Checkbox) -> htmler.Element:
+    div = htmler.Div(css='form-check' if w._bootstrap_version == 4 else 'checkbox')
+    div.append_child(htmler.Input(type='hidden', name=w.name))
+    inp = htmler.Input(id=w.uid, name=w.name, type='checkbox', value='True', checked=w.checked, required=w.required)
+    label = htmler.Label(label_for=w.uid)
+    if w._bootstrap_version == 3:
+        label.append_child(inp)
+        label.append_text(w.label)
+        div.append_child(label)
+    else:
+        inp.set_attr('css', 'form-check-input')
+        label.set_attr('css', 'form-check-label')
+        label.append_text(w.label)
+        div.append_child(inp)
+        div.append_child(label)
+
+    return div
+
+
+def checkboxes_item_em(w: select.Checkboxes, item: tuple) -> htmler.Element:
+    div = htmler.Div(css='form-check' if w._bootstrap_version == 4 else 'checkbox')
+    inp = htmler.Input(type='checkbox', name=w.name, value=item[0], checked=item[0] in w.value, required=w.required)
+    label = htmler.Label()
+    if w._bootstrap_version == 3:
+        label.append_child(inp)
+        label.append_text(item[1])
+        div.append_child(label)
+    else:
+        inp.set_attr('css', 'form-check-input')
+        label.set_attr('css', 'form-check-label')
+        label.append_text(item[1])
+        div.append_child(inp)
+        div.append_child(label)
+
+    return div
+
+
+def options_em(w: select.Select) -> htmler.Element:
+    r = htmler.TagLessElement()
+    value = w.value
+    for item in w.items:
+        if w._exclude and item[0] in w._exclude:
+            continue
+        option = htmler.Option(item[1], value=item[0])
+        if (item[0] in value) if w._multiple else (item[0] == value):
+            option.set_attr('selected', 'true')
+        r.append_child(option)
+
+    return r
+
+
+def _assert_same(em: htmler.Element, expected: htmler.Element):
+    for kwargs in _RENDER_KWARGS:
+        html = expected.render(**kwargs)
+        assert em.render(**kwargs) == html
+        assert ''.join(iter_node(em, **kwargs)) == html
+
+
+@pytest.mark.parametrize('widget', [
+    input.Hidden('h'),
+    input.Hidden('h', value='v<"&\'', data_x=1, data_y_z=None, required=True),
+    input.Hidden('h', name='other', value=0),
+])
+def test_hidden(widget):
+    _assert_same(widget._get_element(), hidden_em(widget))
+
+
+@pytest.mark.parametrize('widget', [
+    input.Text('t'),
+    input.Text('t', value='a&b<c>"', enabled=False, min_length=2, max_length=5, placeholder='P<', required=True),
+    input.Text('t', value='x', inputmask={'alias': 'numeric', 'digits': 2}),
+    input.Text('t', value='1', prepend='$', append='c', inputmask={'x': 'y'}),
+    input.Text('t', autocomplete='off', append=htmler.Span('unit')),
+    input.Email('e', value='a@b.com'),
+    input.Integer('i', value=3, min=-1),
+    input.Password('p', value='secret'),
+])
+def test_text(widget):
+    _assert_same(widget._get_element(), text_em(widget))
+
+
+@pytest.mark.parametrize('widget', [
+    select.Checkbox('c'),
+    select.Checkbox('c', label='L<&>', value=False),
+    select.Checkbox('c', label='Agree', value=True, required=True),
+    select.Checkbox('c', label='Agree', value='true', bootstrap_version=4),
+    select.Checkbox('c', label='Agree', value=False, bootstrap_version=4, name='other'),
+])
+def test_checkbox(widget):
+    _assert_same(widget._get_element(), checkbox_em(widget))
+
+
+@pytest.mark.parametrize('widget', [
+    select.Checkboxes('cb', items=[('1', 'a'), ('2', 'b<&>'), ('3', '')], value=['1', '3'], required=True),
+    select.Checkboxes('cb', items=[('1', 'a'), ('2', 'b')], value=['2'], bootstrap_version=4),
+])
+def test_checkboxes_items(widget):
+    for item in widget.items:
+        _assert_same(widget._default_item_renderer(item), checkboxes_item_em(widget, item))
+
+
+@pytest.mark.parametrize('widget', [
+    select.Select('s', items=[]),
+    select.Select('s', items=[(None, 'n'), ('a"', ''), (' b ', 'B&<'), ('c', htmler.Span('x'))], value=' b '),
+    select.Select('s', items=[('a', 'A'), ('b', 'B'), ('c', 'C')], value='c', exclude=['b']),
+    select.Select('s', items=[(1, 'a'), (2, 'b'), (3, 'c')], multiple=True, value=[1, 3], int_keys=True),
+    select.Select('s', items=[('a', 'A'), ('b', 'B')], multiple=True, value=['a', 'x'], exclude=['x']),
+    select.Select('s', catalog=items.Catalog('test_html_catalog', [('a', 'A<'), ('b', 'B'), ('c', 'C')]),
+                  value='b', exclude=['c']),
+])
+def test_options(widget):
+    _assert_same(widget._get_options_em(), options_em(widget))
@@ -0,0 +1,28 @@
+"""PytSite Widget Plugin Items Tests
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+from plugins.widget import items
+
+
+def test_concatenation_applies_converter_of_each_source():
+    calls = []
+
+    def provider(start, stop):
+        calls.append((start, stop))
+        return [('k{}'.format(i), 'Title {}'.format(i)) for i in range(start, 4 if stop is None else min(stop, 4))]
+
+    numbers = items.ItemSource([('1', 'One'), ('2', 'Two')], int)
+    codes = items.ItemSource(provider, str.upper)
+    plain = [('3', 'Three')]
+
+    assert (numbers + codes)[1:3] == ((2, 'Two'), ('K0', 'Title 0'))
+    assert calls == [(0, 1)]
+
+    assert list(numbers + codes + plain) == [(1, 'One'), (2, 'Two'), ('K0', 'Title 0'), ('K1', 'Title 1'),
+                                             ('K2', 'Title 2'), ('K3', 'Title 3'), ('3', 'Three')]
+    assert (numbers + plain)[2:] == (('3', 'Three'),)
+    assert (codes + numbers)[3:6] == (('K3', 'Title 3'), (1, 'One'), (2, 'Two'))
+    assert list(items.ItemSource() + numbers) == [(1, 'One'), (2, 'Two')]
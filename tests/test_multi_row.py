@@ -0,0 +1,130 @@
+"""PytSite Widget Plugin MultiRow Tests
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+import pytest
+import re
+from pytsite import validation, router
+from plugins.widget import container, input, select, _signing
+
+
+class _DNSNames(container.MultiRow):
+    def _get_widgets(self):
+        return [input.Text('host', label='Host', rules=[validation.rule.DNSName()])]
+
+
+def test_validate_rows_keeps_value_of_each_error():
+    widget = _DNSNames('hosts', value=[{'host': 'bad one'}, {'host': 'good.com'}, {'host': 'also bad'}])
+
+    with pytest.raises(container.RowsValidationError) as e:
+        widget.validate()
+
+    errors = e.value.errors
+    assert list(errors) == [0, 2]
+    assert "'bad one'" in errors[0]['host'].msg_args['orig_msg']
+    assert "'also bad'" in errors[2]['host'].msg_args['orig_msg']
+    assert errors[0]['host'].msg_args['row_index'] == 1
+    assert errors[2]['host'].msg_args['row_index'] == 3
+
+
+class _Colors(container.MultiRow):
+    def _get_widgets(self):
+        return [select.ColorPicker('color', label='Color'), input.Text('title', label='Title')]
+
+
+class _ValueCssText(input.Text):
+    def _get_css(self) -> str:
+        return '{} value-{}'.format(self._css, self.value)
+
+
+class _Styled(container.MultiRow):
+    def _get_widgets(self):
+        return [_ValueCssText('code', label='Code')]
+
+
+def test_row_template_does_not_leak_markers_of_values_used_by_hooks():
+    value = [{'color': '#ff0000', 'title': 'Red'}, {'color': '#00ff00', 'title': 'Green'}]
+    html = _Colors('colors', value=value).render()
+
+    assert '\ue000' not in html
+    assert 'data-color="#ff0000"' in html
+    assert 'data-color="#00ff00"' in html
+    assert 'value="Green"' in html
+
+    html = _Styled('styled', value=[{'code': 'a'}, {'code': 'b'}]).render()
+
+    assert '\ue000' not in html
+    assert 'value-a' in html
+    assert 'value-b' in html
+
+
+class _Prices(container.MultiRow):
+    __slots__ = ('_currency',)
+
+    def __init__(self, uid: str, **kwargs):
+        self._currency = kwargs.get('currency', 'USD')
+        super().__init__(uid, **kwargs)
+
+    def _get_widgets(self):
+        return [input.Text('title', label='Title'), input.Decimal('price', label='Price', append=self._currency)]
+
+
+def test_render_rows_matches_full_render(monkeypatch):
+    monkeypatch.setattr(router, 'session', lambda session={}: session)
+
+    def build(**kwargs):
+        widget = _Prices('prices', currency='EUR', value=rows, **kwargs)
+        widget.name = 'order'
+        widget.enabled = False
+        return widget
+
+    rows = [{'title': 'Item {}'.format(i), 'price': i + 0.5} for i in range(7)]
+    full = build().render()
+    virtualized = build(window_size=3)
+    html = virtualized.render()
+
+    assert virtualized.is_virtualized
+    assert html.count('value="Item ') == 3
+
+    spec = _signing.unsign(re.search(r'data-rows-spec="([^"]+)"', html).group(1))
+    rows_html = container.build_multi_row(spec, rows[3:]).render_rows(3)
+
+    assert rows_html.count('value="Item ') == 4
+    assert ''.join(rows_html.split()) in ''.join(full.split())
+
+
+class _RecordingText(input.Text):
+    prefetched = []
+
+    def _prefetch_values(self, values: list):
+        self.prefetched.append((self.uid, values))
+
+
+class _Recorded(container.MultiRow):
+    def _get_widgets(self):
+        return [_RecordingText('title', label='Title')]
+
+
+class _RecordedList(container.MultiRowList):
+    def _get_widgets(self):
+        return [_RecordingText('tag', label='Tag')]
+
+
+def test_prefetch_tree_of_multi_row_and_multi_row_list():
+    form = container.Container('form')
+    rows = form.append_child(_Recorded('rows', value=[{'title': 'A'}, {'title': 'B'}]))
+    form.append_child(_RecordedList('tags', value=['x', 'y']))
+
+    _RecordingText.prefetched.clear()
+    html = rows.render()
+
+    assert 'value="B"' in html
+    assert sorted(_RecordingText.prefetched) == [('tag', ['x', 'y']), ('title', ['A', 'B'])]
+
+    # Without a render pass only the widget's own rows are prefetched
+    _RecordingText.prefetched.clear()
+    rows.render_rows()
+
+    assert _RecordingText.prefetched == [('title', ['A', 'B'])]
@@ -0,0 +1,26 @@
+"""PytSite Widget Plugin Pager Tests
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+from pytsite import lang
+from plugins.widget import Abstract, select
+
+
+def test_link_titles_are_cleared_along_with_msg_id_cache(monkeypatch):
+    translations = {}
+
+    def t(msg_id, args=None, language=None):
+        return translations.get(msg_id, msg_id)
+
+    monkeypatch.setattr(lang, 't', t)
+
+    titles = select.Pager._get_link_titles('en')
+    assert select.Pager._get_link_titles('en') is titles
+
+    translations[select.Pager.resolve_msg_id('first_page', 'en')] = 'First'
+    assert select.Pager._get_link_titles('en')['first_page'] != 'First'
+
+    Abstract.clear_msg_id_cache()
+    assert select.Pager._get_link_titles('en')['first_page'] == 'First'
@@ -0,0 +1,40 @@
+"""PytSite Widget Plugin Render Cache Tests
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+from plugins.widget import items, render_cache
+
+
+def test_key_repr_does_not_consume_lazy_sources():
+    calls = []
+
+    def provider(start, stop):
+        calls.append((start, stop))
+        return [('a', 'A'), ('b', 'B')]
+
+    source = items.ItemSource(provider)
+
+    assert render_cache.key_repr(source) is None
+    assert not source.consumed
+    assert not calls
+
+
+def test_key_repr_uses_version_of_items():
+    first = items.ItemSource([('a', 'A'), ('b', 'B')])
+    same = items.ItemSource((('a', 'A'), ('b', 'B')))
+    other = items.ItemSource([('a', 'A'), ('c', 'C')])
+
+    assert render_cache.key_repr(first) == render_cache.key_repr(same)
+    assert render_cache.key_repr(first) != render_cache.key_repr(other)
+    assert render_cache.key_repr({'items': first, 'limit': 3}) is not None
+
+
+def test_key_repr_refuses_unstable_values():
+    class _Unstable:
+        pass
+
+    assert render_cache.key_repr(_Unstable()) is None
+    assert render_cache.key_repr([1, _Unstable()]) is None
+    assert render_cache.key_repr({'k': object()}) is None
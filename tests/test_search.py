@@ -0,0 +1,24 @@
+"""PytSite Widget Plugin Items Search Tests
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+from plugins.widget import items, _search
+
+
+def test_mmap_catalog_is_searched_without_index(tmp_path):
+    path = str(tmp_path / 'fruits.catalog')
+    items.build_catalog_file(path, [('a', 'Apple'), ('b', 'Apricot'), ('c', 'Banana'), ('d', 'avocado')])
+    catalog = items.MmapCatalog('test_search_fruits', path)
+
+    r = _search.select2_results(catalog, 'a', per_page=2)
+    assert r == {'results': [{'id': 'a', 'text': 'Apple'}, {'id': 'b', 'text': 'Apricot'}], 'pagination': {'more': True}}
+
+    r = _search.select2_results(catalog, 'a', page=2, per_page=2)
+    assert r == {'results': [{'id': 'd', 'text': 'avocado'}], 'pagination': {'more': False}}
+
+    r = _search.select2_results(catalog, 'AP', exclude=['a'])
+    assert r['results'] == [{'id': 'b', 'text': 'Apricot'}]
+
+    assert not [k for k in _search._indexes if k[0] == catalog.name]
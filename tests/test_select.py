@@ -0,0 +1,25 @@
+"""PytSite Widget Plugin Select Tests
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+import pytest
+from plugins.widget import items, select
+
+
+def test_int_keys_reject_empty_value():
+    widget = select.Select('s', items=[(1, 'One'), (2, 'Two')], int_keys=True)
+
+    assert widget.set_val('2').value == 2
+    with pytest.raises(ValueError):
+        widget.set_val('')
+
+
+def test_catalog_int_keys_accept_empty_value(tmp_path):
+    path = str(tmp_path / 'numbers.catalog')
+    items.build_catalog_file(path, [(1, 'One'), (2, 'Two')])
+    widget = select.Select('s', catalog=items.MmapCatalog('test_select_numbers', path))
+
+    assert widget.set_val('2').value == 2
+    assert widget.set_val('').value is None
@@ -0,0 +1,40 @@
+"""PytSite Widget Plugin Signed Data Tests
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+import pytest
+from pytsite import router
+from plugins.widget import _signing
+
+
+def test_sign_unsign(monkeypatch):
+    session = {}
+    monkeypatch.setattr(router, 'session', lambda: session)
+
+    value = {'cid': 'plugins.widget._container.MultiRow', 'kwargs': {'name': 'rows', 'enabled': True}}
+    token = _signing.sign(value)
+
+    assert _signing.unsign(token) == value
+
+
+@pytest.mark.parametrize('token', [None, '', 'abc', 'abc.def', 'дані.підпис'])
+def test_unsign_rejects_invalid_tokens(monkeypatch, token):
+    monkeypatch.setattr(router, 'session', lambda session={}: session)
+
+    with pytest.raises(ValueError):
+        _signing.unsign(token)
+
+
+def test_unsign_rejects_tampered_and_foreign_tokens(monkeypatch):
+    session = {}
+    monkeypatch.setattr(router, 'session', lambda: session)
+    payload, signature = _signing.sign({'uid': 'a'}).split('.')
+
+    with pytest.raises(ValueError):
+        _signing.unsign(_signing.sign({'uid': 'b'}).split('.')[0] + '.' + signature)
+
+    session = {}
+    with pytest.raises(ValueError):
+        _signing.unsign(payload + '.' + signature)
@@ -0,0 +1,82 @@
+"""PytSite Widget Plugin Tabs Tests
+"""
+__author__ = 'Oleksandr Shepetko'
+__email__ = 'a@shepetko.com'
+__license__ = 'MIT'
+
+import pytest
+import re
+from pytsite import router
+from plugins.widget import input, select, _signing
+
+
+class _Editor(select.Tabs):
+    __slots__ = ('built',)
+
+    def __init__(self, uid: str, **kwargs):
+        super().__init__(uid, **kwargs)
+
+        self.built = []
+        for tab_id in ('main', 'seo', 'extra'):
+            self.add_tab(tab_id, tab_id.title(), self._factory(tab_id))
+
+    def _factory(self, tab_id: str):
+        def build():
+            self.built.append(tab_id)
+            return [
+                input.Text(tab_id + '_title', label='Title', required=True, default=self.tab_args.get(tab_id)),
+                input.Text(tab_id + '_note', label='Note', weight=-1),
+            ]
+
+        return build
+
+
+class _Request:
+    def __init__(self, inp: dict):
+        self.inp = inp
+
+
+def test_lazy_tabs_render_only_first_tab(monkeypatch):
+    monkeypatch.setattr(router, 'session', lambda session={}: session)
+
+    widget = _Editor('editor', lazy=True, tab_args={'main': 'Main', 'seo': 'SEO'})
+    html = widget.render()
+
+    assert widget.built == ['main']
+    assert 'name="main_title"' in html
+    assert 'name="seo_title"' not in html
+    assert 'data-lazy-tab="seo"' in html
+
+    spec = _signing.unsign(re.search(r'data-tab-spec="([^"]+)"', html).group(1))
+    restored = select.build_tabs(spec)
+    pane = restored.render_tab('seo')
+
+    assert restored.built == ['seo']
+    assert 'name="seo_title"' in pane
+    assert 'value="SEO"' in pane
+    assert pane.index('seo_note') < pane.index('seo_title')
+
+
+def test_lazy_tabs_validate_unrendered_tabs():
+    widget = _Editor('editor', lazy=True, tab_args={'main': 'Main', 'seo': 'SEO'})
+    widget.form_submit(_Request({'main_title': ''}))
+
+    with pytest.raises(select.TabsValidationError) as e:
+        widget.validate()
+
+    assert {tab_id: list(errors) for tab_id, errors in e.value.errors.items()} == {
+        'main': ['main_title'],
+        'extra': ['extra_title'],
+    }
+
+    widget = _Editor('editor', lazy=True, tab_args={'seo': 'SEO'})
+    widget.form_submit(_Request({'main_title': 'Main', 'extra_title': 'Extra'}))
+    widget.validate()
+
+
+def test_lazy_tabs_require_subclass_and_serializable_args():
+    with pytest.raises(RuntimeError):
+        select.Tabs('tabs', lazy=True)
+
+    with pytest.raises(TypeError):
+        _Editor('editor', lazy=True, tab_args={'main': object()})